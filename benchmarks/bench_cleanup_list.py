@@ -0,0 +1,58 @@
+"""
+Benchmark of the cleanup of lazy linked lists with many dead references
+(resources which no longer exist) and raw identifiers.
+
+Usage: PYTHONPATH=. python benchmarks/bench_cleanup_list.py [--count N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+import codepost.models.comments as _comments
+from codepost.models.abstract import linked_lists as _linked_lists
+
+
+def make_linked_list(count, null_ratio):
+    lst = _linked_lists.LazyAPILinkedList(
+        iterable=list(range(1, count + 1)), cls=_comments.Comments)
+
+    step = int(round(1 / null_ratio)) if null_ratio else 0
+    for (i, obj) in enumerate(list.__iter__(lst)):
+        if step and i % step == 0:
+            obj._null = True
+        elif i % 10 == 1:
+            # Raw identifier, to be replaced by a lazy resource
+            list.__setitem__(lst, i, obj.id)
+
+    return lst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--null-ratio", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lists = [make_linked_list(args.count, args.null_ratio)
+             for _ in range(args.repeat)]
+
+    best = min(timeit.repeat(
+        lambda: lists.pop()._cleanup_list(), number=1, repeat=args.repeat))
+
+    print("cleanup of {} members ({:.0%} dead): {:10.2f} ms".format(
+        args.count, args.null_ratio, best * 1000))
+
+    sample = make_linked_list(args.count, args.null_ratio)
+    objs = list(list.__iter__(sample))
+    best = min(timeit.repeat(
+        lambda: [_linked_lists.LazyAPILinkedList._is_lazy(obj) for obj in objs],
+        number=1, repeat=args.repeat))
+    print("{} `_is_lazy` checks:              {:10.2f} ms".format(
+        len(objs), best * 1000))
+
+
+if __name__ == "__main__":
+    main()
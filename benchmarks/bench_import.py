@@ -0,0 +1,73 @@
+"""
+Benchmark of the cold-start cost of the SDK: the time to `import codepost`
+in a fresh interpreter, and the time to create the model classes (which the
+metaclass builds from their `_FIELDS` declarations).
+
+Usage: PYTHONPATH=. python benchmarks/bench_import.py [--repeat N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import timeit
+
+IMPORT_SCRIPT = (
+    "import time; t = time.perf_counter(); import codepost; "
+    "print(time.perf_counter() - t)")
+
+
+def time_import(repeat):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.getcwd()] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", IMPORT_SCRIPT], env=env)
+        timings.append(float(output.decode("utf8").strip().splitlines()[-1]))
+    return timings
+
+
+def time_class_creation(repeat):
+    import codepost
+    import codepost.models.abstract as _abstract
+
+    models = [type(getattr(codepost, name)) for name in codepost._HELPERS]
+
+    def create_models():
+        for model in models:
+            _abstract.APIResourceMetaclass(
+                model.__name__, model.__bases__, {
+                    key: getattr(model, key)
+                    for key in [
+                        "_OBJECT_NAME", "_FIELD_ID", "_FIELDS",
+                        "_FIELDS_READ_ONLY", "_FIELDS_REQUIRED"]
+                    if hasattr(model, key)
+                })
+
+    best = min(timeit.repeat(create_models, number=1, repeat=repeat))
+    return (len(models), best)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    timings = time_import(args.repeat)
+    (count, best) = time_class_creation(args.repeat)
+
+    print("import codepost ({} runs)".format(len(timings)))
+    print("  median:         {:10.2f} ms".format(statistics.median(timings) * 1000))
+    print("  best:           {:10.2f} ms".format(min(timings) * 1000))
+    print("creation of the {} model classes".format(count))
+    print("  best:           {:10.2f} ms".format(best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the JSON codecs of `codepost.util.codec`, on payloads similar
+to those of `Assignment.list_submissions` (decoding) and of bulk file
+uploads (encoding).
+
+Usage: PYTHONPATH=. python benchmarks/bench_json_codec.py [--submissions N] [--repeat N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+from codepost.util import codec as _codec
+
+
+def make_submission(i):
+    return {
+        "id": 100000 + i,
+        "assignment": 42,
+        "students": ["student{}@example.edu".format(i)],
+        "grader": "grader@example.edu",
+        "isFinalized": i % 2 == 0,
+        "queueOrderKey": i,
+        "dateEdited": "2019-09-01T12:00:00.000000Z",
+        "grade": 87.5,
+        "files": list(range(10 * i, 10 * i + 5)),
+    }
+
+
+def make_file(i):
+    code = "".join(
+        "    result_{0} = compute({0}, '{1}')  # déjà vu\n".format(j, "x" * 20)
+        for j in range(400))
+    return {
+        "name": "file_{}.py".format(i),
+        "code": "def main():\n" + code,
+        "extension": "py",
+        "submission": 100000 + i,
+    }
+
+
+def bench(label, func, repeat):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print("  {:<28} {:10.2f} ms".format(label, best * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    submissions = [make_submission(i) for i in range(args.submissions)]
+    files = [make_file(i) for i in range(args.files)]
+
+    for name, codec_class in sorted(_codec._CODECS.items()):
+        try:
+            codec = codec_class()
+        except ImportError:
+            print("{}: not installed".format(name))
+            continue
+
+        body = codec.dumps(submissions)
+        print("{} ({} submissions, {:.1f} MB; {} files)".format(
+            name, len(submissions), len(body) / 1e6, len(files)))
+
+        bench("decode submissions", lambda: codec.loads(body), args.repeat)
+        bench("encode submissions", lambda: codec.dumps(submissions), args.repeat)
+        bench("encode file uploads",
+              lambda: [codec.dumps(f) for f in files], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Microbenchmark of the creation of lazy API resources, as done when loading
+objects with large linked lists (submissions of an assignment, comments of
+a file, ...).
+
+Usage: PYTHONPATH=. python benchmarks/bench_lazy_resources.py [--count N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+import codepost.models.comments as _comments
+from codepost.models.abstract import linked_lists as _linked_lists
+
+
+def make_linked_list(ids):
+    return _linked_lists.LazyAPILinkedList(
+        iterable=ids, cls=_comments.Comments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ids = list(range(1, args.count + 1))
+
+    best = min(timeit.repeat(
+        lambda: make_linked_list(ids), number=1, repeat=args.repeat))
+
+    gc.collect()
+    tracemalloc.start()
+    lst = make_linked_list(ids)
+    (memory, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print("{} lazy resources".format(len(lst)))
+    print("  creation time: {:10.2f} ms ({:.2f} us each)".format(
+        best * 1000, best * 1e6 / len(lst)))
+    print("  memory:        {:10.2f} MB ({:.0f} bytes each)".format(
+        memory / 1e6, memory / float(len(lst))))
+    # NOTE: Iterate without the prefetching of `LazyAPILinkedList.__iter__`
+    print("  classes:       {:10d}".format(
+        len(set(map(type, list.__iter__(lst))))))
+
+
+if __name__ == "__main__":
+    main()
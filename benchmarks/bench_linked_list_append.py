@@ -0,0 +1,48 @@
+"""
+Benchmark of building linked lists (a roster of e-mails, and a relation of
+lazy API resources) one `append` at a time.
+
+Usage: PYTHONPATH=. python benchmarks/bench_linked_list_append.py [--count N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+import codepost.models.comments as _comments
+import codepost.models.sections as _sections
+from codepost.models.abstract import linked_lists as _linked_lists
+
+
+def build_roster(count):
+    lst = _linked_lists.APILinkedList(
+        cls=None, parent_cls=_sections.Sections, parent_id=1,
+        parent_attribute="students", query_attribute=None)
+    for i in range(count):
+        lst = lst.append("student{}@example.com".format(i))
+    return lst
+
+
+def build_relation(count):
+    lst = _linked_lists.LazyAPILinkedList(cls=_comments.Comments)
+    for i in range(count):
+        lst = lst.append(i + 1)
+    return lst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for (name, func) in [("roster", build_roster), ("relation", build_relation)]:
+        best = min(timeit.repeat(
+            lambda: func(args.count), number=1, repeat=args.repeat))
+        print("{} of {} members: {:10.2f} ms".format(
+            name, args.count, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
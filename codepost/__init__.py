@@ -14,15 +14,65 @@ License: Copyright (c) 2019 codePost, licensed under the MIT license
 
 from codepost.version import __version__
 
-# Import sub-modules
+import importlib as _importlib
+import sys as _sys
 
-from . import util
-from .util.config import configure_api_key
-from .util.config import find_config_file, read_config_file
+# Sub-modules, helpers and reimports are loaded lazily, on first access (see
+# `__getattr__`), so that scripts only pay for the parts of the SDK they use.
 
-# Configure credentials
+_SUBMODULES = (
+    "api_requestor",
+    "async_api_requestor",
+    "async_http_client",
+    "errors",
+    "http_client",
+    "instantiated",
+    "models",
+    "rate_limiter",
+    "retry",
+    "upload",
+    "util",
+)
 
-util.config.configure_api_key(log_outcome=False)
+# Name of the reimported attribute -> module defining it
+_LAZY_ATTRIBUTES = {
+    # Configuration
+    "configure_api_key": ".util.config",
+    "invalidate_api_key_cache": ".util.config",
+    "find_config_file": ".util.config",
+    "read_config_file": ".util.config",
+
+    # Identity map sessions (see `models.abstract.identity_map`)
+    "session": ".models.abstract.identity_map",
+
+    # Resource cache (see `models.abstract.resource_cache`)
+    "ResourceCache": ".models.abstract.resource_cache",
+    "get_resource_cache": ".models.abstract.resource_cache",
+    "set_resource_cache": ".models.abstract.resource_cache",
+}
+
+# Instantiated helper static classes (see `instantiated`)
+_HELPERS = (
+    "assignment",
+    "course",
+    "roster",
+    "submission",
+    "file",
+    "comment",
+    "section",
+    "rubric_category",
+    "rubric_comment",
+    "test_category",
+    "test_case",
+    "submission_test",
+    "file_template",
+)
+_LAZY_ATTRIBUTES.update({name: ".instantiated" for name in _HELPERS})
+
+__all__ = ["app_info", "set_app_info", "util"] + list(_LAZY_ATTRIBUTES)
+
+# Credentials are resolved (and validated) lazily, by the first API request,
+# see `util.config.get_api_key`.
 
 # Configuration module variables
 
@@ -51,5 +101,24 @@ def set_app_info(name, url=None, version=None):
     if version:
         app_info["version"] = version
 
-# Reimport all instantiated helper static classes
-from .instantiated import *
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name, None)
+    if module_name is not None:
+        value = getattr(_importlib.import_module(module_name, __name__), name)
+    elif name in _SUBMODULES:
+        value = _importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name))
+
+    # Subsequent accesses do not go through `__getattr__`
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_SUBMODULES))
+
+if _sys.version_info < (3, 7): # pragma: no cover
+    # Module-level `__getattr__` is only supported in Python 3.7+ (PEP 562)
+    for _name in list(_SUBMODULES) + list(_LAZY_ATTRIBUTES):
+        __getattr__(_name)
@@ -40,6 +40,7 @@ from . import __version__ as _CODEPOST_SDK_VERSION
 from . import http_client as _http_client
 from . import errors as _errors
 
+from .util import codec as _codec
 from .util import config as _config
 from .util import custom_logging as _logging
 
@@ -70,10 +71,21 @@ _APP_INFO_PATTERN = "{name}"
 # Global submodule protected attributes
 _logger = _logging.get_logger(name=_LOG_SCOPE)
 
+# Platform information, computed once on first use (see `_get_platform_info`)
+_platform_info = None
+
+# Headers common to all requests, as `(app_info key, headers)`, recomputed
+# only when the app info changes (see `APIRequestor._get_static_headers`)
+_static_headers = None
+
 # =============================================================================
 
 class APIRequestor(object):
 
+    # Awaitable counterpart of the requestor, created on first use (see
+    # `async_api_requestor.for_requestor`)
+    _async_requestor = None
+
     def __init__(
         self,
         api_key=None,
@@ -99,7 +111,7 @@ class APIRequestor(object):
             return self._api_key
 
         # Call to get the global cached API key
-        global_api_key = _config.configure_api_key()
+        global_api_key = _config.get_api_key()
         return global_api_key
 
     @api_key.setter
@@ -111,6 +123,41 @@ class APIRequestor(object):
     def api_key(self):
         self._api_key = None
 
+    @property
+    def retry_policy(self):
+        """
+        The policy according to which the HTTP client retries failed requests.
+        """
+        return self._client.retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value):
+        self._client.retry_policy = value
+
+    @property
+    def rate_limiter(self):
+        """
+        The rate limiter throttling the requests of the HTTP client (see the
+        `rate_limiter` sub-module).
+        """
+        return self._client.rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, value):
+        self._client.rate_limiter = value
+
+    @property
+    def cache(self):
+        """
+        The backend in which the HTTP client caches (and revalidates) the
+        responses to `GET` requests (see the `util.cache` sub-module).
+        """
+        return self._client.cache
+
+    @cache.setter
+    def cache(self, value):
+        self._client.cache = value
+
     @classmethod
     def _format_app_info(cls, **kwargs):
         s = ""
@@ -124,16 +171,43 @@ class APIRequestor(object):
                     s += " ({url})".format(**d)
         return s
 
+    @staticmethod
+    def _get_platform_info():
+        # type: () -> dict
+        global _platform_info
+
+        # NOTE: `platform.platform()` and `platform.uname()` may spawn
+        # subprocesses, and their results do not change within a process
+        if _platform_info is None:
+            _platform_info = {
+                "platform": _platform.platform(),
+                "uname": list(_platform.uname()),
+            }
+        return _platform_info
+
     @classmethod
-    def _build_headers(cls, api_key=None, method="get", **kwargs):
+    def _get_static_headers(cls):
+        # type: () -> dict
+        """
+        Return the headers which are identical for all requests (user agent and
+        SDK diagnostics); they are only recomputed when the app info changes.
+        """
+        global _static_headers
+
+        app_info = codepost.app_info
+        key = tuple(sorted(app_info.items())) if isinstance(app_info, dict) else app_info
+
+        cached = _static_headers
+        if cached is not None and cached[0] == key:
+            return cached[1]
 
         # The SDK's user agent info
         user_agent = _UA
 
         # (Optionally) the client's user agent info
         app_str = ""
-        if codepost.app_info:
-            app_str = cls._format_app_info(**codepost.app_info)
+        if app_info:
+            app_str = cls._format_app_info(**app_info)
             user_agent += " " + app_str
 
         # Diagnostic information
@@ -142,17 +216,26 @@ class APIRequestor(object):
             "lang": "python",
             "publisher": "codepost",
             "lang_version": _PY_VERSION,
-            "platform": _platform.platform(),
-            "uname": _platform.uname(),
             "app": app_str,
         }
+        diag.update(cls._get_platform_info())
 
         headers = {
-            "Authorization": "Token {}".format(api_key),
             "User-Agent": user_agent,
+            # NOTE: Encoded with the standard library, which escapes non-ASCII
+            # characters (header values must be Latin-1)
             "X-codePost-SDK-User-Agent": _json.dumps(diag)
         }
 
+        _static_headers = (key, headers)
+        return headers
+
+    @classmethod
+    def _build_headers(cls, api_key=None, method="get", **kwargs):
+
+        headers = dict(cls._get_static_headers())
+        headers["Authorization"] = "Token {}".format(api_key)
+
         if method.upper() in ["POST", "PATCH"] and not "Content-Type" in headers:
             headers["Content-Type"] = "application/json"
 
@@ -167,11 +250,16 @@ class APIRequestor(object):
             status_code=response.status_code,
             response=response)
 
-    def _request(self, endpoint, method="get", **kwargs):
-        kws = {}
-
-        if kwargs and isinstance(kwargs, dict) and len(kwargs) > 0:
-            kws.update(_copy.deepcopy(kwargs))
+    def _prepare_request(self, endpoint, method="get", **kwargs):
+        """
+        Compile the keyword arguments (URL, method, headers, payload, ...) with
+        which the HTTP client should be called to make a request to the
+        provided `endpoint` of the codePost API.
+        """
+        # NOTE: Only shallow copies are made, so that the cost of preparing a
+        # request does not depend on the size of its payload (the payload is
+        # not modified, but replaced by its encoding)
+        kws = dict(kwargs)
 
         kws["method"] = method
 
@@ -187,25 +275,42 @@ class APIRequestor(object):
             api_key=api_key,
             **kws
         )
-        kws["headers"] = kws.get("headers", dict())
+        kws["headers"] = dict(kws.get("headers", None) or {})
+
+        # A caller-provided idempotency key takes precedence, so that callers
+        # can safely repeat a request themselves
+        if "Idempotency-Key" in kws["headers"]:
+            default_headers.pop("Idempotency-Key", None)
+
         kws["headers"].update(default_headers)
 
-        # Provide POSTed data as a JSON string
+        # Provide POSTed data as JSON (unless it is already encoded)
 
         if "application/json" in kws["headers"].get("Content-Type", ""):
-            if "data" in kws and not isinstance(type(kws["data"]), str):
-                kws["data"] = _json.dumps(kws["data"])
-        
-        ret = self._client.request(
-            url=urljoin(self._base_url, endpoint),
-            **kws
-        )
+            if "data" in kws and not isinstance(kws["data"], (str, bytes)):
+                kws["data"] = _codec.dumps(kws["data"])
+
+        kws["url"] = urljoin(self._base_url, endpoint)
+
+        return kws
 
+    def _process_response(self, response):
+        """
+        Check the response returned by the HTTP client, and raise the
+        appropriate API error if the request was not successful.
+        """
         # Handle error codes here
-        if not ret.status_code == 200:
-            self._handle_request_error(response=ret)
+        if not response.status_code == 200:
+            self._handle_request_error(response=response)
+
+        return response
+
+    def _request(self, endpoint, method="get", **kwargs):
+        kws = self._prepare_request(endpoint=endpoint, method=method, **kwargs)
+
+        ret = self._client.request(**kws)
 
-        return ret
+        return self._process_response(response=ret)
 
 # =============================================================================
 
@@ -0,0 +1,147 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# ASYNCHRONOUS API REQUESTOR SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import threading as _threading
+
+# Local imports
+from . import api_requestor as _api_requestor
+from . import async_http_client as _async_http_client
+from . import http_client as _http_client
+
+from .util import config as _config
+from .util import custom_logging as _logging
+
+# =============================================================================
+
+# Global submodule constants
+_LOG_SCOPE = "{}".format(__name__)
+
+# Global submodule protected attributes
+_logger = _logging.get_logger(name=_LOG_SCOPE)
+_requestors_lock = _threading.Lock()
+
+# =============================================================================
+
+class AsyncAPIRequestor(object):
+    """
+    Awaitable counterpart of `APIRequestor`. The credentials, headers and
+    error handling are those of an underlying (synchronous) `APIRequestor`,
+    while the requests themselves are awaited through an `AsyncHTTPClient`.
+    """
+
+    def __init__(
+        self,
+        api_key=None,
+        base_url=_config.BASE_URL,
+        client=None,
+        requestor=None,
+        max_workers=_async_http_client.DEFAULT_MAX_WORKERS,
+        **kwargs
+    ):
+        self._requestor = requestor
+        self._client = client
+
+        if not isinstance(self._requestor, _api_requestor.APIRequestor):
+            self._requestor = _api_requestor.APIRequestor(
+                api_key=api_key,
+                base_url=base_url,
+                client=getattr(self._client, "http_client", None),
+                **kwargs
+            )
+
+        if not isinstance(self._client, _async_http_client.AsyncHTTPClient):
+            # Share the HTTPClient of the synchronous requestor
+            self._client = _async_http_client.AsyncHTTPClient(
+                client=self._requestor._client,
+                max_workers=max_workers)
+
+    @property
+    def requestor(self):
+        # type: () -> _api_requestor.APIRequestor
+        """
+        The synchronous `APIRequestor` which this requestor mirrors.
+        """
+        return self._requestor
+
+    @property
+    def api_key(self):
+        return self._requestor.api_key
+
+    @property
+    def max_workers(self):
+        # type: () -> int
+        """
+        The maximum number of requests of this requestor that can be in
+        flight at once (see `AsyncHTTPClient.max_workers`).
+        """
+        return self._client.max_workers
+
+    @max_workers.setter
+    def max_workers(self, value):
+        # type: (int) -> None
+        self._client.max_workers = value
+
+    async def _request(self, endpoint, method="get", **kwargs):
+        kws = self._requestor._prepare_request(
+            endpoint=endpoint, method=method, **kwargs)
+
+        ret = await self._client.request(**kws)
+
+        return self._requestor._process_response(response=ret)
+
+    def close(self):
+        # type: () -> None
+        self._client.close()
+
+# =============================================================================
+
+def for_requestor(requestor):
+    # type: (_api_requestor.APIRequestor) -> AsyncAPIRequestor
+    """
+    Return the `AsyncAPIRequestor` associated with a (synchronous)
+    `APIRequestor`, creating it the first time it is needed.
+    """
+    if requestor is None or requestor is _api_requestor.STATIC_REQUESTOR:
+        return STATIC_ASYNC_REQUESTOR
+
+    # NOTE: The async requestor is stored on the requestor itself (rather than
+    # in a registry keyed by requestor, which it would keep alive), so that
+    # both are collected together
+    async_requestor = requestor._async_requestor
+    if async_requestor is None:
+        with _requestors_lock:
+            async_requestor = requestor._async_requestor
+            if async_requestor is None:
+                async_requestor = AsyncAPIRequestor(requestor=requestor)
+                requestor._async_requestor = async_requestor
+
+    return async_requestor
+
+# =============================================================================
+
+def _get_static_client():
+    # type: () -> _http_client.HTTPClient
+    return _api_requestor.STATIC_REQUESTOR._client
+
+# NOTE: Unlike the requestors of `for_requestor`, the static async requestor
+# does not share the HTTPClient of `STATIC_REQUESTOR` (which keeps a session
+# per thread): it has its own pooled client, so that all its workers share a
+# single pool of connections. That client follows the retry policy, rate
+# limiter and cache of `STATIC_REQUESTOR`, and its concurrency is set through
+# `STATIC_ASYNC_REQUESTOR.max_workers`.
+STATIC_ASYNC_REQUESTOR = AsyncAPIRequestor(
+    requestor=_api_requestor.STATIC_REQUESTOR,
+    client=_async_http_client.AsyncHTTPClient(
+        client=_http_client._SharedSettingsHTTPClient(
+            get_client=_get_static_client,
+            pooled=True,
+            pool_maxsize=_async_http_client.DEFAULT_MAX_WORKERS),
+        max_workers=_async_http_client.DEFAULT_MAX_WORKERS))
+
+# =============================================================================
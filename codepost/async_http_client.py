@@ -0,0 +1,145 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# ASYNCHRONOUS HTTP CLIENT SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import asyncio as _asyncio
+import concurrent.futures as _futures
+import functools as _functools
+import threading as _threading
+
+# Local imports
+from . import http_client as _http_client
+from .util import custom_logging as _logging
+
+# =============================================================================
+
+# Global submodule constants
+_LOG_SCOPE = "{}".format(__name__)
+
+DEFAULT_MAX_WORKERS = 64
+
+# Global submodule protected attributes
+_logger = _logging.get_logger(name=_LOG_SCOPE)
+
+# =============================================================================
+
+class AsyncHTTPClient(object):
+    """
+    Awaitable HTTP client, which dispatches the requests of an underlying
+    `HTTPClient` to a bounded pool of worker threads, so that many requests
+    can be in flight at once on a single event loop.
+    """
+
+    def __init__(self, client=None, max_workers=DEFAULT_MAX_WORKERS, **kwargs):
+        # type: (_http_client.HTTPClient, int, dict) -> AsyncHTTPClient
+        self._client = client
+        self._max_workers = max_workers
+        self._executor = None
+
+        if not isinstance(self._client, _http_client.HTTPClient):
+            # Initialize a default HTTPClient, whose workers all share a
+            # single pool of connections
+            kwargs.setdefault("pooled", True)
+            kwargs.setdefault("pool_maxsize", max_workers)
+            self._client = _http_client.HTTPClient(**kwargs)
+
+        # NOTE: Like for HTTPClient, the lock and executor cannot be pickled,
+        # see custom pickling below.
+        self._lock = _threading.Lock()
+
+    @property
+    def http_client(self):
+        # type: () -> _http_client.HTTPClient
+        """
+        The synchronous `HTTPClient` through which requests are made.
+        """
+        return self._client
+
+    @property
+    def max_workers(self):
+        # type: () -> int
+        """
+        The maximum number of requests that can be in flight at once.
+
+        NOTE: The connection pool of the `HTTPClient` is sized on creation,
+        and should hold at least as many connections.
+        """
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, value):
+        # type: (int) -> None
+        with self._lock:
+            self._max_workers = value
+            executor = self._executor
+            self._executor = None
+
+        # The requests in flight complete on the previous pool of workers
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _get_executor(self):
+        # type: () -> _futures.ThreadPoolExecutor
+        """
+        Return or establish the pool of worker threads used to make requests.
+        """
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = _futures.ThreadPoolExecutor(
+                        max_workers=self._max_workers)
+        return self._executor
+
+    async def request(self, url, method="GET", headers=None, **kwargs):
+        """
+        Make an HTTP request without blocking the event loop, and return the
+        `HTTPResponse` once it is available.
+        """
+        loop = _asyncio.get_event_loop()
+
+        return await loop.run_in_executor(
+            self._get_executor(),
+            _functools.partial(
+                self._client.request,
+                url=url,
+                method=method,
+                headers=headers,
+                **kwargs
+            ))
+
+    def close(self):
+        # type: () -> None
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        # These attributes cannot be pickled (but that's not a problem!)
+        state.pop("_executor", None)
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self.__dict__["_executor"] = None
+        self.__dict__["_lock"] = _threading.Lock()
+        return self
+
+# =============================================================================
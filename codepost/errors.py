@@ -349,6 +349,70 @@ class CannotChooseIDError(TemplatedRuntimeError):
 
 # =============================================================================
 
+class BatchOperationError(TemplatedRuntimeError):
+    """
+    Run-time error due to the failure of some of the operations of a batch
+    (for instance, the deletions made when saving a linked list), the others
+    having succeeded. The exception raised by each failed operation is
+    available in `failures`, by item (such as the ID of a resource).
+    """
+
+    DEFAULT_MESSAGE = """
+        BATCH OPERATION ERROR.
+        {failed_count} out of {count} operations ({operation}) failed.
+        """
+
+    # Maximum number of failures detailed in the message
+    MAX_REPORTED_FAILURES = 10
+
+    def __init__(self, message=None, operation="", failures=None, count=None,
+                 **kwargs):
+        failures = dict(failures or dict())
+        if count is None:
+            count = len(failures)
+
+        if message is None:
+            message = _f(
+                s=self.DEFAULT_MESSAGE,
+                operation=operation,
+                failed_count=len(failures),
+                count=count,
+                **kwargs
+            )
+
+            # NOTE: Not formatted, as the errors may contain braces
+            details = [
+                "        {!r}: {!r}".format(item, error)
+                for (item, error) in list(failures.items())[
+                    :self.MAX_REPORTED_FAILURES]
+            ]
+            if len(failures) > self.MAX_REPORTED_FAILURES:
+                details.append("        ... ({} more)".format(
+                    len(failures) - self.MAX_REPORTED_FAILURES))
+            message = "\n".join([message.rstrip()] + details)
+
+        super(BatchOperationError, self).__init__(message=message)
+
+        self._operation = operation
+        self._failures = failures
+        self._count = count
+
+    @property
+    def operation(self):
+        return self._operation
+
+    @property
+    def failures(self):
+        # type: () -> dict
+        return self._failures
+
+    @property
+    def count(self):
+        # type: () -> int
+        return self._count
+
+# =============================================================================
+
 class UploadError(TemplatedRuntimeError):
     """
     Run-time error related to the upload of a submission.
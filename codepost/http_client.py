@@ -9,13 +9,23 @@ from __future__ import print_function # Python 2
 # Python stdlib imports
 import copy as _copy
 import functools as _functools
+import hashlib as _hashlib
 import inspect as _inspect
 import json as _json
 import logging as _logging
 import os as _os
+import socket as _socket
 import threading as _threading
 import time as _time
+import typing as _typing
+import weakref as _weakref
 import sys as _sys
+try:
+    # Python 3
+    from collections.abc import Mapping as _Mapping
+except ImportError: # pragma: no cover
+    # Python 2
+    from collections import Mapping as _Mapping
 try:
     # Python 3
     from urllib.parse import urljoin
@@ -30,8 +40,15 @@ except ImportError: # pragma: no cover
 # External dependencies
 # import better_exceptions as _better_exceptions
 import requests as _requests
+from requests.packages.urllib3.connection import HTTPConnection as _HTTPConnection
+from requests.structures import CaseInsensitiveDict as _CaseInsensitiveDict
 
 # Local imports
+from . import rate_limiter as _rate_limiter
+from . import retry as _retry
+
+from .util import cache as _cache
+from .util import codec as _codec
 from .util import config as _config
 from .util import custom_logging as _logging
 
@@ -47,12 +64,51 @@ _f = _make_f(globals=lambda: globals(), locals=lambda: locals())
 # Global submodule constants
 _LOG_SCOPE = "{}".format(__name__)
 
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+# Headers of the conditional requests revalidating cached responses
+ETAG_HEADER = "ETag"
+LAST_MODIFIED_HEADER = "Last-Modified"
+IF_NONE_MATCH_HEADER = "If-None-Match"
+IF_MODIFIED_SINCE_HEADER = "If-Modified-Since"
+
 # Global submodule protected attributes
 _logger = _logging.get_logger(name=_LOG_SCOPE)
+_UNSET = object()
 
 # =============================================================================
 
+class HTTPHeaders(_Mapping):
+    """
+    Read-only, case-insensitive view of the headers of an HTTP response.
+    """
+
+    __slots__ = ("_headers",)
+
+    def __init__(self, headers=None):
+        if not isinstance(headers, _CaseInsensitiveDict):
+            headers = _CaseInsensitiveDict(headers or {})
+        self._headers = headers
+
+    def __getitem__(self, key):
+        return self._headers[key]
+
+    def __iter__(self):
+        return iter(self._headers)
+
+    def __len__(self):
+        return len(self._headers)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, dict(self._headers))
+
 class HTTPResponse(object):
+    """
+    Response to an HTTP request. The body is kept as received, and is only
+    decoded (`content`) or parsed (`json`) once, on first access: the parsed
+    JSON object is shared by all accesses, and should not be modified.
+    """
 
     def __init__(self, data=None, response=None):
 
@@ -65,9 +121,13 @@ class HTTPResponse(object):
                 pass
 
         self._response = response
+        self._headers = None
+        self._json = _UNSET
 
     @property
     def response(self):
+        # NOTE: `None` if the client was configured not to keep the responses
+        # of the `requests` library
         return self._response
 
     @property
@@ -80,23 +140,100 @@ class HTTPResponse(object):
 
     @property
     def content(self):
-        return self._data.get("content", None)
+        content = self._data.get("content", None)
+        # NOTE: Empty bodies are decoded too, as templates formatting the
+        # content (e.g., of error messages) expect a string
+        if type(content) is bytes:
+            # Replace the bytes by their decoded string, so that the body is
+            # only held once
+            content = content.decode("utf8")
+            self._data["content"] = content
+        return content
 
     @property
     def json(self):
-        content_str = self._data.get("content", None)
-        if content_str:
-            try:
-                content_json = _json.loads(content_str)
-                return content_json
-            except:
-                return None
+        if self._json is _UNSET:
+            content = self._data.get("content", None)
+            content_json = None
+            if content:
+                try:
+                    content_json = _codec.loads(content)
+                except:
+                    pass
+            self._json = content_json
+        return self._json
 
     @property
     def headers(self):
-        return _copy.deepcopy(self._data.get("headers", None))
+        if self._headers is None:
+            self._headers = HTTPHeaders(self._data.get("headers", None))
+        return self._headers
+
+class _SessionHTTPAdapter(_requests.adapters.HTTPAdapter):
+    """
+    HTTP adapter which (optionally) enables TCP keep-alive probes on the pooled
+    connections, so that idle connections are not silently dropped.
+    """
+
+    __attrs__ = _requests.adapters.HTTPAdapter.__attrs__ + ["_keep_alive"]
+
+    def __init__(self, keep_alive=True, **kwargs):
+        self._keep_alive = keep_alive
+        super(_SessionHTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._keep_alive:
+            socket_options = list(_HTTPConnection.default_socket_options)
+            socket_options.append((_socket.SOL_SOCKET, _socket.SO_KEEPALIVE, 1))
+            kwargs.setdefault("socket_options", socket_options)
+        return super(_SessionHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+class _SessionHolder(object):
+    """
+    Thread-local container of a session, which closes the session when the
+    thread it belongs to exits (and its local storage is released).
+    """
+
+    def __init__(self, session, owned=True):
+        self.session = session
+        if owned:
+            _weakref.finalize(self, session.close)
+
+def _get_cache_key(url, headers=None, params=None):
+    # type: (str, dict, dict) -> str
+    """
+    Return the key under which the response to a `GET` request is cached;
+    responses are only shared between requests made with the same API key.
+    """
+    if params:
+        url = "{}{}{}".format(
+            url, "&" if "?" in url else "?",
+            urlencode(sorted(dict(params).items())))
+
+    auth = _retry._get_header(headers or {}, "Authorization") or ""
+    auth_hash = _hashlib.sha256(auth.encode("utf8")).hexdigest()[:16]
+
+    return "GET {} {}".format(auth_hash, url)
 
 class HTTPClient(object):
+    """
+    HTTP client making the requests to the codePost API.
+
+    By default, each thread uses its own `requests.Session`. With `pooled`
+    set to `True`, all threads share a single session instead, and thus a
+    single pool of (up to `pool_maxsize`) keep-alive connections per host.
+    The client can be used as a context manager to close all its sessions.
+
+    When a `cache` is provided (either `True` for an in-memory cache, or a
+    `util.cache.CacheBackend`), the responses to `GET` requests carrying an
+    `ETag` or `Last-Modified` validator are stored, and later requests of the
+    same URL are made conditional: if the server answers HTTP 304 (Not
+    Modified), the cached response is returned without transferring the body
+    (nor parsing it again, with an in-memory cache).
+
+    With `keep_response` set to `False`, the `HTTPResponse` objects returned
+    by the client do not retain the underlying `requests.Response`.
+    """
 
     def __init__(
         self,
@@ -104,15 +241,37 @@ class HTTPClient(object):
         session=None,
         timeout=80,
         verify_ssl=True,
+        retry_policy=None,
+        rate_limiter=None,
+        pooled=False,
+        pool_connections=DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        pool_block=False,
+        keep_alive=True,
+        cache=None,
+        keep_response=True,
         **kwargs
     ):
-        # type: (str, str, str or dict, _requests.Session, int, bool) -> HTTPClient
+        # type: (str, str, str or dict, _requests.Session, int, bool, _retry.RetryPolicy, _rate_limiter.RateLimiter, bool, int, int, bool, bool, bool or _cache.CacheBackend, bool) -> HTTPClient
         self._proxy = None
         self._session = session
         self._timeout = timeout
         self._verify_ssl = verify_ssl
+        self._retry_policy = retry_policy
+        self._rate_limiter = rate_limiter
+        self._pooled = pooled
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._keep_alive = keep_alive
+        self._keep_response = keep_response
         self._kwargs = _copy.deepcopy(kwargs)
 
+        if not isinstance(self._retry_policy, _retry.RetryPolicy):
+            self._retry_policy = _retry.DEFAULT_RETRY_POLICY
+
+        self.cache = cache
+
         if proxy:
 
             if isinstance(proxy, str):
@@ -133,21 +292,168 @@ class HTTPClient(object):
         # NOTE: This make HTTPClient and any class containing it as an attribute
         # impossible to pickle. Implemented custom pickling to avoid this.
         self._local_thread = _threading.local()
+        self._lock = _threading.Lock()
+        self._pooled_session = None
+        self._sessions = _weakref.WeakSet()
+
+    @property
+    def pooled(self):
+        # type: () -> bool
+        return self._pooled
+
+    def _create_session(self):
+        # type: () -> _requests.Session
+        """
+        Create a session with adapters sized according to the pool settings.
+        """
+        session = _requests.Session()
+
+        for prefix in ["https://", "http://"]:
+            session.mount(prefix, _SessionHTTPAdapter(
+                keep_alive=self._keep_alive,
+                pool_connections=self._pool_connections,
+                pool_maxsize=self._pool_maxsize,
+                pool_block=self._pool_block,
+                # Retries are handled by the client's retry policy
+                max_retries=0,
+            ))
+
+        if not self._keep_alive:
+            session.headers["Connection"] = "close"
+
+        with self._lock:
+            self._sessions.add(session)
+
+        return session
 
     def _get_session(self):
-        # type: None -> _threading.local
+        # type: None -> _requests.Session
         """
-        Return or establish the session associated with the current thread.
+        Return or establish the session associated with the current thread
+        (or the session shared by all threads, in pooled mode).
         """
+        if self._session is not None:
+            return self._session
+
+        if self._pooled:
+            if self._pooled_session is None:
+                session = self._create_session()
+                with self._lock:
+                    if self._pooled_session is None:
+                        self._pooled_session = session
+                        session = None
+                if session is not None:
+                    session.close()
+            return self._pooled_session
+
         # Make sure the local thread storage has been instantiated
         if getattr(self, "_local_thread", None) is None:
             self._local_thread = _threading.local()
 
         # Store whatever session we use in the local thread storage
-        if getattr(self._local_thread, "session", None) is None:
-            self._local_thread.session = self._session or _requests.Session()
+        holder = getattr(self._local_thread, "holder", None)
+        if holder is None:
+            holder = _SessionHolder(session=self._create_session())
+            self._local_thread.holder = holder
+
+        return holder.session
+
+    def warm_up(self, url=None, connections=1):
+        # type: (str, int) -> int
+        """
+        Pre-establish up to `connections` connections (and their TLS sessions)
+        to the host of `url` (by default, the codePost API) by concurrently
+        making lightweight `HEAD` requests, so that they can be reused by the
+        first requests.
+
+        :return: The number of connections successfully established.
+        """
+        if url is None:
+            url = _config.BASE_URL
+
+        connections = max(1, min(connections, self._pool_maxsize))
+        session = self._get_session()
+        successes = []
+
+        def connect():
+            try:
+                session.head(
+                    url,
+                    timeout=self._timeout,
+                    verify=self._verify_ssl,
+                    proxies=self._proxy)
+                successes.append(True)
+            except Exception as e:
+                _logger.debug("Could not warm up connection to {}: {!r}".format(url, e))
+
+        if connections == 1 or not self._pooled:
+            connect()
+        else:
+            threads = [
+                _threading.Thread(target=connect)
+                for _ in range(connections)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        return len(successes)
+
+    @property
+    def retry_policy(self):
+        # type: () -> _retry.RetryPolicy
+        """
+        The policy according to which failed requests are retried.
+        """
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value):
+        # Use `retry.NO_RETRY` to disable retries
+        if not isinstance(value, _retry.RetryPolicy):
+            value = _retry.DEFAULT_RETRY_POLICY
+        self._retry_policy = value
+
+    @property
+    def rate_limiter(self):
+        """
+        The rate limiter (if any) throttling the requests of this client: either
+        a `RateLimiter`, or a `SharedRateLimiter` to share a limiter between
+        all clients using the same API key.
+        """
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, value):
+        self._rate_limiter = value
+
+    @property
+    def cache(self):
+        # type: () -> _typing.Optional[_cache.CacheBackend]
+        """
+        The backend (if any) in which responses to `GET` requests are cached.
+        """
+        return self._cache
+
+    @cache.setter
+    def cache(self, value):
+        if value is True:
+            value = _cache.MemoryCache()
+        elif not isinstance(value, _cache.CacheBackend):
+            value = None
+        self._cache = value
 
-        return self._local_thread.session
+    def _get_rate_limiter(self, headers=None):
+        # type: (dict) -> _typing.Optional[_rate_limiter.RateLimiter]
+        limiter = self._rate_limiter
+
+        if isinstance(limiter, _rate_limiter.SharedRateLimiter):
+            auth = (headers or {}).get("Authorization", "") or ""
+            api_key = auth[len("Token "):] if auth.startswith("Token ") else auth
+            limiter = limiter.for_api_key(api_key=api_key)
+
+        return limiter
 
     @_logging.log_call
     def request(self, url, method="GET", headers=None, **kwargs):
@@ -157,12 +463,154 @@ class HTTPClient(object):
         # Calculate extra keyword arguments
         kwargs["verify"] = self._verify_ssl
         kwargs["proxies"] = self._proxy
+        kwargs.setdefault("timeout", self._timeout)
 
         # Provided arguments override the calculated ones
         kws.update(self._kwargs)
         kws.update(kwargs)
 
+        cache = self._cache
+        cache_key = None
+        entry = None
+
+        if cache is not None:
+            if method.upper() == "GET":
+                cache_key = _get_cache_key(
+                    url=url, headers=headers, params=kws.get("params", None))
+                entry = cache.get(cache_key)
+                if entry is not None:
+                    headers = self._add_validators(headers=headers, entry=entry)
+            else:
+                # A write to the resource makes its cached representation
+                # stale (its validators would not match anyway)
+                cache.delete(_get_cache_key(url=url, headers=headers))
+
+        response = self._request_with_retries(
+            url=url, method=method, headers=headers, **kws)
+
+        if cache_key is not None:
+            response = self._update_cache(
+                cache_key=cache_key, entry=entry, response=response)
+
+        return response
+
+    @staticmethod
+    def _add_validators(headers, entry):
+        # type: (dict, dict) -> dict
+        headers = dict(headers or {})
+        if entry.get("etag", None):
+            headers.setdefault(IF_NONE_MATCH_HEADER, entry["etag"])
+        if entry.get("last_modified", None):
+            headers.setdefault(IF_MODIFIED_SINCE_HEADER, entry["last_modified"])
+        return headers
+
+    def _update_cache(self, cache_key, entry, response):
+        # type: (str, dict, HTTPResponse) -> HTTPResponse
+        """
+        Store a cacheable response, or serve a HTTP 304 from the cache.
+        """
+        if response.status_code == 304 and entry is not None:
+            # The server may send updated headers along with the 304
+            headers = dict(entry.get("headers", None) or {})
+            headers.update(response.headers or {})
+
+            cached_response = HTTPResponse(data={
+                "content": entry.get("content", None),
+                "status_code": 200,
+                "url": response.url or entry.get("url", ""),
+                "headers": headers,
+            }, response=response.response)
+
+            # The body is not parsed again if its parsed JSON object was kept
+            # along with it
+            if "json" in entry:
+                cached_response._json = entry["json"]
+
+            return cached_response
+
+        if response.status_code != 200:
+            return response
+
+        headers = response.headers or {}
+        etag = _retry._get_header(headers, ETAG_HEADER)
+        last_modified = _retry._get_header(headers, LAST_MODIFIED_HEADER)
+
+        if etag is None and last_modified is None:
+            # Without validators, the response cannot be revalidated
+            if entry is not None:
+                self._cache.delete(cache_key)
+            return response
+
+        content = response.content or ""
+        new_entry = {
+            "url": response.url,
+            "headers": dict(headers),
+            "content": content,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+
+        # NOTE: The JSON object (parsed once, and shared by the responses
+        # served from the entry) is only kept by backends which do not
+        # serialize their entries
+        if self._cache.stores_objects:
+            new_entry["json"] = response.json
+
+        self._cache.set(cache_key, new_entry, size=len(content))
+
+        return response
+
+    def _request_with_retries(self, url, method="GET", headers=None, **kws):
         session = self._get_session()
+        policy = self._retry_policy
+        limiter = self._get_rate_limiter(headers=headers)
+
+        # NOTE: The same headers (and thus the same `Idempotency-Key`) are
+        # sent with every attempt, so that a retried POST cannot create a
+        # duplicate resource.
+
+        attempt = 0
+
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+
+            try:
+                response = self._request_once(
+                    session=session,
+                    url=url,
+                    method=method,
+                    headers=headers,
+                    **kws
+                )
+            except Exception as e:
+                if not policy.should_retry_exception(
+                        attempt=attempt, exception=e,
+                        method=method, headers=headers):
+                    raise
+
+                delay = policy.get_backoff(attempt=attempt)
+                _logger.debug(
+                    "Request {} {} failed ({!r}), retrying in {:.2f}s.".format(
+                        method, url, e, delay))
+            else:
+                if limiter is not None:
+                    limiter.observe(response)
+
+                if not policy.should_retry_response(
+                        attempt=attempt, response=response,
+                        method=method, headers=headers):
+                    return response
+
+                delay = policy.get_backoff(attempt=attempt, response=response)
+                _logger.debug(
+                    "Request {} {} failed (HTTP {}), retrying in {:.2f}s.".format(
+                        method, url, response.status_code, delay))
+
+            policy.sleep(delay)
+            attempt += 1
+
+    def _request_once(self, session, url, method="GET", headers=None, **kws):
         resp_dict = {}
 
         log_action = _logging.start_action(
@@ -200,15 +648,12 @@ class HTTPClient(object):
                     """.format(e=e)
                 )
 
-            content = ret.content
-            if content:
-                if type(content) is bytes:
-                    content = content.decode("utf8")
-
-            resp_dict["content"] = content
+            # NOTE: The body is decoded/parsed lazily by `HTTPResponse`, and
+            # the headers are wrapped in a read-only view rather than copied
+            resp_dict["content"] = ret.content
             resp_dict["status_code"] = ret.status_code
             resp_dict["url"] = ret.url
-            resp_dict["headers"] = _copy.deepcopy(dict(ret.headers))
+            resp_dict["headers"] = ret.headers
 
         except Exception as e:
             log_action.finish(exception=e)
@@ -216,7 +661,9 @@ class HTTPClient(object):
 
         log_action.finish()
 
-        return HTTPResponse(data=resp_dict, response=ret)
+        return HTTPResponse(
+            data=resp_dict,
+            response=ret if self._keep_response else None)
 
     def _handle_request_error(self, e):
         # Meant to handle HTTP/socket-level errors
@@ -225,20 +672,90 @@ class HTTPClient(object):
 
     def close(self):
         # type: None -> None
-        session = self._get_session()
-        if session:
+        """
+        Close all the sessions of the client (those of all threads, or the
+        shared session in pooled mode); new sessions are established if the
+        client is used again.
+        """
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions = _weakref.WeakSet()
+            self._pooled_session = None
+            self._local_thread = _threading.local()
+
+        if self._session is not None:
+            sessions.append(self._session)
+
+        for session in sessions:
             session.close()
-            s = _requests.Session()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def  __getstate__(self):
         state = dict(self.__dict__)
-        if "_local_thread" in state:
-            # This attribute cannot be pickled (but that's not a problem!)
-            del state["_local_thread"]
+        # These attributes cannot be pickled (but that's not a problem!)
+        for attr in ["_local_thread", "_lock", "_pooled_session", "_sessions"]:
+            state.pop(attr, None)
         return state
 
     def __setstate__(self, state):
         self.__dict__ = state
         if self.__dict__.get("_local_thread", None) is None:
             self.__dict__["_local_thread"] = _threading.local()
+        self.__dict__["_lock"] = _threading.Lock()
+        self.__dict__["_pooled_session"] = None
+        self.__dict__["_sessions"] = _weakref.WeakSet()
         return self
+
+# =============================================================================
+
+class _SharedSettingsHTTPClient(HTTPClient):
+    """
+    HTTP client with its own sessions (e.g., a single pooled session), whose
+    retry policy, rate limiter and cache are those of another client, as
+    returned by `get_client` (so that the replacement of that client is also
+    followed): configuring either client configures both.
+    """
+
+    def __init__(self, get_client, **kwargs):
+        # type: (_typing.Callable[[], HTTPClient], dict) -> _SharedSettingsHTTPClient
+        self._get_client = get_client
+
+        # NOTE: The base class assigns the settings, which are thus those of
+        # the other client to begin with
+        client = get_client()
+        kwargs["retry_policy"] = client.retry_policy
+        kwargs["rate_limiter"] = client.rate_limiter
+        kwargs["cache"] = client.cache
+
+        super(_SharedSettingsHTTPClient, self).__init__(**kwargs)
+
+    @property
+    def _retry_policy(self):
+        return self._get_client()._retry_policy
+
+    @_retry_policy.setter
+    def _retry_policy(self, value):
+        self._get_client()._retry_policy = value
+
+    @property
+    def _rate_limiter(self):
+        return self._get_client()._rate_limiter
+
+    @_rate_limiter.setter
+    def _rate_limiter(self, value):
+        self._get_client()._rate_limiter = value
+
+    @property
+    def _cache(self):
+        return self._get_client()._cache
+
+    @_cache.setter
+    def _cache(self, value):
+        self._get_client()._cache = value
+
+# =============================================================================
@@ -1,27 +1,68 @@
-from .models import assignments as _assignments
-from .models import courses as _courses
-from .models import course_rosters as _course_rosters
-from .models import submissions as _submissions
-from .models import files as _files
-from .models import comments as _comments
-from .models import sections as _sections
-from .models import rubric_categories as _rubric_categories
-from .models import rubric_comments as _rubric_comments
-from .models import test_categories as _test_categories
-from .models import test_cases as _test_cases
-from .models import submission_tests as _submission_tests
-from .models import file_templates as _file_templates
-
-assignment = _assignments.Assignments(static=True)
-course = _courses.Courses(static=True)
-roster = _course_rosters.CourseRosters(static=True)
-submission = _submissions.Submissions(static=True)
-file = _files.Files(static=True)
-comment = _comments.Comments(static=True)
-section = _sections.Sections(static=True)
-rubric_category = _rubric_categories.RubricCategories(static=True)
-rubric_comment = _rubric_comments.RubricComments(static=True)
-test_category = _test_categories.TestCategories(static=True)
-test_case = _test_cases.TestCases(static=True)
-submission_test = _submission_tests.SubmissionTests(static=True)
-file_template = _file_templates.FileTemplates(static=True)
+# =============================================================================
+# codePost v2.0 SDK
+#
+# INSTANTIATED HELPERS SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import importlib as _importlib
+import sys as _sys
+import threading as _threading
+
+# =============================================================================
+
+# Name of the helper -> (model sub-module, model class); the helpers, and
+# the modules of their models, are created on first access (see `__getattr__`)
+_HELPERS = {
+    "assignment":       ("assignments", "Assignments"),
+    "course":           ("courses", "Courses"),
+    "roster":           ("course_rosters", "CourseRosters"),
+    "submission":       ("submissions", "Submissions"),
+    "file":             ("files", "Files"),
+    "comment":          ("comments", "Comments"),
+    "section":          ("sections", "Sections"),
+    "rubric_category":  ("rubric_categories", "RubricCategories"),
+    "rubric_comment":   ("rubric_comments", "RubricComments"),
+    "test_category":    ("test_categories", "TestCategories"),
+    "test_case":        ("test_cases", "TestCases"),
+    "submission_test":  ("submission_tests", "SubmissionTests"),
+    "file_template":    ("file_templates", "FileTemplates"),
+}
+
+__all__ = list(_HELPERS)
+
+_helpers_lock = _threading.Lock()
+
+# =============================================================================
+
+def _create_helper(name):
+    (module_name, class_name) = _HELPERS[name]
+
+    with _helpers_lock:
+        # NOTE: Checked again, as another thread may have created the helper
+        helper = globals().get(name, None)
+        if helper is None:
+            module = _importlib.import_module(
+                "..models." + module_name, __name__)
+            helper = getattr(module, class_name)(static=True)
+            globals()[name] = helper
+
+    return helper
+
+def __getattr__(name):
+    if name in _HELPERS:
+        return _create_helper(name)
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(_HELPERS))
+
+if _sys.version_info < (3, 7): # pragma: no cover
+    # Module-level `__getattr__` is only supported in Python 3.7+ (PEP 562)
+    for _name in _HELPERS:
+        _create_helper(_name)
+
+# =============================================================================
@@ -11,7 +11,9 @@ from .api_crud import (
     CreatableAPIResource,
     ReadableAPIResource,
     UpdatableAPIResource,
-    DeletableAPIResource
+    DeletableAPIResource,
+    CreateManyReport,
+    CreateResult,
 )
 
 # =============================================================================
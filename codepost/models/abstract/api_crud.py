@@ -6,25 +6,145 @@
 
 from __future__ import print_function # Python 2
 
+# Python stdlib imports
+import asyncio as _asyncio
+import collections as _collections
+import functools as _functools
+import typing as _typing
+
 # External dependencies
 # import better_exceptions as _better_exceptions
 
 # Local imports
 import codepost.errors as _errors
+import codepost.util.concurrency as _concurrency
 import codepost.util.custom_logging as _logging
 
 from . import api_resource as _api_resource
+from . import identity_map as _identity_map
+from . import prefetch as _prefetch
+from . import resource_cache as _resource_cache
 
 # =============================================================================
 
 # Global submodule constants
 _LOG_SCOPE = "{}".format(__name__)
 
+DEFAULT_CREATE_MANY_CONCURRENCY = 8
+
 # Global submodule protected attributes
 _logger = _logging.get_logger(name=_LOG_SCOPE)
 
 # =============================================================================
 
+def _merge(obj, api_key=None):
+    """
+    Return the canonical instance of a fetched (or updated) API resource, if
+    an identity map session is active (see `identity_map.session`); `api_key`
+    is the API key with which the resource was fetched.
+    """
+    identity_map = _identity_map.get_session()
+    if identity_map is None:
+        return obj
+    return identity_map.merge(obj, api_key=api_key)
+
+def _forget(cls, id, api_key=None):
+    identity_map = _identity_map.get_session()
+    if identity_map is not None:
+        identity_map.remove(cls=cls, id=id, api_key=api_key)
+
+def _cache_write(obj, data, id=None):
+    """
+    Store the data returned by the API for a resource in the resource cache
+    (if one is configured).
+    """
+    cache = _resource_cache.get_resource_cache()
+    if cache is None or not isinstance(data, dict):
+        return
+
+    _id = data.get(obj._FIELD_ID, id)
+    if _id is not None:
+        cache.set(
+            cls=type(obj), id=_id, data=data,
+            api_key=obj._requestor.api_key)
+
+def _cache_invalidate(obj, id):
+    cache = _resource_cache.get_resource_cache()
+    if cache is not None:
+        cache.invalidate(cls=type(obj), id=id, api_key=obj._requestor.api_key)
+
+# =============================================================================
+
+# Outcome of the creation of the `index`-th item of `create_many`: either the
+# created `resource`, or the exception raised (`error`)
+CreateResult = _collections.namedtuple(
+    "CreateResult",
+    ["index", "data", "resource", "error"])
+
+class CreateManyReport(object):
+    """
+    Report of the creations made by `create_many`: the results of the
+    successful creations (`succeeded`, unless they are not kept, in which
+    case they are only counted) and of the failed ones (`failed`).
+    """
+
+    def __init__(self, keep_succeeded=True):
+        self._keep_succeeded = keep_succeeded
+        self._succeeded_count = 0
+        self.succeeded = list()
+        self.failed = list()
+
+    def add(self, result):
+        # type: (CreateResult) -> None
+        if result.error is not None:
+            self.failed.append(result)
+        else:
+            self._succeeded_count += 1
+            if self._keep_succeeded:
+                self.succeeded.append(result)
+
+    @property
+    def succeeded_count(self):
+        # type: () -> int
+        return self._succeeded_count
+
+    @property
+    def failed_count(self):
+        # type: () -> int
+        return len(self.failed)
+
+    @property
+    def count(self):
+        # type: () -> int
+        return self._succeeded_count + len(self.failed)
+
+    @property
+    def ok(self):
+        # type: () -> bool
+        return len(self.failed) == 0
+
+    @property
+    def resources(self):
+        # type: () -> list
+        return [result.resource for result in self.succeeded]
+
+    def raise_for_errors(self):
+        """
+        Raise a `BatchOperationError` (with the exceptions by index of the
+        items) if any creation failed.
+        """
+        if self.failed:
+            raise _errors.BatchOperationError(
+                operation="create",
+                failures={result.index: result.error for result in self.failed},
+                count=self.count)
+
+    def __repr__(self):
+        return "<CreateManyReport: {} succeeded, {} failed>".format(
+            self.succeeded_count, self.failed_count)
+
+# =============================================================================
+
 class CreatableAPIResource(_api_resource.AbstractAPIResource):
     """
     Abstract class for API resources which can be created (Crud).
@@ -50,7 +170,88 @@ class CreatableAPIResource(_api_resource.AbstractAPIResource):
             data=data,
         )
         if ret.status_code == 201:
-            return _class_type(**ret.json)
+            _cache_write(obj=self, data=ret.json)
+            return _merge(
+                _class_type(**ret.json), api_key=self._requestor.api_key)
+
+    async def create_async(self, **kwargs):
+        """
+        Awaitable version of `create`.
+        """
+        _class_type = type(self)
+
+        # Cannot take an ID
+        if self._FIELD_ID in kwargs:
+            raise _errors.CannotChooseIDError()
+
+        data = self._get_data_and_extend(static=True, **kwargs)
+
+        ret = await self._async_requestor._request(
+            endpoint=self.class_endpoint,
+            method="POST",
+            data=data,
+        )
+        if ret.status_code == 201:
+            _cache_write(obj=self, data=ret.json)
+            return _merge(
+                _class_type(**ret.json), api_key=self._requestor.api_key)
+
+    def iter_create_many(
+        self,
+        items,
+        concurrency=DEFAULT_CREATE_MANY_CONCURRENCY,
+        ordered=True,
+    ):
+        # type: (_typing.Iterable[dict], int, bool) -> _typing.Iterator[CreateResult]
+        """
+        Create an API resource for each dictionary of field parameters of
+        `items`, with up to `concurrency` creations in progress at any time,
+        and yield a `CreateResult` per item (in the order of `items` if
+        `ordered`, otherwise as the creations complete).
+
+        `items` is consumed as the creations progress, so it can be a
+        generator of any length. A failed creation does not interrupt the
+        others: the exception is reported in the `error` of its result.
+        """
+
+        def create(indexed_item):
+            (index, data) = indexed_item
+            try:
+                return CreateResult(
+                    index=index, data=data, resource=self.create(**data),
+                    error=None)
+            except Exception as e:
+                return CreateResult(
+                    index=index, data=data, resource=None, error=e)
+
+        return _concurrency.bounded_map(
+            create, enumerate(items),
+            max_workers=concurrency,
+            ordered=ordered)
+
+    def create_many(
+        self,
+        items,
+        concurrency=DEFAULT_CREATE_MANY_CONCURRENCY,
+        ordered=True,
+        keep_succeeded=True,
+    ):
+        # type: (_typing.Iterable[dict], int, bool, bool) -> CreateManyReport
+        """
+        Create an API resource for each dictionary of field parameters of
+        `items`, concurrently (see `iter_create_many`), and return the report
+        of the successful and failed creations. With `keep_succeeded` set to
+        `False`, successful creations are only counted, so that the memory
+        used does not grow with the number of items.
+
+            report = codepost.comment.create_many(comments, concurrency=16)
+            report.raise_for_errors()
+        """
+        report = CreateManyReport(keep_succeeded=keep_succeeded)
+        for result in self.iter_create_many(
+                items, concurrency=concurrency, ordered=ordered):
+            report.add(result)
+        return report
 
     def duplicate(self, in_place=False, **kwargs):
         """
@@ -81,9 +282,11 @@ class ReadableAPIResource(_api_resource.AbstractAPIResource):
     Abstract class for API resources which can be read (cRud).
     """
 
-    def retrieve(self, id):
+    def retrieve(self, id, prefetch=None):
         """
-        Retrieve an API resource with the provided `id`.
+        Retrieve an API resource with the provided `id`. The relations listed
+        in `prefetch`, as dotted paths (e.g., `["files.comments", "tests"]`),
+        are also fetched, concurrently, level by level.
         """
         _id = id
         _class_type = type(self)
@@ -91,12 +294,114 @@ class ReadableAPIResource(_api_resource.AbstractAPIResource):
         if not self._validate_id(id=_id):
             raise _errors.InvalidIDError()
 
+        # Check the paths before making any request
+        if prefetch:
+            _prefetch.parse_paths(cls=_class_type, paths=prefetch)
+
+        # Within a session, each resource is only fetched once
+        obj = self._get_canonical(id=_id)
+
+        if obj is None:
+            obj = self._fetch(id=_id)
+            if obj is None:
+                return None
+            obj = _merge(obj, api_key=self._requestor.api_key)
+
+        return _prefetch.prefetch(obj=obj, paths=prefetch)
+
+    def _get_canonical(self, id):
+        """
+        Return the canonical instance of the API resource with the provided
+        `id` if it is in the identity map of the active session (if any).
+        """
+        identity_map = _identity_map.get_session()
+        if identity_map is None:
+            return None
+        return identity_map.get(
+            cls=type(self), id=id, api_key=self._requestor.api_key)
+
+    def _get_cached(self, id):
+        """
+        Return the API resource with the provided `id` if it is in the
+        resource cache (if one is configured).
+        """
+        _class_type = type(self)
+
+        cache = _resource_cache.get_resource_cache()
+        if cache is not None:
+            data = cache.get(
+                cls=_class_type, id=id, api_key=self._requestor.api_key)
+            if data is not None:
+                return _class_type(**data)
+
+    def _process_fetch_response(self, ret, id):
+        if ret.status_code == 200:
+            _cache_write(obj=self, data=ret.json, id=id)
+            return type(self)(**ret.json)
+
+    def _fetch(self, id, use_cache=True):
+        """
+        Fetch the API resource with the provided `id` (regardless of any
+        identity map session), from the resource cache if one is configured
+        and `use_cache` is `True`, or else from the API.
+        """
+        obj = self._get_cached(id=id) if use_cache else None
+        if obj is not None:
+            return obj
+
         ret = self._requestor._request(
-            endpoint=self.instance_endpoint_by_id(id=_id),
+            endpoint=self.instance_endpoint_by_id(id=id),
             method="GET",
         )
-        if ret.status_code == 200:
-            return _class_type(**ret.json)
+        return self._process_fetch_response(ret=ret, id=id)
+
+    async def _fetch_async(self, id, use_cache=True):
+        """
+        Awaitable version of `_fetch`.
+        """
+        obj = self._get_cached(id=id) if use_cache else None
+        if obj is not None:
+            return obj
+
+        ret = await self._async_requestor._request(
+            endpoint=self.instance_endpoint_by_id(id=id),
+            method="GET",
+        )
+        return self._process_fetch_response(ret=ret, id=id)
+
+    async def retrieve_async(self, id, prefetch=None):
+        """
+        Awaitable version of `retrieve`.
+        """
+        _id = id
+        _class_type = type(self)
+
+        if not self._validate_id(id=_id):
+            raise _errors.InvalidIDError()
+
+        # Check the paths before making any request
+        if prefetch:
+            _prefetch.parse_paths(cls=_class_type, paths=prefetch)
+
+        # Within a session, each resource is only fetched once
+        obj = self._get_canonical(id=_id)
+
+        if obj is None:
+            obj = await self._fetch_async(id=_id)
+            if obj is None:
+                return None
+            obj = _merge(obj, api_key=self._requestor.api_key)
+
+        if not prefetch:
+            return obj
+
+        # NOTE: The relations are fetched by worker threads, so as not to
+        # block the event loop (within the session of the calling thread)
+        loop = _asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            _concurrency.bind_contexts(
+                _functools.partial(_prefetch.prefetch, obj=obj, paths=prefetch)))
 
     def refresh(self):
         """
@@ -107,7 +412,10 @@ class ReadableAPIResource(_api_resource.AbstractAPIResource):
 
         # Will throw an exception if this is a "static" object
         _id = self._get_id()
-        obj = self.retrieve(id=_id)
+
+        # NOTE: Bypasses the identity map (if in a session) and the resource
+        # cache (if any), so that a request is always made
+        obj = self._fetch(id=_id, use_cache=False)
 
         # Sanity check
         assert (
@@ -116,6 +424,9 @@ class ReadableAPIResource(_api_resource.AbstractAPIResource):
 
         self._data = obj._data
 
+        # Keep the canonical instance up to date
+        _merge(self, api_key=self._requestor.api_key)
+
         return self
 
 # =============================================================================
@@ -147,7 +458,31 @@ class UpdatableAPIResource(_api_resource.AbstractAPIResource):
             data=data,
         )
         if ret.status_code == 200:
-            return _class_type(**ret.json)
+            _cache_write(obj=self, data=ret.json, id=_id)
+            return _merge(
+                _class_type(**ret.json), api_key=self._requestor.api_key)
+
+    async def update_async(self, id, **kwargs):
+        """
+        Awaitable version of `update`.
+        """
+        _id = id
+        _class_type = type(self)
+
+        if not self._validate_id(id=_id):
+            raise _errors.InvalidIDError()
+
+        data = self._get_data_and_extend(static=True, exclude_read_only=True, **kwargs)
+
+        ret = await self._async_requestor._request(
+            endpoint=self.instance_endpoint_by_id(id=_id),
+            method="PATCH",
+            data=data,
+        )
+        if ret.status_code == 200:
+            _cache_write(obj=self, data=ret.json, id=_id)
+            return _merge(
+                _class_type(**ret.json), api_key=self._requestor.api_key)
 
     def _pre_save_hook(self):
         return
@@ -155,15 +490,39 @@ class UpdatableAPIResource(_api_resource.AbstractAPIResource):
     def save(self, **kwargs):
         """
         Update the instance of the API resource so as to save all recently
-        modified fields.
+        modified fields (and the fields provided as keyword arguments). No
+        request is made if no field was modified.
         """
 
+        # Only send the fields modified since the data was loaded
+        # NOTE: They are collected before the pre-save hook, as saving linked
+        # lists may update the data of the object, for instance in an
+        # identity map session
+        _id = self._get_id()
+        dirty = self._dirty or ()
+        data = {
+            key: self._data[key]
+            for key in dirty
+            if key in self._data
+        }
+        data.update(kwargs)
+
         self._pre_save_hook()
 
+        # Linked lists assigned to fields are sent as lists of IDs (or e-mails)
+        for (key, value) in data.items():
+            if hasattr(value, "_to_serializable_list"):
+                data[key] = value._to_serializable_list()
+
         # FIXME: do kwargs validation
-        # NOTE: "id" is contained in the self._data which is extended
-        data = self._get_data_and_extend(exclude_read_only=True, **kwargs)
-        obj = self.update(**data)
+        data = self._get_data_and_extend(
+            static=True, exclude_read_only=True, **data)
+        data.pop(self._FIELD_ID, None)
+
+        if len(data) == 0:
+            return self
+
+        obj = self.update(id=_id, **data)
 
         # Sanity check
         assert (
@@ -195,6 +554,29 @@ class DeletableAPIResource(_api_resource.AbstractAPIResource):
             endpoint=self.instance_endpoint_by_id(id=_id),
             method="DELETE",
         )
+        if ret.status_code == 204:
+            _cache_invalidate(obj=self, id=_id)
+            _forget(
+                cls=type(self), id=_id, api_key=self._requestor.api_key)
+        return (ret.status_code == 204)
+
+    async def delete_async(self, id=None):
+        """
+        Awaitable version of `delete`.
+        """
+        _id = self._get_id(id=id)
+
+        if not self._validate_id(id=_id):
+            raise _errors.InvalidIDError()
+
+        ret = await self._async_requestor._request(
+            endpoint=self.instance_endpoint_by_id(id=_id),
+            method="DELETE",
+        )
+        if ret.status_code == 204:
+            _cache_invalidate(obj=self, id=_id)
+            _forget(
+                cls=type(self), id=_id, api_key=self._requestor.api_key)
         return (ret.status_code == 204)
 
 # =============================================================================
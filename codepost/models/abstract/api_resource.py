@@ -36,6 +36,7 @@ import requests as _requests
 # Local imports
 import codepost
 import codepost.api_requestor as _api_requestor
+import codepost.async_api_requestor as _async_api_requestor
 import codepost.errors as _errors
 import codepost.util.custom_logging as _logging
 import codepost.util.misc as _misc
@@ -64,16 +65,34 @@ class AbstractAPIResource(object):
     _static = False
     _cache = None
 
-    def __getattribute__(self, item):
-        return super(AbstractAPIResource, self).__getattribute__(item)
+    # Names of the fields modified since the data was loaded (a set, only
+    # created once a field is modified)
+    _dirty = None
 
     def __setattr__(self, item, value):
-        # Reset cache if internal state is modified
+        # Reset cache (and modified fields) if internal state is replaced
         if item == "_data":
             self._cache = None
+            self._dirty = None
 
         return super(AbstractAPIResource, self).__setattr__(item, value)
 
+    def _mark_dirty(self, field_name):
+        # type: (str) -> None
+        dirty = self._dirty
+        if dirty is None:
+            dirty = set()
+            self._dirty = dirty
+        dirty.add(field_name)
+
+    @property
+    def _async_requestor(self):
+        """
+        The awaitable counterpart of the requestor of this API resource, used
+        by the `*_async` verbs.
+        """
+        return _async_api_requestor.for_requestor(self._requestor)
+
     def _get_id(self, id=None, obj=None):
         raise NotImplementedError("abstract class not meant to be used")
 
@@ -224,11 +243,14 @@ class APIResource(AbstractAPIResource):
         """
         data = dict()
 
+        # NOTE: Values are not copied, as they are only serialized (which
+        # does not modify them)
+
         # If this is a static object, we should ignore self._data
 
         if not static and (not self._static and isinstance(self._data, dict)):
             # Combine instance data and extended (typically kwargs) argument
-            data.update(_copy.deepcopy(self._data))
+            data.update(self._data)
 
         if kwargs:
             # Make sure not to erase fields
@@ -236,13 +258,13 @@ class APIResource(AbstractAPIResource):
             # NOTE: In a more controled and documented manner, field erasure
             # could be a feature.
 
-            kwargs_copy = {
-                key: _copy.deepcopy(value)
+            kwargs_set = {
+                key: value
                 for (key, value) in kwargs.items()
                 if _misc.is_field_set_in_kwargs(key, kwargs)
             }
 
-            data.update(kwargs_copy)
+            data.update(kwargs_set)
 
         # Remove extraneous (unexpected) data + blank fields + read_only fields (if read_only arg is
         # switched on)
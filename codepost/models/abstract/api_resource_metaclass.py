@@ -32,12 +32,18 @@ import codepost.api_requestor as _api_requestor
 from . import api_crud as _crud
 from . import api_resource as _api_resource
 from . import linked_lists as _linked_lists
+from . import records as _records
 
 # =============================================================================
 
 # Global submodule constants
 _LOG_SCOPE = "{}".format(__name__)
 
+# Kinds of fields, which determine their accessors
+FIELD_KIND_SCALAR = "scalar"
+FIELD_KIND_RESOURCES = "resources"
+FIELD_KIND_STRINGS = "strings"
+
 # Global submodule protected attributes
 _logger = _logging.get_logger(name=_LOG_SCOPE)
 
@@ -114,6 +120,59 @@ def is_type_variable(typ):
 
 # =============================================================================
 
+class _FieldProperty(property):
+    """
+    Property of a field of an API resource, whose docstring is only wrapped
+    when it is first read (by `help`, IDEs, ...), rather than when the model
+    class is created.
+    """
+
+    __slots__ = ("_raw_doc", "_doc")
+
+    def __init__(self, fget=None, fset=None, fdel=None, doc=None):
+        self._raw_doc = doc
+        self._doc = None
+        super(_FieldProperty, self).__init__(fget, fset, fdel)
+
+    @property
+    def __doc__(self):
+        if self._doc is None and self._raw_doc:
+            self._doc = "\n".join(_textwrap.wrap(self._raw_doc))
+        return self._doc
+
+    @__doc__.setter
+    def __doc__(self, value):
+        # NOTE: Set by `property.__init__`, from the docstring of `fget`
+        if value is not None:
+            self._doc = value
+
+
+class _LazySignedMethod(object):
+    """
+    Descriptor of a CRUD method of a model, whose `forge` signature (built
+    from the fields of the model) is only computed on first access, after
+    which the descriptor replaces itself with the signed method.
+    """
+
+    def __init__(self, name, func, **signature_kwargs):
+        self._name = name
+        self._func = func
+        self._signature_kwargs = signature_kwargs
+
+    def __get__(self, obj, owner=None):
+        if owner is None:
+            owner = type(obj)
+
+        signed = _forge.sign(
+            *APIResourceMetaclass._build_signature(
+                obj=owner,
+                **self._signature_kwargs))(self._func)
+        setattr(owner, self._name, signed)
+
+        return signed.__get__(obj, owner) if obj is not None else signed
+
+# =============================================================================
+
 
 class APIResourceMetaclass(type):
     """
@@ -139,77 +198,115 @@ class APIResourceMetaclass(type):
             _data.__setitem__(name, value)
         #super(type(cls), cls)._data.__setitem__(name, value)
 
-    def __bound_setitem(cls, value, field_name=None, field_type=None):
-        # Keep track of changing items
-        old_value = getattr(cls, field_name, None)
-        if old_value != value:
-            changed_fields = getattr(cls, "_changed", list())
-            changed_fields.append(field_name)
-            setattr(cls, "_changed", changed_fields)
-
-        cls._data.__setitem__(field_name, value)
-
-        if cls._cache and field_name in cls._cache:
-            cls._cache[field_name] = value
-
-    def __pre_save_hook(cls):
-        if cls._cache is not None:
-            for (field_name, value) in cls._cache.items():
-                cls._data[field_name] = value._to_serializable_list()
-                value.save()
-
-    def __bound_getitem(cls, field_name=None, field_type=None):
-
-        # Initialize cache if need be
-        cls._cache = getattr(cls, "_cache", None)
-        if cls._cache is None:
-            cls._cache = dict()
-
-        data = cls._data.__getitem__(field_name)
+    @staticmethod
+    def _get_field_kind(field_type):
+        """
+        Classify a field according to its type: a list of related API
+        resources (`FIELD_KIND_RESOURCES`), a list of strings, such as user
+        e-mails (`FIELD_KIND_STRINGS`), or any other value (`FIELD_KIND_SCALAR`).
 
+        :return: The kind of the field and, for lists, the type of their items.
+        """
         if field_type is not None:
-
-            # Handle the case where the attribute of the model is a list
-            # of related instances.
-
             list_type = detect_list_type(field_type)
 
-            if list_type is not None:
-
+            if isinstance(list_type, type):
                 # OneToMany relations between objects
                 if issubclass(list_type, _api_resource.APIResource):
-                    cls._cache[field_name] = cls._cache.get(
-                        field_name,
-                        _linked_lists.LazyAPILinkedList(
-                            iterable=data,
-                            cls=list_type,
-                            parent_cls=type(cls),
-                            parent_id=cls.id,
-                            parent_attribute=field_name,
-                            query_attribute="name",
-                            query_uniqueness=True,
-                        ))
-                    return cls._cache[field_name]
+                    return (FIELD_KIND_RESOURCES, list_type)
 
                 # ManyToMany relations with user objects
                 elif issubclass(list_type, str):
-                    cls._cache[field_name] = cls._cache.get(
-                        field_name,
-                        _linked_lists.APILinkedList(
-                            iterable=data,
-                            cls=None,
-                            parent_cls=type(cls),
-                            parent_id=cls.id,
-                            parent_attribute=field_name,
-                            query_attribute=None,
-                            query_uniqueness=True,
-                        ))
-                    return cls._cache[field_name]
+                    return (FIELD_KIND_STRINGS, list_type)
+
+        return (FIELD_KIND_SCALAR, None)
+
+    @staticmethod
+    def _mk_getter(field_name, field_kind, list_type=None):
+        """
+        Build the getter of a field, specialized according to its kind (see
+        `_get_field_kind`), which is only resolved once per class.
+        """
+
+        if field_kind == FIELD_KIND_SCALAR:
+            def fget(self):
+                return self._data[field_name]
+            return fget
+
+        if field_kind == FIELD_KIND_RESOURCES:
+            def make_list(self, data):
+                return _linked_lists.LazyAPILinkedList(
+                    iterable=data,
+                    cls=list_type,
+                    parent_cls=type(self),
+                    parent_id=self.id,
+                    parent_attribute=field_name,
+                    query_attribute="name",
+                    query_uniqueness=True,
+                )
+        else:
+            def make_list(self, data):
+                return _linked_lists.APILinkedList(
+                    iterable=data,
+                    cls=None,
+                    parent_cls=type(self),
+                    parent_id=self.id,
+                    parent_attribute=field_name,
+                    query_attribute=None,
+                    query_uniqueness=True,
+                )
+
+        def fget(self):
+            data = self._data[field_name]
+
+            # The linked list is built once, and cached until the data of
+            # the object is replaced
+            cache = self._cache
+            if cache is None:
+                cache = dict()
+                self._cache = cache
+
+            lst = cache.get(field_name, None)
+            if lst is None:
+                lst = make_list(self, data)
+                cache[field_name] = lst
+            return lst
+
+        return fget
+
+    @staticmethod
+    def _mk_setter(field_name, field_kind):
+        """
+        Build the setter of a field, which keeps track of modified fields (see
+        `UpdatableAPIResource.save`).
+        """
+
+        def fset(self, value):
+            # The raw data is compared, so that no linked list is built
+            data = self._data
+            if field_name not in data or data[field_name] != value:
+                self._mark_dirty(field_name)
+
+            data[field_name] = value
+
+            cache = self._cache
+            if cache and field_name in cache:
+                if isinstance(value, _linked_lists.APILinkedList):
+                    cache[field_name] = value
+                else:
+                    # Rebuilt from the new data on next access
+                    del cache[field_name]
 
+        return fset
 
-        return cls._data.__getitem__(field_name)
+    def __pre_save_hook(cls):
+        if cls._cache is not None:
+            for (field_name, value) in cls._cache.items():
+                cls._data[field_name] = value._to_serializable_list()
+                value.save()
 
-    def __mk_property(cls, field_name=None, field_type=None, field_doc=None):
+    def __mk_property(cls, field_name=None, field_type=None, field_doc=None,
+                      field_kind=None, list_type=None):
 
         if field_type is None:
             field_tuple = getattr(cls, "_FIELDS", dict()).get(field_name, None)
@@ -224,17 +321,18 @@ class APIResourceMetaclass(type):
             if isinstance(field_tuple, tuple) and len(field_tuple) >= 2:
                 field_type = field_tuple[1]
 
-        return property(
-
-            fget=_functools.partial(APIResourceMetaclass.__bound_getitem,
-                                    field_name=field_name,
-                                    field_type=field_type),
-
-            fset=_functools.partial(APIResourceMetaclass.__bound_setitem,
-                                    field_name=field_name,
-                                    field_type=field_type),
-
-            doc="\n".join(_textwrap.wrap(field_doc))
+        if field_kind is None:
+            (field_kind, list_type) = APIResourceMetaclass._get_field_kind(field_type)
+
+        return _FieldProperty(
+            fget=APIResourceMetaclass._mk_getter(
+                field_name=field_name,
+                field_kind=field_kind,
+                list_type=list_type),
+            fset=APIResourceMetaclass._mk_setter(
+                field_name=field_name,
+                field_kind=field_kind),
+            doc=field_doc
         )
 
     @classmethod
@@ -324,43 +422,60 @@ class APIResourceMetaclass(type):
                     fget=APIResourceMetaclass.__getid,
                     doc="The API-provided ID of the instantiated resource."))
 
+        record_fields = []
+
         for field_name in fields:
             field_type = fields[field_name][0]
             field_doc = fields[field_name][1]
+            (field_kind, list_type) = APIResourceMetaclass._get_field_kind(field_type)
             setattr(cls,
                     field_name,
                     APIResourceMetaclass.__mk_property(
                         cls,
                         field_name=field_name,
                         field_type=field_type,
-                        field_doc=field_doc))
+                        field_doc=field_doc,
+                        field_kind=field_kind,
+                        list_type=list_type))
+
+            if field_kind == FIELD_KIND_RESOURCES:
+                record_fields.append(
+                    (field_name, _linked_lists.LazyAPILinkedList, list_type))
+            elif field_kind == FIELD_KIND_STRINGS:
+                record_fields.append(
+                    (field_name, _linked_lists.APILinkedList, None))
+            else:
+                record_fields.append((field_name, None, None))
+
+        # Compact representation for bulk loads (see `records.APIRecord`)
+        cls.Record = _records.build_record_class(cls, record_fields)
 
         if _forge:
             # Only works in Python 3.5+ which has
             # the python-forge package
 
+            # NOTE: The signatures are built on first access to the methods,
+            # to keep the creation of the models (and the import of the
+            # package) fast
+
             if _crud.CreatableAPIResource in bases:
-                cls.create = _forge.sign(
-                    *APIResourceMetaclass._build_signature(
-                        obj=cls,
-                        all_optional=False,
-                        with_id=False))(cls.create)
-                cls.saveInstanceAsNew = _forge.sign(
-                    *APIResourceMetaclass._build_signature(
-                        obj=cls,
-                        all_optional=True,
-                        with_id=False))(cls.duplicate)
+                cls.create = _LazySignedMethod(
+                    "create", cls.create,
+                    all_optional=False,
+                    with_id=False)
+                cls.saveInstanceAsNew = _LazySignedMethod(
+                    "saveInstanceAsNew", cls.duplicate,
+                    all_optional=True,
+                    with_id=False)
 
             if _crud.UpdatableAPIResource in bases:
-                cls.update = _forge.sign(
-                    *APIResourceMetaclass._build_signature(
-                        obj=cls,
-                        all_optional=True,
-                        with_id=True))(cls.update)
-                cls.saveInstance = _forge.sign(
-                    *APIResourceMetaclass._build_signature(
-                        obj=cls,
-                        all_optional=True,
-                        with_id=False))(cls.save)
+                cls.update = _LazySignedMethod(
+                    "update", cls.update,
+                    all_optional=True,
+                    with_id=True)
+                cls.saveInstance = _LazySignedMethod(
+                    "saveInstance", cls.save,
+                    all_optional=True,
+                    with_id=False)
 
 # =============================================================================
@@ -0,0 +1,207 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# IDENTITY MAP SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import contextlib as _contextlib
+import threading as _threading
+import typing as _typing
+
+# Local imports
+import codepost.api_requestor as _api_requestor
+import codepost.util.concurrency as _concurrency
+
+# =============================================================================
+
+# Global submodule protected attributes
+
+# Stacks of the active identity maps, per thread; the workers making requests
+# concurrently (see `util.concurrency.bounded_map`) use the map of the thread
+# which submitted their tasks
+_local = _threading.local()
+
+# =============================================================================
+
+def _get_key(cls, id, api_key=None):
+    # type: (type, int, str) -> tuple
+    # NOTE: Resources fetched with different API keys are kept apart, as the
+    # API keys may not have access to the same resources
+    if api_key is None:
+        api_key = _api_requestor.STATIC_REQUESTOR.api_key
+    return (api_key, getattr(cls, "_OBJECT_NAME", None) or cls, id)
+
+def _merge_data(canonical, data):
+    # type: (_typing.Any, dict) -> None
+    dirty = canonical._dirty
+    if not dirty:
+        canonical._data = data
+        return
+
+    # NOTE: Replacing the data resets the modified fields
+    local_data = canonical._data
+    merged_data = dict(data)
+    for field_name in dirty:
+        if field_name in local_data:
+            merged_data[field_name] = local_data[field_name]
+
+    canonical._data = merged_data
+    canonical._dirty = set(dirty)
+
+class IdentityMap(object):
+    """
+    Map of the canonical instance of each API resource, by API key and
+    `(_OBJECT_NAME, id)`, so that each resource is fetched and held only once.
+    By default, resources are looked up with the API key of the standard
+    static requestor.
+    """
+
+    def __init__(self):
+        self._objects = dict()
+        self._lazy_objects = dict()
+        self._lock = _threading.RLock()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, obj):
+        return any(canonical is obj for canonical in self._objects.values())
+
+    def get(self, cls, id, api_key=None):
+        # type: (type, int, str) -> _typing.Any
+        """
+        Return the canonical instance of the resource `id` of type `cls`, or
+        `None` if it has not been loaded in this session.
+        """
+        return self._objects.get(_get_key(cls, id, api_key=api_key), None)
+
+    def merge(self, obj, api_key=None):
+        # type: (_typing.Any, str) -> _typing.Any
+        """
+        Register `obj` (a freshly fetched or updated resource) and return the
+        canonical instance of the resource, whose data is replaced by the data
+        of `obj` if it already existed.
+
+        Unsaved modifications of the canonical instance are kept: the fields
+        it has modified retain their local values (and remain to be saved).
+        """
+        if obj is None:
+            return None
+
+        key = _get_key(type(obj), obj._get_id(), api_key=api_key)
+
+        with self._lock:
+            canonical = self._objects.get(key, None)
+            if canonical is None:
+                self._objects[key] = obj
+                canonical = obj
+            elif canonical is not obj:
+                _merge_data(canonical, obj._data)
+
+            # Lazy references to the resource now point to its canonical instance
+            lazy_obj = self._lazy_objects.get(key, None)
+            if lazy_obj is not None and lazy_obj._inner is None:
+                lazy_obj._inner = canonical
+
+        return canonical
+
+    def get_lazy(self, cls, id, factory, api_key=None):
+        # type: (type, int, _typing.Callable, str) -> _typing.Any
+        """
+        Return the canonical lazy reference to the resource `id` of type `cls`,
+        creating it with `factory()` if needed.
+        """
+        key = _get_key(cls, id, api_key=api_key)
+
+        with self._lock:
+            lazy_obj = self._lazy_objects.get(key, None)
+            if lazy_obj is None:
+                lazy_obj = factory()
+                canonical = self._objects.get(key, None)
+                if canonical is not None:
+                    lazy_obj._inner = canonical
+                self._lazy_objects[key] = lazy_obj
+
+        return lazy_obj
+
+    def remove(self, cls, id, api_key=None):
+        # type: (type, int, str) -> None
+        """
+        Forget the resource `id` of type `cls` (for instance, once deleted).
+        """
+        key = _get_key(cls, id, api_key=api_key)
+
+        with self._lock:
+            self._objects.pop(key, None)
+            lazy_obj = self._lazy_objects.pop(key, None)
+            if lazy_obj is not None:
+                lazy_obj._null = True
+
+    def clear(self):
+        # type: () -> None
+        with self._lock:
+            self._objects.clear()
+            self._lazy_objects.clear()
+
+# =============================================================================
+
+def _get_sessions():
+    # type: () -> list
+    sessions = getattr(_local, "sessions", None)
+    if sessions is None:
+        sessions = list()
+        _local.sessions = sessions
+    return sessions
+
+def get_session():
+    # type: () -> _typing.Optional[IdentityMap]
+    """
+    Return the identity map of the innermost active session of the current
+    thread, if any.
+    """
+    sessions = getattr(_local, "sessions", None)
+    return sessions[-1] if sessions else None
+
+@_contextlib.contextmanager
+def _use_session(identity_map):
+    # Activate a session within a worker thread (see `session`)
+    if identity_map is None:
+        yield None
+        return
+
+    sessions = _get_sessions()
+    sessions.append(identity_map)
+    try:
+        yield identity_map
+    finally:
+        sessions.pop()
+
+@_contextlib.contextmanager
+def session(identity_map=None):
+    """
+    Context manager delimiting a session, within which `retrieve` and the
+    lazy references of linked lists return a single canonical instance per
+    API resource (which `update`, `save` and `delete` keep up to date, while
+    preserving its unsaved modifications).
+    Sessions are specific to the thread which opens them (and to the tasks
+    it runs concurrently, see `util.concurrency.bounded_map`).
+
+        with codepost.session():
+            a = codepost.file.retrieve(id=1)
+            b = codepost.file.retrieve(id=1)  # no request is made
+            assert a is b
+    """
+    if identity_map is None:
+        identity_map = IdentityMap()
+
+    with _use_session(identity_map):
+        yield identity_map
+
+# The workers making requests concurrently use the session of the thread
+# which submitted their tasks
+_concurrency.register_context(capture=get_session, restore=_use_session)
+
+# =============================================================================
@@ -36,6 +36,7 @@ import requests as _requests
 # Local imports
 import codepost.errors as _errors
 from . import api_resource as _api_resource
+from . import identity_map as _identity_map
 
 # =============================================================================
 
@@ -43,113 +44,175 @@ _LAZY_REPR = "<Lazy[{cls.__name__}] loaded={_loaded}: {_inner}>"
 
 _LAZY_LOAD_ON_REPR = True
 
+# Global submodule protected attributes
+_lazy_classes = dict()
+_lazy_classes_lock = _threading.Lock()
+
 # =============================================================================
 
-def create_lazy_resource(cls, id):
-    # type: (_api_resource.AbstractAPIResource, int) -> _api_resource.APIResource
+class LazyAPIResource(_api_resource.APIResource):
     """
-    Create a lazy API resource instance of a given type, with a provisional
-    identifier `id`. An API call to fetch the object is only made if fields
-    from the object are accessed.
-
-    :param cls: The `APIResource` child class
-    :param id: The identifier of the resource
-    :return: A wrapper object that can be used like the `APIResource` would
+    Lazy wrapper of an API resource, which is only fetched when one of its
+    fields is accessed. A subclass is created once per model class (see
+    `get_lazy_class`), and the identifier and state of the wrapped resource
+    are stored per instance.
     """
 
-    class LazyAPIResource(_api_resource.APIResource):
-
-        # Actual internal object which is
-        _inner = None
-        _null = False
-
-        def _refresh(self):
-            """
-            Retrieve actual underlying object and cache.
-
-            :return: `True` if the object could be retrieved
-            """
-            try:
-                self._inner = cls().retrieve(id=id)
-            except _errors.NotFoundAPIError:
-                self._null = True
-            except _errors.AuthorizationAPIError:
-                # NOTE: Should this really silently fail? Maybe should
-                # at least log the event
-                self._null = True
-
-            return not self._null and self._inner is not None
-
-        def __getattribute__(self, attr):
-
-            # All protected and private attributes should be handled directly
-            # by the base class (using __getattribute__ because object does
-            # not have a __getattr__).
-
-            if attr is not None and len(attr) > 0 and attr[0:1] == "_":
-                return super(LazyAPIResource, self).__getattribute__(attr)
-
-            if self._null:
-                return None
+    # Model class of the wrapped resources (set by each subclass)
+    _lazy_cls = None
+
+    # Identifier of the wrapped resource
+    _lazy_id = None
+
+    # Actual internal object, once fetched
+    _inner = None
+    _null = False
+
+    # Callable fetching this resource along with others (e.g., the members of
+    # a chunk of a linked list being iterated), on first access of a field
+    _batch = None
+
+    def __init__(self, id):
+        # NOTE: `APIResource.__init__` is not called, as all its attributes
+        # would be discarded by `__setattr__` anyway
+        object.__setattr__(self, "_lazy_id", id)
+
+    def _refresh(self):
+        """
+        Retrieve actual underlying object and cache.
+
+        :return: `True` if the object could be retrieved
+        """
+        try:
+            self._inner = self._lazy_cls().retrieve(id=self._lazy_id)
+        except _errors.NotFoundAPIError:
+            self._null = True
+        except _errors.AuthorizationAPIError:
+            # NOTE: Should this really silently fail? Maybe should
+            # at least log the event
+            self._null = True
+
+        return not self._null and self._inner is not None
+
+    def __getattribute__(self, attr):
+
+        # All protected and private attributes should be handled directly
+        # by the base class (using __getattribute__ because object does
+        # not have a __getattr__).
+
+        if attr is not None and len(attr) > 0 and attr[0:1] == "_":
+            return super(LazyAPIResource, self).__getattribute__(attr)
+
+        if self._null:
+            return None
+
+        # ===================================================================
+
+        # OBJECT HAS BEEN FETCHED:
+        #   If we've already fetched the object, redirect to attributes
+        #   of the `_inner` internal object.
+
+        if self._inner is not None:
+            return getattr(self._inner, attr, None)
+
+        # ===================================================================
+
+        # OBJECT IS LAZY
+        #   Handle any attribute used to extract the identifier manually
+        #   and prepare to fetch the object if any other attribute is
+        #   accessed.
+
+        if attr == "_data":
+            id_field_name = getattr(self, "_FIELD_ID", "id")
+            return {
+                id_field_name: self._lazy_id
+            }
+        elif attr == "id":
+            return self._lazy_id
+        else:
+            # Fetch object (along with its batch, if any) and cache
+            batch = self._batch
+            if batch is not None:
+                batch()
+            if self._inner is None and not self._null:
+                self._refresh()
 
-            # ===============================================================
+            # NOTE: Recall this method so the "fetched" case only has to
+            # be handled in one code branch.
+            return self.__getattribute__(attr)
 
-            # OBJECT HAS BEEN FETCHED:
-            #   If we've already fetched the object, redirect to attributes
-            #   of the `_inner` internal object.
+    def __setattr__(self, attr, value):
 
-            if self._inner is not None:
-                return getattr(self._inner, attr, None)
+        # Since this object is only a lazy wrapper, all __setattr_ calls
+        # are rerouted to the internal object, except modifications to
+        # `_inner`.
 
-            # ===============================================================
+        if attr == "_inner" or attr == "_null" or attr == "_batch":
+            return super(LazyAPIResource, self).__setattr__(attr, value)
 
-            # OBJECT IS LAZY
-            #   Handle any attribute used to extract the identifier manually
-            #   and prepare to fetch the object if any other attribute is
-            #   accessed.
+        # If internal object has been fetched, reroute calls to it.
 
-            if attr == "_data":
-                id_field_name = getattr(self, "_FIELD_ID", "id")
-                return {
-                    id_field_name: id
-                }
-            elif attr == "id":
-                return id
-            else:
-                # Fetch object and cache
-                self._refresh()
+        if self._inner is not None:
+            return self._inner.__setattr__(attr, value)
 
-                # NOTE: Recall this method so the "fetched" case only has to
-                # be handled in one code branch.
-                return self.__getattribute__(attr)
+    def __repr__(self):
 
-        def __setattr__(self, attr, value):
+        _loaded = (self._inner is not None)
 
-            # Since this object is only a lazy wrapper, all __setattr_ calls
-            # are rerouted to the internal object, except modifications to
-            # `_inner`.
+        if _LAZY_LOAD_ON_REPR and not _loaded:
+            _loaded = self._refresh()
 
-            if attr == "_inner" or attr == "_null":
-                return super(LazyAPIResource, self).__setattr__(attr, value)
+        return _LAZY_REPR.format(
+            cls=self._lazy_cls,
+            _loaded=_loaded,
+            _inner=self._inner,
+        )
 
-            # If internal object has been fetched, reroute calls to it.
-
-            if self._inner is not None:
-                return self._inner.__setattr__(attr, value)
+# =============================================================================
 
-        def __repr__(self):
+def get_lazy_class(cls):
+    # type: (type) -> type
+    """
+    Return the lazy wrapper class of the API resources of type `cls`, which
+    is only created once.
+    """
+    lazy_cls = _lazy_classes.get(cls, None)
+    if lazy_cls is not None:
+        return lazy_cls
+
+    with _lazy_classes_lock:
+        lazy_cls = _lazy_classes.get(cls, None)
+        if lazy_cls is None:
+            lazy_cls = type(
+                "Lazy{}".format(getattr(cls, "__name__", "APIResource")),
+                (LazyAPIResource,),
+                {
+                    "__module__": __name__,
+                    "_lazy_cls": cls,
+                })
+            _lazy_classes[cls] = lazy_cls
+
+    return lazy_cls
 
-            _loaded = (self._inner is not None)
+def create_lazy_resource(cls, id):
+    # type: (_api_resource.AbstractAPIResource, int) -> _api_resource.APIResource
+    """
+    Create a lazy API resource instance of a given type, with a provisional
+    identifier `id`. An API call to fetch the object is only made if fields
+    from the object are accessed.
 
-            if _LAZY_LOAD_ON_REPR and not _loaded:
-                _loaded = self._refresh()
+    :param cls: The `APIResource` child class
+    :param id: The identifier of the resource
+    :return: A wrapper object that can be used like the `APIResource` would
+    """
+    lazy_cls = get_lazy_class(cls)
 
-            return _LAZY_REPR.format(
-                cls=cls,
-                _loaded=_loaded,
-                _inner=self._inner,
-            )
+    # Within a session, all references to a resource share a single wrapper
+    identity_map = _identity_map.get_session()
+    if identity_map is not None:
+        return identity_map.get_lazy(
+            cls=cls, id=id, factory=lambda: lazy_cls(id))
 
-    return LazyAPIResource()
+    return lazy_cls(id)
 
 # =============================================================================
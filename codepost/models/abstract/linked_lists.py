@@ -6,14 +6,98 @@
 
 from __future__ import print_function # Python 2
 
+# Python stdlib imports
+import functools as _functools
+import typing as _typing
+
 # Local imports
+import codepost.errors as _errors
+import codepost.util.concurrency as _concurrency
+import codepost.util.custom_logging as _logging
+
 from . import lazy as _lazy
 
 # =============================================================================
 
+# Global submodule constants
+_LOG_SCOPE = "{}".format(__name__)
+
+DEFAULT_PREFETCH_CHUNK_SIZE = 50
+DEFAULT_PREFETCH_MAX_WORKERS = 8
+DEFAULT_DELETE_MAX_WORKERS = 8
+
+# Global submodule protected attributes
+_logger = _logging.get_logger(name=_LOG_SCOPE)
+
+# =============================================================================
+
+class _ListIndex(object):
+    """
+    Hash index of the members of a linked list by the value of one of their
+    attributes (or by the members themselves, if `attribute` is `None`).
+
+    Members are added to the index lazily: they are only read (and, for lazy
+    API resources, fetched, in one batch) on the next lookup.
+    """
+
+    def __init__(self, attribute):
+        self.attribute = attribute
+        self._members = dict()   # value -> list of members
+        self._values = dict()    # id(member) -> [value, number of references]
+        self._pending = list()   # members yet to be indexed
+
+    def _get_value(self, obj):
+        if self.attribute is None:
+            return obj
+        return getattr(obj, self.attribute, None)
+
+    def add(self, objs):
+        self._pending.extend(objs)
+
+    def remove(self, objs):
+        for obj in objs:
+            entry = self._values.get(id(obj), None)
+            if entry is None:
+                self._pending = [
+                    member for member in self._pending if member is not obj]
+                continue
+
+            (value, _) = entry
+            members = self._members[value]
+            for (i, member) in enumerate(members):
+                if member is obj:
+                    del members[i]
+                    break
+            if not members:
+                del self._members[value]
+
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._values[id(obj)]
+
+    def lookup(self, value, fetch=None):
+        # type: (_typing.Any, _typing.Callable) -> list
+        if self._pending:
+            (pending, self._pending) = (self._pending, list())
+            if fetch is not None:
+                fetch(pending)
+
+            for obj in pending:
+                obj_value = self._get_value(obj)
+                self._members.setdefault(obj_value, list()).append(obj)
+                entry = self._values.setdefault(id(obj), [obj_value, 0])
+                entry[1] += 1
+
+        return self._members.get(value, ())
+
+# =============================================================================
+
 class APILinkedList(list):
     """
-    Base class
+    List of the members of a relation (or of the users of a roster) of a
+    parent API resource. Modifications made in place (`append`, `extend`,
+    `insert`, `remove`, `del`, ...) are recorded, by key (ID or e-mail), in a
+    change log, which `save` uses to only make the requests that are needed.
     """
 
     _cls = None
@@ -21,9 +105,21 @@ class APILinkedList(list):
     _parent_id = None
     _parent_attribute = None
     _query_attribute = None
-    _deleted = None
     _query_uniqueness = True
 
+    # Change log since the list was loaded or saved: counts of the keys added
+    # and removed (an addition and a removal of the same key cancel out), and
+    # IDs of the removed members, to be deleted by `save`
+    _added = None
+    _removed = None
+    _deleted = None
+
+    # Hash indexes of the members, by attribute (see `by`)
+    _indexes = None
+
+    # Maximum number of concurrent deletions made by `save`
+    delete_max_workers = DEFAULT_DELETE_MAX_WORKERS
+
     def _misc_to_internal_iterable(self, iterable):
         return iterable
 
@@ -53,11 +149,11 @@ class APILinkedList(list):
 
         self._query_attribute = query_attribute
         self._query_uniqueness = query_uniqueness
-        self._added = list()
-        self._deleted = list()
+        self._reset_changes()
+        self._indexes = None
 
     def _clone_with_new_list(self, new_list):
-        cloned_obj = APILinkedList(
+        cloned_obj = type(self)(
             iterable=new_list,
             cls=self._cls,
             parent_cls=self._parent_cls,
@@ -67,11 +163,80 @@ class APILinkedList(list):
             query_uniqueness=self._query_uniqueness
         )
 
-        cloned_obj._added = self._added
-        cloned_obj._deleted = self._deleted
+        # The clone has its own (copy of the) change log
+        cloned_obj._added = dict(self._added)
+        cloned_obj._removed = dict(self._removed)
+        cloned_obj._deleted = dict(self._deleted)
 
         return cloned_obj
 
+    # -------------------------------------------------------------------------
+    # Change log
+
+    def _reset_changes(self):
+        self._added = dict()
+        self._removed = dict()
+        self._deleted = dict()
+
+    def _get_key(self, obj):
+        return obj.id if self._cls is not None else obj
+
+    def _log_added(self, objs):
+        if self._indexes:
+            for index in self._indexes.values():
+                index.add(objs)
+
+        (added, removed, deleted) = (self._added, self._removed, self._deleted)
+
+        for obj in objs:
+            key = self._get_key(obj)
+            if removed.get(key, 0) > 0:
+                # Adding back a removed member cancels its removal
+                removed[key] -= 1
+                deleted.pop(key, None)
+            else:
+                added[key] = added.get(key, 0) + 1
+
+    def _log_removed(self, objs):
+        if self._indexes:
+            for index in self._indexes.values():
+                index.remove(objs)
+
+        (added, removed, deleted) = (self._added, self._removed, self._deleted)
+
+        for obj in objs:
+            key = self._get_key(obj)
+            if added.get(key, 0) > 0:
+                # Removing a member added since the last save cancels its
+                # addition (and the member is not deleted)
+                added[key] -= 1
+            else:
+                removed[key] = removed.get(key, 0) + 1
+                if self._cls is not None:
+                    deleted[key] = None
+
+    @property
+    def has_changes(self):
+        # type: () -> bool
+        """
+        Whether members were added to or removed from the list since it was
+        loaded or last saved.
+        """
+        return (
+            any(count > 0 for count in self._added.values()) or
+            any(count > 0 for count in self._removed.values())
+        )
+
+    def _needs_parent_update(self):
+        # type: () -> bool
+        # Removed members which are deleted disappear from the relation on
+        # their own, any other change must be sent to the parent
+        return (
+            any(count > 0 for count in self._added.values()) or
+            any(count > 0 and key not in self._deleted
+                for (key, count) in self._removed.items())
+        )
+
     def _to_serializable_list(self, lst=None):
         if lst is None:
             lst = self
@@ -81,81 +246,209 @@ class APILinkedList(list):
     def _cleanup_list(self):
         return self
 
+    # -------------------------------------------------------------------------
+    # Indexed lookups
+
+    def _fetch_for_index(self, objs):
+        # Members are read as they are, see `LazyAPILinkedList`
+        return
+
+    def _get_index(self, attribute):
+        # type: (str) -> _ListIndex
+        indexes = self._indexes
+        if indexes is None:
+            indexes = dict()
+            self._indexes = indexes
+
+        index = indexes.get(attribute, None)
+        if index is None:
+            index = _ListIndex(attribute=attribute)
+            index.add(list(list.__iter__(self)))
+            indexes[attribute] = index
+        return index
+
+    def by(self, attribute, value, unique=None):
+        """
+        Return the first member whose `attribute` is equal to `value` (or
+        `None`), or, if `unique` is `False`, the list of all such members;
+        by default, `unique` is the `query_uniqueness` of the list.
+
+        Lookups use a hash index of the members by `attribute`, built on the
+        first lookup (and kept up to date as members are added and removed),
+        so they take constant time; the index does not reflect the changes
+        made to the attribute of its members after they were indexed.
+        """
+        if unique is None:
+            unique = self._query_uniqueness
+
+        members = self._get_index(attribute).lookup(
+            value, fetch=self._fetch_for_index)
+
+        if unique:
+            # FIXME: we could raise an exception here if len(members) > 1
+            return members[0] if members else None
+        else:
+            return list(members)
+
     def by_name(self, name):
         if name is None:
             return None if self._query_uniqueness else []
 
-        filter_result = [
-            item
-            for item in self
-            if getattr(item, self._query_attribute, None) == name
-        ]
-
-        if self._query_uniqueness:
-            # FIXME: we could raise an exception here if len(filter_result) > 1
+        return self.by(self._query_attribute, name)
 
-            # Return first value, or None if the list is empty
-            return next(iter(filter_result), None)
-        else:
-            return filter_result
+    # -------------------------------------------------------------------------
+    # In-place modifications
 
     def append(self, value):
         # type: (Any) -> APILinkedList
-        return self.__add__([value])
+        """
+        Append `value` to the list (in place), and return the list.
+        """
+        return self.extend((value,))
+
+    def extend(self, iterable):
+        # type: (Iterable) -> APILinkedList
+        """
+        Append the values of `iterable` to the list (in place), and return the
+        list.
+        """
+        new_list = list(self._misc_to_internal_iterable(iterable))
+        super(APILinkedList, self).extend(new_list)
+        self._log_added(new_list)
+        return self
 
-    def __add__(self, value, *args):
-        # type: (List, tuple) -> APILinkedList
-        self._added = getattr(self, "_deleted", list())
+    def __iadd__(self, iterable):
+        return self.extend(iterable)
+
+    def insert(self, index, value):
+        # type: (int, Any) -> None
+        new_list = list(self._misc_to_internal_iterable((value,)))
+        super(APILinkedList, self).insert(index, new_list[0])
+        self._log_added(new_list)
+
+    def remove(self, value):
+        # type: (Any) -> None
+        """
+        Remove the first member equal to `value`, or with the key `value` (ID
+        or e-mail) from the list.
+        """
+        key = value
+        if self._cls is not None and hasattr(value, "id"):
+            key = self._get_key(value)
+
+        for (i, obj) in enumerate(list.__iter__(self)):
+            if self._get_key(obj) == key:
+                del self[i]
+                return
+        raise ValueError("{!r} is not in list".format(value))
+
+    def pop(self, index=-1):
+        obj = list.__getitem__(self, index)
+        del self[index]
+        return obj
+
+    def clear(self):
+        self._log_removed(list.__iter__(self))
+        super(APILinkedList, self).__delitem__(slice(None))
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            old_list = list.__getitem__(self, key)
+            new_list = list(self._misc_to_internal_iterable(value))
+            super(APILinkedList, self).__setitem__(key, new_list)
+        else:
+            old_list = [list.__getitem__(self, key)]
+            new_list = list(self._misc_to_internal_iterable((value,)))
+            super(APILinkedList, self).__setitem__(key, new_list[0])
 
-        new_list = self._misc_to_internal_iterable(
-            iterable=value
-        )
-
-        try:
-            obj = self._clone_with_new_list(
-                super(APILinkedList, self).__add__(new_list)
-            )
-            self._added += self._to_serializable_list(lst=new_list)
-            obj._added += self._to_serializable_list(lst=new_list)
-            return obj
-        except:
-            raise
+        self._log_removed(old_list)
+        self._log_added(new_list)
 
     def __delitem__(self, key):
-        self._deleted = getattr(self, "_deleted", list())
-
-        try:
-            _id = None
-            if self._cls is not None:
-                _id = self[key].id
-
-            super(APILinkedList, self).__delitem__(key)
+        old_list = list.__getitem__(self, key)
+        if not isinstance(key, slice):
+            old_list = [old_list]
 
-            if self._cls is not None:
-                self._deleted.append(_id)
-        except:
-            raise
+        super(APILinkedList, self).__delitem__(key)
+        self._log_removed(old_list)
 
-    def save(self):
+    def __add__(self, value, *args):
+        # type: (List, tuple) -> APILinkedList
+        # NOTE: Unlike the in-place methods, returns a new list (with its own
+        # change log), and leaves this list unchanged
+        obj = self._clone_with_new_list(list.__iter__(self))
+        return obj.extend(value)
+
+    # -------------------------------------------------------------------------
+
+    def _delete_removed(self, max_workers=None):
+        # type: (int) -> dict
+        """
+        Delete the removed members concurrently, with up to `max_workers`
+        concurrent requests, and return the exceptions raised by the failed
+        deletions, by ID. Members which no longer exist count as deleted.
+        """
+        if max_workers is None:
+            max_workers = self.delete_max_workers
+
+        obj_ids = list(self._deleted)
+        static_helper = self._cls()
+
+        def delete(obj_id):
+            try:
+                static_helper.delete(id=obj_id)
+            except _errors.NotFoundAPIError:
+                pass
+            except Exception as e:
+                return (obj_id, e)
+            return (obj_id, None)
+
+        failures = dict()
+        for (obj_id, error) in _concurrency.bounded_map(
+                delete, obj_ids,
+                max_workers=min(max_workers, len(obj_ids)),
+                ordered=False):
+            if error is not None:
+                failures[obj_id] = error
+
+        return failures
+
+    def save(self, max_workers=None):
+        """
+        Save the changes made to the list: delete the removed members (for
+        relations), with up to `max_workers` (by default, `delete_max_workers`)
+        concurrent requests, and, if other members were added or removed,
+        update the relation in the parent (once). No request is made if the
+        list is unchanged.
+
+        :raises BatchOperationError: If some deletions failed (once all the
+            other changes have been saved). The failed deletions remain in
+            the change log, and are attempted again by the next `save`; if
+            the update of the parent fails, so do all the changes but the
+            successful deletions.
+        """
 
         # Make the deletion by calling `delete` in the child class
-        if self._cls is not None:
-
-            static_helper = self._cls()
-            for obj_id in set(self._deleted):
-                try:
-                    static_helper.delete(id=obj_id)
-                except:
-                    continue
-            self._deleted = list()
+        failures = dict()
+        deleted_count = len(self._deleted)
+        if self._cls is not None and deleted_count > 0:
+            failures = self._delete_removed(max_workers=max_workers)
+
+            # Only the successful deletions are dropped from the change log
+            # at this point, the other changes are kept until the parent has
+            # been updated
+            for obj_id in list(self._deleted):
+                if obj_id not in failures:
+                    del self._deleted[obj_id]
+                    self._removed.pop(obj_id, None)
 
         # Synchronize the field in the parent
-        if not (
+        if self._needs_parent_update() and not (
                 self._parent_cls is None or
                 self._parent_id is None or
                 self._parent_attribute is None
         ):
-            # Convert the list into a serializable list
+            # NOTE: The API only accepts the complete value of the field
             objs_serializable_list = self._to_serializable_list()
 
             # Payload
@@ -176,29 +469,46 @@ class APILinkedList(list):
             iterable = self._misc_to_internal_iterable(new_parent_list)
 
             # Pass it to parent constructor
-            return super(APILinkedList, self).__init__(iterable)
+            self._indexes = None
+            super(APILinkedList, self).__init__(iterable)
+
+        # The parent is up to date: only the failed deletions remain to be
+        # saved
+        self._reset_changes()
+        for obj_id in failures:
+            self._removed[obj_id] = 1
+            self._deleted[obj_id] = None
+
+        if failures:
+            raise _errors.BatchOperationError(
+                operation="delete",
+                failures=failures,
+                count=deleted_count)
 
 
 # =============================================================================
 
 class LazyAPILinkedList(APILinkedList):
+    """
+    Linked list of lazy API resources. When the list is iterated, its members
+    are fetched concurrently, `prefetch_chunk_size` at a time (using up to
+    `prefetch_max_workers` concurrent requests), as soon as a field of one of
+    the members of a chunk is read (reading their `id` fetches nothing);
+    `prefetch()` fetches all of them at once.
+    """
+
+    # Set `prefetch_on_iter` to `False` to fetch members only when accessed
+    prefetch_on_iter = True
+    prefetch_chunk_size = DEFAULT_PREFETCH_CHUNK_SIZE
+    prefetch_max_workers = DEFAULT_PREFETCH_MAX_WORKERS
 
     @staticmethod
     def _is_lazy(obj):
-        try:
-            is_lazy = "_inner" in obj.__class__.__dict__
-            return is_lazy
-        except:
-            return False
+        return isinstance(obj, _lazy.LazyAPIResource)
 
     @staticmethod
     def _is_lazy_null(obj):
-        try:
-            is_lazy = "_inner" in obj.__class__.__dict__
-            is_null = getattr(obj, "_null", False)
-            return is_lazy and is_null
-        except:
-            return False
+        return isinstance(obj, _lazy.LazyAPIResource) and obj._null
 
     def _misc_to_internal_iterable(self, iterable):
         return map(lambda obj: obj
@@ -209,36 +519,127 @@ class LazyAPILinkedList(APILinkedList):
         if lst is None:
             lst = self
 
+        # NOTE: Iterate without triggering a prefetch, only IDs are needed
         id_list = list(map(
             lambda obj: obj.id,
-            lst
+            list.__iter__(lst) if isinstance(lst, list) else lst
         ))
 
         return id_list
 
-    def _cleanup_list(self):
+    @staticmethod
+    def _is_lazy_unloaded(obj):
+        return (
+            LazyAPILinkedList._is_lazy(obj) and
+            obj._inner is None and
+            not obj._null
+        )
 
-        i = 0
+    @staticmethod
+    def _refresh_quietly(obj):
+        # Errors are not raised here, but when the object is accessed (which
+        # will attempt to fetch it again)
+        try:
+            return obj._refresh()
+        except Exception as e:
+            _logger.debug("Could not prefetch {!r}: {!r}".format(
+                getattr(obj, "_lazy_id", None), e))
+            return False
+
+    def _prefetch_objects(self, objs, max_workers=None):
+        # type: (list, int) -> int
+        if max_workers is None:
+            max_workers = self.prefetch_max_workers
+
+        # Each object only needs to be fetched once
+        pending = list({
+            id(obj): obj
+            for obj in objs
+            if LazyAPILinkedList._is_lazy_unloaded(obj)
+        }.values())
+
+        return sum(
+            1 for success in _concurrency.bounded_map(
+                LazyAPILinkedList._refresh_quietly,
+                pending,
+                max_workers=min(max_workers, len(pending)))
+            if success)
+
+    def _fetch_for_index(self, objs):
+        # The members are fetched in one batch, before their attribute is read
+        self._prefetch_objects(objs)
+
+    def prefetch(self, max_workers=None):
+        # type: (int) -> LazyAPILinkedList
+        """
+        Fetch all the members of the list which have not yet been fetched,
+        with up to `max_workers` (by default, `prefetch_max_workers`)
+        concurrent requests.
+        """
+        self._prefetch_objects(
+            list.__iter__(self), max_workers=max_workers)
+        return self
+
+    def __iter__(self):
+        chunk_size = self.prefetch_chunk_size
 
+        if not self.prefetch_on_iter or not chunk_size or chunk_size <= 0:
+            return list.__iter__(self)
+
+        return self._iter_prefetched(chunk_size=chunk_size)
+
+    def _iter_prefetched(self, chunk_size):
+        i = 0
         while i < len(self):
-            obj = self[i]
+            chunk = list.__getitem__(self, slice(i, i + chunk_size))
+
+            # NOTE: The chunk is only fetched when a member is actually used,
+            # so that iterating over IDs (or types) makes no request
+            pending = [
+                obj for obj in chunk
+                if LazyAPILinkedList._is_lazy_unloaded(obj)
+            ]
+            if pending:
+                batch = _functools.partial(self._prefetch_batch, pending)
+                for obj in pending:
+                    obj._batch = batch
+
+            for obj in chunk:
+                yield obj
+            i += chunk_size
+
+    def _prefetch_batch(self, objs):
+        # type: (list) -> None
+        for obj in objs:
+            obj._batch = None
+        self._prefetch_objects(objs)
 
-            if LazyAPILinkedList._is_lazy_null(obj):
-                super(LazyAPILinkedList, self).__delitem__(i)
-                continue
+    def _cleanup_list(self):
+        # NOTE: Members are replaced without going through the change log
+        self._indexes = None
 
-            if not LazyAPILinkedList._is_lazy(obj):
+        lazy_type = _lazy.LazyAPIResource
+        cleaned = []
+
+        # Compact the list in a single pass, dropping dead references and
+        # replacing raw identifiers with lazy resources
+        for obj in list.__iter__(self):
+            if isinstance(obj, lazy_type):
+                if obj._null:
+                    continue
+            else:
                 try:
-                    new_obj = _lazy.create_lazy_resource(
+                    obj = _lazy.create_lazy_resource(
                         cls=self._cls,
                         id=obj
                     )
-                    self[i] = new_obj
                 except:
-                    super(LazyAPILinkedList, self).__delitem__(i)
                     continue
 
-            i += 1
+            cleaned.append(obj)
+
+        list.__setitem__(self, slice(None), cleaned)
+        return self
 
 # =============================================================================
 
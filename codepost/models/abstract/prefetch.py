@@ -0,0 +1,160 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# RELATION GRAPH PREFETCH SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import typing as _typing
+
+# Local imports
+import codepost.util.concurrency as _concurrency
+import codepost.util.custom_logging as _logging
+
+from . import api_resource as _api_resource
+from . import linked_lists as _linked_lists
+
+# =============================================================================
+
+# Global submodule constants
+_LOG_SCOPE = "{}".format(__name__)
+
+PATH_SEPARATOR = "."
+
+# Global submodule protected attributes
+_logger = _logging.get_logger(name=_LOG_SCOPE)
+
+# =============================================================================
+
+def _get_relation_type(cls, field_name):
+    # type: (type, str) -> _typing.Optional[type]
+    """
+    Return the type of the API resources of the relation `field_name` of the
+    model `cls`, or `None` if there is no such relation.
+    """
+    # NOTE: Imported here, as the metaclass module (indirectly) imports this
+    # module
+    import codepost.models.abstract.api_resource_metaclass as _arm
+
+    fields = getattr(cls, "_FIELDS", None)
+    if not isinstance(fields, dict) or field_name not in fields:
+        return None
+
+    field_tuple = fields[field_name]
+    field_type = field_tuple[0] if isinstance(field_tuple, tuple) else field_tuple
+
+    list_type = _arm.detect_list_type(field_type)
+    if (isinstance(list_type, type) and
+            issubclass(list_type, _api_resource.APIResource)):
+        return list_type
+
+def parse_paths(cls, paths):
+    # type: (type, _typing.Iterable[str]) -> dict
+    """
+    Parse dotted relation paths (e.g., `"files.comments"`) starting from the
+    model `cls` into a tree of relations, and check that they are valid.
+
+    :raises ValueError: If a path does not designate a chain of relations.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    tree = dict()
+
+    for path in paths:
+        (node, node_cls) = (tree, cls)
+        for field_name in path.split(PATH_SEPARATOR):
+            rel_cls = _get_relation_type(node_cls, field_name)
+            if rel_cls is None:
+                raise ValueError(
+                    "Cannot prefetch {!r}: {!r} is not a relation of {}.".format(
+                        path, field_name, getattr(node_cls, "__name__", node_cls)))
+            (node, node_cls) = (node.setdefault(field_name, dict()), rel_cls)
+
+    return tree
+
+# =============================================================================
+
+def _fetch_level(objs, max_workers):
+    # type: (list, int) -> None
+    """
+    Fetch the lazy resources `objs` concurrently, making a single request per
+    resource even if several lazy objects designate the same resource.
+    """
+    groups = dict()
+    for obj in objs:
+        key = (obj._lazy_cls, obj._lazy_id)
+        groups.setdefault(key, list()).append(obj)
+
+    pending = []
+    for group in groups.values():
+        loaded = next((obj for obj in group if obj._inner is not None), None)
+        if loaded is not None:
+            for obj in group:
+                obj._inner = loaded._inner
+        elif not group[0]._null:
+            pending.append(group)
+
+    def fetch(group):
+        _linked_lists.LazyAPILinkedList._refresh_quietly(group[0])
+        for obj in group[1:]:
+            obj._inner = group[0]._inner
+            obj._null = group[0]._null
+
+    for _ in _concurrency.bounded_map(
+            fetch, pending, max_workers=min(max_workers, len(pending))):
+        pass
+
+def prefetch(obj, paths, max_workers=None):
+    # type: (_api_resource.APIResource, _typing.Iterable[str], int) -> _api_resource.APIResource
+    """
+    Fetch the relations designated by `paths` (dotted paths, such as
+    `"files.comments"`) of the API resource `obj`, level by level: all the
+    resources of a level (across all paths) are fetched concurrently, with
+    up to `max_workers` concurrent requests, and each resource only once.
+
+    As with `LazyAPILinkedList.prefetch`, resources which could not be
+    fetched are fetched again (and the error raised) when accessed.
+    """
+    if obj is None or not paths:
+        return obj
+
+    if max_workers is None:
+        max_workers = _linked_lists.DEFAULT_PREFETCH_MAX_WORKERS
+
+    level = [(obj, parse_paths(cls=type(obj), paths=paths))]
+
+    while len(level) > 0:
+
+        # Collect the members of the relations of the current level
+        members = []
+        for (parent, tree) in level:
+            for (field_name, subtree) in tree.items():
+                try:
+                    lst = getattr(parent, field_name, None)
+                except KeyError:
+                    # The field is absent from the data of the resource
+                    lst = None
+                if not isinstance(lst, list):
+                    continue
+                for member in list.__iter__(lst):
+                    members.append((member, subtree))
+
+        _fetch_level(
+            objs=[
+                member for (member, _) in members
+                if _linked_lists.LazyAPILinkedList._is_lazy(member)
+            ],
+            max_workers=max_workers)
+
+        level = [
+            (member, subtree)
+            for (member, subtree) in members
+            if subtree and not _linked_lists.LazyAPILinkedList._is_lazy_null(member)
+        ]
+
+    return obj
+
+# =============================================================================
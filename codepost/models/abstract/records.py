@@ -0,0 +1,170 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# COMPACT RECORDS SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import typing as _typing
+
+# Local imports
+from . import linked_lists as _linked_lists
+
+# =============================================================================
+
+# Prefix of the slots storing the raw value of the fields which are exposed
+# as linked lists
+_RAW_PREFIX = "_raw_"
+
+# =============================================================================
+
+class APIRecord(object):
+    """
+    Compact, read-only representation of an API resource, meant for bulk
+    loads: the fields are stored in `__slots__` (a schema shared by all the
+    records of a model), rather than in per-instance dictionaries. Records
+    expose the same field attributes as the corresponding model, and can be
+    converted to a full API resource with `to_resource`.
+
+    Record classes are generated by `APIResourceMetaclass` (as the `Record`
+    attribute of each model).
+    """
+
+    __slots__ = ("_cache",)
+
+    # Set for each generated record class
+    _resource_cls = None
+    _FIELD_ID = "id"
+    _FIELD_NAMES = ()
+    _SLOT_NAMES = ()
+
+    def __init__(self, **data):
+        setter = object.__setattr__
+        setter(self, "_cache", None)
+        for (field_name, slot_name) in zip(self._FIELD_NAMES, self._SLOT_NAMES):
+            setter(self, slot_name, data.get(field_name, None))
+
+    def __setattr__(self, name, value):
+        # NOTE: Records are read-only (they are not change-tracked), so that
+        # modifications cannot be carried silently by `to_resource`
+        raise AttributeError(
+            "{} is read-only: use `to_resource()` to modify the resource "
+            "(cannot set {!r})".format(type(self).__name__, name))
+
+    def __delattr__(self, name):
+        raise AttributeError(
+            "{} is read-only (cannot delete {!r})".format(
+                type(self).__name__, name))
+
+    def _asdict(self):
+        # type: () -> dict
+        """
+        Return the data of the record, as the API returned it.
+        """
+        return {
+            field_name: getattr(self, slot_name)
+            for (field_name, slot_name) in zip(self._FIELD_NAMES, self._SLOT_NAMES)
+        }
+
+    def to_resource(self, requestor=None):
+        """
+        Return the full API resource (with change tracking, `save`, ...)
+        corresponding to this record.
+        """
+        return self._resource_cls(requestor=requestor, **self._asdict())
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._asdict() == other._asdict()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self._asdict()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __repr__(self):
+        return "<{}: {!r}>".format(type(self).__name__, self._asdict())
+
+# =============================================================================
+
+def _mk_list_property(field_name, slot_name, list_cls, list_type):
+    # type: (str, str, type, type) -> property
+
+    def fget(self):
+        cache = self._cache
+        if cache is None:
+            cache = dict()
+            object.__setattr__(self, "_cache", cache)
+
+        lst = cache.get(field_name, None)
+        if lst is None:
+            lst = list_cls(
+                iterable=getattr(self, slot_name) or (),
+                cls=list_type,
+                parent_cls=self._resource_cls,
+                parent_id=self.id,
+                parent_attribute=field_name,
+                query_attribute="name" if list_type is not None else None,
+                query_uniqueness=True,
+            )
+            cache[field_name] = lst
+        return lst
+
+    return property(fget=fget)
+
+def build_record_class(resource_cls, fields):
+    # type: (type, _typing.List[tuple]) -> type
+    """
+    Build the record class of the model `resource_cls`, given its fields as a
+    list of `(field_name, list_cls, list_type)`, where `list_cls` is the
+    linked list class used to expose list fields (or `None` for other fields).
+    """
+    field_names = []
+    slot_names = []
+    attrs = {
+        "__module__": resource_cls.__module__,
+        # NOTE: Makes the record class reachable (e.g., by `pickle`) as the
+        # `Record` attribute of the model
+        "__qualname__": "{}.Record".format(
+            getattr(resource_cls, "__qualname__", resource_cls.__name__)),
+    }
+
+    id_field_name = getattr(resource_cls, "_FIELD_ID", "id")
+    if id_field_name not in [field_name for (field_name, _, _) in fields]:
+        fields = [(id_field_name, None, None)] + list(fields)
+
+    for (field_name, list_cls, list_type) in fields:
+        if list_cls is None:
+            slot_name = field_name
+        else:
+            slot_name = _RAW_PREFIX + field_name
+            attrs[field_name] = _mk_list_property(
+                field_name=field_name,
+                slot_name=slot_name,
+                list_cls=list_cls,
+                list_type=list_type)
+
+        field_names.append(field_name)
+        slot_names.append(slot_name)
+
+    attrs.update({
+        "__slots__": tuple(slot_names),
+        "_resource_cls": resource_cls,
+        "_FIELD_ID": id_field_name,
+        "_FIELD_NAMES": tuple(field_names),
+        "_SLOT_NAMES": tuple(slot_names),
+    })
+
+    return type("{}Record".format(resource_cls.__name__), (APIRecord,), attrs)
+
+# =============================================================================
@@ -0,0 +1,209 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# RESOURCE CACHE SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import collections as _collections
+import hashlib as _hashlib
+import threading as _threading
+import time as _time
+import typing as _typing
+
+# Local imports
+import codepost.util.cache as _cache
+import codepost.util.codec as _codec
+import codepost.util.custom_logging as _logging
+
+# =============================================================================
+
+# Global submodule constants
+_LOG_SCOPE = "{}".format(__name__)
+
+DEFAULT_TTL = 60 # seconds
+
+# Global submodule protected attributes
+_logger = _logging.get_logger(name=_LOG_SCOPE)
+
+_resource_cache = None
+
+# =============================================================================
+
+CacheStats = _collections.namedtuple(
+    "CacheStats",
+    ["hits", "misses", "expirations", "writes", "invalidations"])
+
+def _get_object_name(cls):
+    # type: (_typing.Any) -> str
+    if isinstance(cls, str):
+        return cls
+    return getattr(cls, "_OBJECT_NAME", None) or getattr(cls, "__name__", str(cls))
+
+def _copy_data(data):
+    # type: (dict) -> dict
+    # NOTE: The cached data must not be affected by changes to the objects
+    # built from it, but only the lists (of IDs, e-mails, ...) are mutable
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for (key, value) in data.items()
+    }
+
+class ResourceCache(object):
+    """
+    Read-through cache of the data of API resources, sitting between the
+    `retrieve` verb and the requestor: resources are served from the cache for
+    `ttl` seconds (which can be set per model in `ttls`, by model class or
+    `_OBJECT_NAME`; a TTL of `0` disables caching for a model), and entries
+    are replaced or invalidated when resources are updated or deleted.
+
+    The entries are stored in a `backend` from `util.cache` (by default, an
+    in-memory LRU cache of up to `max_entries` entries); with a `DiskCache`,
+    the cache can be shared by several processes.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        ttl=DEFAULT_TTL,
+        ttls=None,
+        max_entries=_cache.DEFAULT_MAX_ENTRIES,
+        max_size=None,
+    ):
+        # type: (_cache.CacheBackend, float, dict, int, int) -> ResourceCache
+        if backend is None:
+            backend = _cache.MemoryCache(max_entries=max_entries, max_size=max_size)
+
+        self._backend = backend
+        self._sized = getattr(backend, "_max_size", None) is not None
+        self._ttl = ttl
+        self._ttls = {
+            _get_object_name(cls): value
+            for (cls, value) in (ttls or dict()).items()
+        }
+
+        self._lock = _threading.Lock()
+        self._counts = dict.fromkeys(CacheStats._fields, 0)
+
+    @property
+    def backend(self):
+        # type: () -> _cache.CacheBackend
+        return self._backend
+
+    @property
+    def stats(self):
+        # type: () -> CacheStats
+        """
+        The number of hits, misses, expired entries, writes and invalidations
+        since the creation of the cache (or the last `reset_stats`).
+        """
+        with self._lock:
+            return CacheStats(**self._counts)
+
+    def reset_stats(self):
+        # type: () -> None
+        with self._lock:
+            self._counts = dict.fromkeys(CacheStats._fields, 0)
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def get_ttl(self, cls):
+        # type: (_typing.Any) -> float
+        return self._ttls.get(_get_object_name(cls), self._ttl)
+
+    def _get_key(self, cls, id, api_key=None):
+        # type: (_typing.Any, int, str) -> str
+        # NOTE: Entries are not shared between API keys, which may not have
+        # access to the same resources
+        auth_hash = _hashlib.sha256(str(api_key or "").encode("utf8")).hexdigest()[:16]
+        return "{}:{}:{}".format(auth_hash, _get_object_name(cls), id)
+
+    def get(self, cls, id, api_key=None):
+        # type: (_typing.Any, int, str) -> _typing.Optional[dict]
+        """
+        Return (a copy of) the cached data of the resource `id` of type `cls`,
+        or `None` if it is not cached or has expired.
+        """
+        if not self.get_ttl(cls):
+            return None
+
+        key = self._get_key(cls, id, api_key=api_key)
+        entry = self._backend.get(key)
+
+        if entry is None:
+            self._count("misses")
+            return None
+
+        if entry.get("expires", 0) < _time.time():
+            self._backend.delete(key)
+            self._count("expirations")
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return _copy_data(entry["data"])
+
+    def set(self, cls, id, data, api_key=None):
+        # type: (_typing.Any, int, dict, str) -> None
+        """
+        Store the data of the resource `id` of type `cls`.
+        """
+        ttl = self.get_ttl(cls)
+        if not ttl or not isinstance(data, dict):
+            return
+
+        # The size of the entries only matters if the backend is size-bounded
+        size = len(_codec.dumps(data)) if self._sized else 1
+
+        self._backend.set(
+            self._get_key(cls, id, api_key=api_key),
+            {
+                "data": _copy_data(data),
+                "expires": _time.time() + ttl,
+            },
+            size=size)
+        self._count("writes")
+
+    def invalidate(self, cls, id, api_key=None):
+        # type: (_typing.Any, int, str) -> None
+        """
+        Remove the resource `id` of type `cls` from the cache.
+        """
+        self._backend.delete(self._get_key(cls, id, api_key=api_key))
+        self._count("invalidations")
+
+    def clear(self):
+        # type: () -> None
+        self._backend.clear()
+
+# =============================================================================
+
+def get_resource_cache():
+    # type: () -> _typing.Optional[ResourceCache]
+    """
+    Return the resource cache used by the API resources, if any.
+    """
+    return _resource_cache
+
+def set_resource_cache(cache=None, **kwargs):
+    # type: (ResourceCache or bool, dict) -> _typing.Optional[ResourceCache]
+    """
+    Set the resource cache used by the API resources: either a
+    `ResourceCache`, `True` to create one (with the provided keyword
+    arguments, see `ResourceCache`), or `None` to disable caching.
+    """
+    global _resource_cache
+
+    if cache is True:
+        cache = ResourceCache(**kwargs)
+    elif not isinstance(cache, ResourceCache):
+        cache = None
+
+    _resource_cache = cache
+    return _resource_cache
+
+# =============================================================================
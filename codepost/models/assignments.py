@@ -106,11 +106,15 @@ class Assignments(
     _FIELDS_READ_ONLY = [ "rubricCategories", "fileTemplates", "testCategories", "mean", "median", ]
     _FIELDS_REQUIRED = [ "name", "points", "course" ]
 
-    def list_submissions(self, id=None, student=None, grader=None):
+    def list_submissions(self, id=None, student=None, grader=None, compact=False):
         """
         Returns the list of submissions associated with an assignment, which
         optionally can be filtered according to a specific submitting `student`
         or a `grader`.
+
+        With `compact` set to `True`, the submissions are returned as compact
+        read-only records (`Submissions.Record`), which take a fraction of the
+        memory, and can be converted with `to_resource()` when needed.
         """
         _class_type = type(self)
 
@@ -136,8 +140,11 @@ class Assignments(
         )
         if ret.status_code == 200:
             # Returns a list of all submissions
+            _submission_type = (
+                _submissions.Submissions.Record if compact
+                else _submissions.Submissions)
             return list(map(
-                lambda kwargs: _submissions.Submissions(**kwargs),
+                lambda kwargs: _submission_type(**kwargs),
                 ret.json))
 
 # =============================================================================
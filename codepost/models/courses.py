@@ -41,16 +41,17 @@ class Courses(
     _FIELDS_READ_ONLY = [ ]
     _FIELDS_REQUIRED = [ "name", "period" ]
 
-    def list_available(self, name=None, period=None):
-        return list(self.iter_available(name=name, period=period))
+    def list_available(self, name=None, period=None, compact=False):
+        return list(self.iter_available(name=name, period=period, compact=compact))
 
-    def iter_available(self, name=None, period=None):
+    def iter_available(self, name=None, period=None, compact=False):
         """
         Returns a generator of all courses that the authenticated user (as
         identified by the API key) has administrative access to.
 
         Optionally, it is possible to filter courses according to their `name`
-        and/or `period`.
+        and/or `period`. With `compact` set to `True`, the courses are returned
+        as compact read-only records (`Courses.Record`).
 
         If you are unable to retrieve a course that you should have access to,
         you may either not be using the right API key, or you may not have
@@ -66,7 +67,8 @@ class Courses(
 
         if ret.status_code == 200:
             # Returns a list of courses
-            course_iter = map(lambda kws: _class_type(**kws), ret.json)
+            _course_type = _class_type.Record if compact else _class_type
+            course_iter = map(lambda kws: _course_type(**kws), ret.json)
 
             # Optionally filter according to the `name` parameter
             if name:
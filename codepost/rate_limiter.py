@@ -0,0 +1,231 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# RATE LIMITER SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import hashlib as _hashlib
+import threading as _threading
+import time as _time
+import typing as _typing
+
+# Local imports
+from . import retry as _retry
+
+# =============================================================================
+
+# Global submodule constants
+DEFAULT_RATE = 10.0 # requests per second
+DEFAULT_BURST = 20 # requests
+
+# Adaptation of the rate to the feedback of the server: the rate is divided
+# on every HTTP 429 response, and recovers linearly on successful responses
+RATE_DECREASE_FACTOR = 0.5
+RATE_INCREASE_FRACTION = 0.05
+
+RATE_LIMIT_REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining")
+RATE_LIMIT_RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+
+# Reset values above this threshold are timestamps rather than delays
+_EPOCH_THRESHOLD = 10 ** 9
+
+# Global submodule protected attributes
+_shared_limiters = {}
+_shared_limiters_lock = _threading.Lock()
+
+# =============================================================================
+
+def _get_header_float(headers, names):
+    # type: (_typing.Mapping, _typing.Iterable[str]) -> _typing.Optional[float]
+    for name in names:
+        value = _retry._get_header(headers, name)
+        if value is not None:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                pass
+
+# =============================================================================
+
+class RateLimiter(object):
+    """
+    Thread-safe token bucket throttling the requests made to the codePost API:
+    up to `burst` requests can be made at once, after which requests are
+    limited to `rate` requests per second.
+
+    When `adaptive` is `True`, the rate is also adjusted to the feedback of
+    the server: it is reduced on every HTTP 429 response (and no request is
+    made until the `Retry-After` delay has elapsed), requests are held back
+    when the rate-limit headers announce the quota is exhausted, and the rate
+    slowly recovers on successful responses.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, adaptive=True, min_rate=None):
+        # type: (float, int, bool, float) -> RateLimiter
+        self._lock = _threading.Lock()
+        self._adaptive = adaptive
+        self._blocked_until = 0.0
+        self.configure(rate=rate, burst=burst, min_rate=min_rate)
+        self._tokens = float(self._burst)
+        self._updated = self._clock()
+
+    def configure(self, rate=None, burst=None, min_rate=None):
+        # type: (float, int, float) -> None
+        """
+        Change the sustained `rate` and/or the `burst` size of the limiter.
+        """
+        with self._lock:
+            if rate is not None:
+                if rate <= 0:
+                    raise ValueError("The rate must be positive.")
+                self._max_rate = float(rate)
+                self._rate = float(rate)
+            if burst is not None:
+                if burst < 1:
+                    raise ValueError("The burst size must be at least 1.")
+                self._burst = burst
+                self._tokens = min(getattr(self, "_tokens", burst), burst)
+            if min_rate is not None or not hasattr(self, "_min_rate"):
+                self._min_rate = float(min_rate or self._max_rate / 100.0)
+
+    @property
+    def rate(self):
+        # type: () -> float
+        """
+        The current sustained rate (in requests per second).
+        """
+        return self._rate
+
+    @property
+    def burst(self):
+        # type: () -> int
+        return self._burst
+
+    def _clock(self):
+        return _time.time()
+
+    def _sleep(self, seconds):
+        _time.sleep(seconds)
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(float(self._burst), self._tokens + elapsed * self._rate)
+        self._updated = now
+
+    def try_acquire(self):
+        # type: () -> float
+        """
+        Take a token if one is available.
+
+        :return: `0` if a token was taken; otherwise, the number of seconds
+            after which one should be available.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+
+            if now < self._blocked_until:
+                return self._blocked_until - now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+
+            return (1 - self._tokens) / self._rate
+
+    def acquire(self):
+        # type: () -> None
+        """
+        Block until a request can be made, and take a token.
+        """
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            self._sleep(wait)
+
+    def observe(self, response):
+        # type: (_typing.Any) -> None
+        """
+        Adapt the limiter to the response the server made to a request.
+        """
+        if not self._adaptive or response is None:
+            return
+
+        status_code = getattr(response, "status_code", None)
+        headers = getattr(response, "headers", None) or {}
+
+        with self._lock:
+            now = self._clock()
+
+            if status_code == 429:
+                self._rate = max(self._min_rate, self._rate * RATE_DECREASE_FACTOR)
+                self._tokens = 0.0
+
+                retry_after = _retry.parse_retry_after(
+                    _retry._get_header(headers, _retry.RETRY_AFTER_HEADER))
+                if retry_after is not None:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+
+            elif status_code is not None and status_code < 400:
+                self._rate = min(
+                    self._max_rate,
+                    self._rate + self._max_rate * RATE_INCREASE_FRACTION)
+
+            remaining = _get_header_float(headers, RATE_LIMIT_REMAINING_HEADERS)
+            if remaining is None:
+                return
+
+            if remaining < 1:
+                reset = _get_header_float(headers, RATE_LIMIT_RESET_HEADERS)
+                if reset is not None:
+                    if reset > _EPOCH_THRESHOLD:
+                        reset -= _time.time()
+                    self._blocked_until = max(self._blocked_until, now + max(0.0, reset))
+                self._tokens = 0.0
+            else:
+                self._tokens = min(self._tokens, remaining)
+
+# =============================================================================
+
+def get_shared_rate_limiter(api_key, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+    # type: (str, float, int) -> RateLimiter
+    """
+    Return the rate limiter shared by all threads and requestors using the
+    API key `api_key`, creating it if needed. The `rate` and `burst`
+    parameters are only used when the limiter is created: use
+    `RateLimiter.configure` to change them afterwards.
+    """
+    key = _hashlib.sha256(str(api_key).encode("utf8")).hexdigest()
+
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(key, None)
+        if limiter is None:
+            limiter = RateLimiter(rate=rate, burst=burst)
+            _shared_limiters[key] = limiter
+
+    return limiter
+
+# =============================================================================
+
+class SharedRateLimiter(object):
+    """
+    Rate limiter which can be attached to an `HTTPClient` (or `APIRequestor`)
+    so that each request is throttled by the limiter shared by all requests
+    made with the same API key (see `get_shared_rate_limiter`).
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        # type: (float, int) -> SharedRateLimiter
+        self._rate = rate
+        self._burst = burst
+
+    def for_api_key(self, api_key):
+        # type: (str) -> RateLimiter
+        return get_shared_rate_limiter(
+            api_key=api_key, rate=self._rate, burst=self._burst)
+
+# =============================================================================
@@ -0,0 +1,211 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# RETRY POLICY SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import email.utils as _email_utils
+import random as _random
+import time as _time
+import typing as _typing
+
+# External dependencies
+import requests as _requests
+
+# =============================================================================
+
+# Global submodule constants
+DEFAULT_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_EXCEPTIONS = (
+    _requests.exceptions.ConnectionError,
+    _requests.exceptions.Timeout,
+)
+
+# Methods which can be repeated without changing the outcome; POST requests
+# are only retried when they carry an `Idempotency-Key` header
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE")
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+RETRY_AFTER_HEADER = "Retry-After"
+
+# =============================================================================
+
+def _get_header(headers, name):
+    # type: (_typing.Optional[_typing.Mapping], str) -> _typing.Optional[str]
+    """
+    Case-insensitive lookup of a header.
+    """
+    if not headers:
+        return None
+
+    value = headers.get(name, None)
+    if value is not None:
+        return value
+
+    name = name.lower()
+    for (key, value) in headers.items():
+        if key.lower() == name:
+            return value
+
+def parse_retry_after(value, now=None):
+    # type: (_typing.Optional[str], float) -> _typing.Optional[float]
+    """
+    Parses the value of a `Retry-After` header, which can either be a number
+    of seconds or an HTTP date, into a (non-negative) number of seconds.
+
+    :return: The number of seconds to wait, or `None` if it cannot be parsed.
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = _email_utils.parsedate_tz(value)
+        if date is None:
+            return None
+        timestamp = _email_utils.mktime_tz(date)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+    if now is None:
+        now = _time.time()
+
+    return max(0.0, timestamp - now)
+
+# =============================================================================
+
+class RetryPolicy(object):
+    """
+    Describes which failed HTTP requests to the codePost API are transparently
+    retried by the `HTTPClient`, and how long to wait between attempts.
+
+    :param max_retries: The default maximum number of retries of a request.
+    :param backoff_factor: The delay before the first retry (in seconds);
+        the delay doubles with every attempt.
+    :param max_backoff: The maximum delay between two attempts (in seconds),
+        including delays requested through the `Retry-After` header.
+    :param jitter: Whether to randomize the delays, so that many clients
+        failing at once do not retry in lockstep.
+    :param statuses: The HTTP status codes to retry on, either as a list,
+        or as a dictionary mapping a status code to its own maximum number of
+        retries.
+    :param exceptions: The exception types to retry on, either as a list, or
+        as a dictionary mapping a type to its own maximum number of retries.
+    :param methods: The HTTP methods which can safely be retried.
+    :param respect_retry_after: Whether to wait for as long as the server
+        requests through the `Retry-After` header.
+    """
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff_factor=0.5,
+        max_backoff=30.0,
+        jitter=True,
+        statuses=DEFAULT_STATUSES,
+        exceptions=DEFAULT_EXCEPTIONS,
+        methods=IDEMPOTENT_METHODS,
+        respect_retry_after=True,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+
+        if not isinstance(statuses, dict):
+            statuses = { status: max_retries for status in statuses or () }
+        self.statuses = dict(statuses)
+
+        if not isinstance(exceptions, dict):
+            exceptions = { exc: max_retries for exc in exceptions or () }
+        self.exceptions = dict(exceptions)
+
+        self.methods = set(method.upper() for method in methods or ())
+
+    def is_retryable_method(self, method, headers=None):
+        # type: (str, _typing.Optional[_typing.Mapping]) -> bool
+        """
+        Whether a request with this method (and headers) can be retried.
+        """
+        method = (method or "GET").upper()
+
+        if method in self.methods:
+            return True
+
+        # A POST with an idempotency key cannot create a duplicate resource
+        if method == "POST":
+            return _get_header(headers, IDEMPOTENCY_HEADER) is not None
+
+        return False
+
+    def get_max_retries_for_status(self, status_code):
+        # type: (int) -> int
+        return self.statuses.get(status_code, 0)
+
+    def get_max_retries_for_exception(self, exception):
+        # type: (Exception) -> int
+        max_retries = 0
+        for (exc_type, exc_max_retries) in self.exceptions.items():
+            if isinstance(exception, exc_type):
+                max_retries = max(max_retries, exc_max_retries)
+        return max_retries
+
+    def get_backoff(self, attempt, response=None):
+        # type: (int, _typing.Any) -> float
+        """
+        Return the delay (in seconds) to wait before retrying a request which
+        has failed `attempt + 1` times, using the `Retry-After` header of the
+        last `response` if it has any.
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = parse_retry_after(
+                _get_header(getattr(response, "headers", None),
+                            RETRY_AFTER_HEADER))
+            if retry_after is not None:
+                return min(self.max_backoff, retry_after)
+
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+
+        if self.jitter:
+            # "Equal jitter": keep half of the delay, randomize the rest
+            delay = delay / 2.0 + _random.uniform(0, delay / 2.0)
+
+        return delay
+
+    def should_retry_response(self, attempt, response, method, headers=None):
+        # type: (int, _typing.Any, str, _typing.Optional[_typing.Mapping]) -> bool
+        return (
+            self.is_retryable_method(method=method, headers=headers) and
+            attempt < self.get_max_retries_for_status(
+                getattr(response, "status_code", None)))
+
+    def should_retry_exception(self, attempt, exception, method, headers=None):
+        # type: (int, Exception, str, _typing.Optional[_typing.Mapping]) -> bool
+        return (
+            self.is_retryable_method(method=method, headers=headers) and
+            attempt < self.get_max_retries_for_exception(exception))
+
+    def sleep(self, seconds):
+        # type: (float) -> None
+        if seconds > 0:
+            _time.sleep(seconds)
+
+# =============================================================================
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+NO_RETRY = RetryPolicy(max_retries=0, statuses=(), exceptions=())
+
+# =============================================================================
@@ -5,6 +5,8 @@
 # =============================================================================
 
 # Local import
+from . import codec
+from . import concurrency
 from . import config
 from . import custom_logging
 from . import misc
@@ -0,0 +1,260 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# CACHE BACKENDS SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import collections as _collections
+import hashlib as _hashlib
+import json as _json
+import os as _os
+import threading as _threading
+import typing as _typing
+
+# Local imports
+from . import custom_logging as _logging
+
+# =============================================================================
+
+# Global submodule constants
+_LOG_SCOPE = "{}".format(__name__)
+
+DEFAULT_MAX_ENTRIES = 1024
+
+# Global submodule protected attributes
+_logger = _logging.get_logger(name=_LOG_SCOPE)
+
+# =============================================================================
+
+class CacheBackend(object):
+    """
+    Abstract key-value store used by the caches of the SDK. Keys are strings,
+    and values are JSON-serializable objects.
+    """
+
+    # Whether values are stored as they are (rather than serialized), so that
+    # objects which are costly to rebuild can be kept along with them
+    stores_objects = False
+
+    def get(self, key):
+        # type: (str) -> _typing.Any
+        """
+        Return the value stored for `key`, or `None`.
+        """
+        raise NotImplementedError("abstract class not meant to be used")
+
+    def set(self, key, value, size=1):
+        # type: (str, _typing.Any, int) -> None
+        """
+        Store `value` for `key`; `size` is the (approximate) number of bytes
+        the value takes, which counts towards the `max_size` of the cache.
+        """
+        raise NotImplementedError("abstract class not meant to be used")
+
+    def delete(self, key):
+        # type: (str) -> None
+        raise NotImplementedError("abstract class not meant to be used")
+
+    def clear(self):
+        # type: () -> None
+        raise NotImplementedError("abstract class not meant to be used")
+
+# =============================================================================
+
+class MemoryCache(CacheBackend):
+    """
+    Thread-safe in-process cache, evicting the least recently used entries
+    when it holds more than `max_entries` entries, or when the total size of
+    its entries exceeds `max_size` (if provided).
+    """
+
+    stores_objects = True
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_size=None):
+        # type: (int, int) -> MemoryCache
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._size = 0
+        self._entries = _collections.OrderedDict()
+        self._lock = _threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        # type: () -> int
+        return self._size
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key, None)
+            if item is None:
+                return None
+
+            # Mark as most recently used
+            self._entries.move_to_end(key)
+            return item[0]
+
+    def set(self, key, value, size=1):
+        with self._lock:
+            old_item = self._entries.pop(key, None)
+            if old_item is not None:
+                self._size -= old_item[1]
+
+            self._entries[key] = (value, size)
+            self._size += size
+
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > 0 and (
+                len(self._entries) > self._max_entries or
+                (self._max_size is not None and self._size > self._max_size)):
+            (_, (_, size)) = self._entries.popitem(last=False)
+            self._size -= size
+
+    def delete(self, key):
+        with self._lock:
+            item = self._entries.pop(key, None)
+            if item is not None:
+                self._size -= item[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+# =============================================================================
+
+class DiskCache(CacheBackend):
+    """
+    On-disk cache storing each entry as a JSON file in `directory`, so that
+    it can be shared by several processes and survive restarts. It evicts
+    the least recently used entries (according to the modification time of
+    the files, which is updated on access) when it holds more than
+    `max_entries` entries, or when it takes more than `max_size` bytes.
+    """
+
+    _SUFFIX = ".json"
+
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES, max_size=None):
+        # type: (str, int, int) -> DiskCache
+        self._directory = _os.path.abspath(_os.path.expanduser(directory))
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._lock = _threading.Lock()
+
+        # Index of the files of the cache (name -> size), least recently used
+        # first, loaded on first use
+        self._index = None
+        self._size = 0
+
+    @property
+    def directory(self):
+        # type: () -> str
+        return self._directory
+
+    def __len__(self):
+        with self._lock:
+            return len(self._get_index())
+
+    def _get_path(self, key):
+        # type: (str) -> str
+        name = _hashlib.sha256(key.encode("utf8")).hexdigest()
+        return _os.path.join(self._directory, name + self._SUFFIX)
+
+    def _get_index(self):
+        if self._index is None:
+            files = []
+            if _os.path.isdir(self._directory):
+                for name in _os.listdir(self._directory):
+                    if not name.endswith(self._SUFFIX):
+                        continue
+                    try:
+                        stat = _os.stat(_os.path.join(self._directory, name))
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, name, stat.st_size))
+            files.sort()
+
+            self._index = _collections.OrderedDict(
+                (name, size) for (_, name, size) in files)
+            self._size = sum(self._index.values())
+        return self._index
+
+    def _remove(self, path):
+        index = self._get_index()
+        size = index.pop(_os.path.basename(path), None)
+        if size is not None:
+            self._size -= size
+        try:
+            _os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, key):
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = _json.loads(f.read().decode("utf8"))
+            _os.utime(path, None)
+        except (IOError, OSError, ValueError):
+            return None
+
+        with self._lock:
+            index = self._get_index()
+            name = _os.path.basename(path)
+            if name in index:
+                index.move_to_end(name)
+
+        return value
+
+    def set(self, key, value, size=None):
+        path = self._get_path(key)
+        content = _json.dumps(value).encode("utf8")
+
+        with self._lock:
+            try:
+                if not _os.path.isdir(self._directory):
+                    _os.makedirs(self._directory)
+
+                # Write atomically, as several processes may share the cache
+                tmp_path = "{}.{}.{}.tmp".format(
+                    path, _os.getpid(), _threading.current_thread().ident)
+                with open(tmp_path, "wb") as f:
+                    f.write(content)
+                _os.replace(tmp_path, path)
+            except (IOError, OSError) as e:
+                _logger.debug("Error writing cache entry {}: {!r}".format(path, e))
+                return
+
+            index = self._get_index()
+            name = _os.path.basename(path)
+            self._size -= index.pop(name, 0)
+            index[name] = len(content)
+            self._size += len(content)
+
+            self._evict()
+
+    def _evict(self):
+        index = self._get_index()
+        while len(index) > 0 and (
+                len(index) > self._max_entries or
+                (self._max_size is not None and self._size > self._max_size)):
+            name = next(iter(index))
+            self._remove(_os.path.join(self._directory, name))
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(self._get_path(key))
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._get_index().keys()):
+                self._remove(_os.path.join(self._directory, name))
+
+# =============================================================================
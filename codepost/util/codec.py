@@ -0,0 +1,140 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# JSON CODEC SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import json as _json
+import typing as _typing
+
+# External dependencies (optional)
+try:
+    import orjson as _orjson
+except ImportError: # pragma: no cover
+    _orjson = None
+
+# =============================================================================
+
+class JSONCodec(object):
+    """
+    Abstract JSON codec, encoding objects to UTF-8 encoded `bytes`, and
+    decoding `bytes` (or `str`) to objects.
+    """
+
+    name = None # type: str
+
+    def dumps(self, obj):
+        # type: (_typing.Any) -> bytes
+        raise NotImplementedError("abstract class not meant to be used")
+
+    def loads(self, data):
+        # type: (bytes or str) -> _typing.Any
+        raise NotImplementedError("abstract class not meant to be used")
+
+    def __repr__(self):
+        return "{}(name={!r})".format(type(self).__name__, self.name)
+
+class StdlibJSONCodec(JSONCodec):
+    """
+    Codec based on the `json` module of the standard library.
+    """
+
+    name = "json"
+
+    def dumps(self, obj):
+        return _json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False).encode("utf8")
+
+    def loads(self, data):
+        # NOTE: `json.loads` only accepts `bytes` since Python 3.6
+        if isinstance(data, bytes):
+            data = data.decode("utf8")
+        return _json.loads(data)
+
+def _orjson_default(obj):
+    # Types that the standard library encodes as arrays (named tuples such
+    # as `platform.uname()`, in particular)
+    if isinstance(obj, (tuple, set, frozenset)):
+        return list(obj)
+    raise TypeError("Type is not JSON serializable: {}".format(type(obj).__name__))
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec based on the (optional) `orjson` library, which works directly on
+    `bytes`, and is several times faster than the standard library.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if _orjson is None:
+            raise ImportError("The `orjson` library is not installed.")
+
+    def dumps(self, obj):
+        return _orjson.dumps(obj, default=_orjson_default)
+
+    def loads(self, data):
+        return _orjson.loads(data)
+
+# =============================================================================
+
+_CODECS = {
+    StdlibJSONCodec.name: StdlibJSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+def _get_default_codec():
+    # type: () -> JSONCodec
+    if _orjson is not None:
+        return OrjsonCodec()
+    return StdlibJSONCodec()
+
+# Global submodule protected attributes
+_codec = _get_default_codec()
+
+def get_codec():
+    # type: () -> JSONCodec
+    """
+    Return the codec used to encode request bodies and decode responses.
+    """
+    return _codec
+
+def set_codec(codec=None):
+    # type: (JSONCodec or str) -> JSONCodec
+    """
+    Set the codec used to encode request bodies and decode responses: either
+    a `JSONCodec`, the name of a built-in codec (`"json"` or `"orjson"`), or
+    `None` to use the fastest available codec.
+    """
+    global _codec
+
+    if codec is None:
+        codec = _get_default_codec()
+    elif isinstance(codec, str):
+        if codec not in _CODECS:
+            raise ValueError("Unknown JSON codec: {!r}".format(codec))
+        codec = _CODECS[codec]()
+    elif not isinstance(codec, JSONCodec):
+        raise TypeError("The codec must be a `JSONCodec` or the name of one.")
+
+    _codec = codec
+    return _codec
+
+def dumps(obj):
+    # type: (_typing.Any) -> bytes
+    """
+    Encode `obj` to UTF-8 encoded JSON `bytes`.
+    """
+    return _codec.dumps(obj)
+
+def loads(data):
+    # type: (bytes or str) -> _typing.Any
+    """
+    Decode JSON `data` (`bytes` or `str`).
+    """
+    return _codec.loads(data)
+
+# =============================================================================
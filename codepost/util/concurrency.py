@@ -0,0 +1,168 @@
+# =============================================================================
+# codePost v2.0 SDK
+#
+# CONCURRENCY SUB-MODULE
+# =============================================================================
+
+from __future__ import print_function # Python 2
+
+# Python stdlib imports
+import collections as _collections
+import concurrent.futures as _futures
+import contextlib as _contextlib
+import functools as _functools
+import threading as _threading
+import typing as _typing
+
+# Local imports
+from . import custom_logging as _logging
+
+# =============================================================================
+
+# Global submodule constants
+_LOG_SCOPE = "{}".format(__name__)
+
+DEFAULT_MAX_WORKERS = 16
+
+# Global submodule protected attributes
+_logger = _logging.get_logger(name=_LOG_SCOPE)
+
+_executor = None
+_executor_size = 0
+_executor_lock = _threading.Lock()
+
+# Marks the worker threads of the shared executor
+_worker_local = _threading.local()
+
+# Thread-specific state carried over from the threads submitting tasks to the
+# workers running them, as `(capture, restore)` pairs (see `register_context`)
+_contexts = list()
+
+# =============================================================================
+
+def _in_worker():
+    # type: () -> bool
+    return getattr(_worker_local, "is_worker", False)
+
+def register_context(capture, restore):
+    # type: (_typing.Callable, _typing.Callable) -> None
+    """
+    Register thread-specific state to be carried over to the worker threads:
+    `capture()` is called in the thread submitting tasks (see `bounded_map`),
+    and the worker runs each task within the context manager returned by
+    `restore(state)`, where `state` is the captured value.
+    """
+    _contexts.append((capture, restore))
+
+def _capture_contexts():
+    # type: () -> list
+    return [(restore, capture()) for (capture, restore) in _contexts]
+
+def _run_with_contexts(func, contexts, *args, **kwargs):
+    with _contextlib.ExitStack() as stack:
+        for (restore, state) in contexts:
+            stack.enter_context(restore(state))
+        return func(*args, **kwargs)
+
+def _run_in_worker(func, item, contexts):
+    # NOTE: Worker threads are marked by the tasks themselves, as the
+    # `initializer` of `ThreadPoolExecutor` requires Python 3.7+
+    _worker_local.is_worker = True
+
+    return _run_with_contexts(func, contexts, item)
+
+def bind_contexts(func):
+    # type: (_typing.Callable) -> _typing.Callable
+    """
+    Return a callable which calls `func` (from any thread) with the
+    thread-specific state of the calling thread (see `register_context`),
+    for instance to run `func` with `loop.run_in_executor`.
+    """
+    return _functools.partial(_run_with_contexts, func, _capture_contexts())
+
+def get_executor(max_workers=DEFAULT_MAX_WORKERS):
+    # type: (int) -> _futures.ThreadPoolExecutor
+    """
+    Return the pool of worker threads shared by all the concurrent operations
+    of the SDK (so that the HTTP sessions of its threads are reused from one
+    operation to the next), with at least `max_workers` workers, creating it
+    if needed.
+
+    The pool only grows: when more workers are requested than it has, it is
+    replaced by a larger pool (the tasks of the previous pool still complete).
+    """
+    global _executor, _executor_size
+
+    previous_executor = None
+
+    if _executor is None or _executor_size < max_workers:
+        with _executor_lock:
+            if _executor is None or _executor_size < max_workers:
+                size = max(max_workers, _executor_size, DEFAULT_MAX_WORKERS)
+                previous_executor = _executor
+                _executor = _futures.ThreadPoolExecutor(max_workers=size)
+                _executor_size = size
+
+    if previous_executor is not None:
+        previous_executor.shutdown(wait=False)
+
+    return _executor
+
+# =============================================================================
+
+def bounded_map(func, iterable, max_workers=DEFAULT_MAX_WORKERS, ordered=True):
+    # type: (_typing.Callable, _typing.Iterable, int, bool) -> _typing.Iterator
+    """
+    Lazily apply `func` to the items of `iterable` on the shared worker pool,
+    with at most `max_workers` calls in progress at any time, and yield the
+    results (in the order of `iterable` if `ordered`, otherwise as they are
+    completed). Exceptions raised by `func` are raised when the corresponding
+    result is yielded.
+
+    When called from a worker of the pool (i.e., when operations are nested),
+    the calls are made sequentially, so that the pool cannot be exhausted by
+    tasks waiting for each other. The calls made by the workers see the
+    thread-specific state of the calling thread (see `register_context`).
+    """
+    if max_workers is None or max_workers <= 1 or _in_worker():
+        for item in iterable:
+            yield func(item)
+        return
+
+    executor = get_executor(max_workers=max_workers)
+    iterator = iter(iterable)
+    pending = _collections.deque()
+    contexts = _capture_contexts()
+
+    def submit_next():
+        for item in iterator:
+            pending.append(
+                executor.submit(_run_in_worker, func, item, contexts))
+            return True
+        return False
+
+    try:
+        for _ in range(max_workers):
+            if not submit_next():
+                break
+
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                (done, _) = _futures.wait(
+                    pending, return_when=_futures.FIRST_COMPLETED)
+                future = next(iter(done))
+                pending.remove(future)
+
+            result = future.result()
+            submit_next()
+            yield result
+
+    finally:
+        # If the consumer stops early (or a call failed), do not start the
+        # remaining calls
+        for future in pending:
+            future.cancel()
+
+# =============================================================================
@@ -9,10 +9,12 @@ from __future__ import print_function # Python 2
 # Python stdlib imports
 import copy as _copy
 import functools as _functools
+import hashlib as _hashlib
 import inspect as _inspect
 import json as _json
 import logging as _logging
 import os as _os
+import threading as _threading
 import time as _time
 import typing as _typing
 import sys as _sys
@@ -29,12 +31,8 @@ except ImportError: # pragma: no cover
 
 # External dependencies
 # import better_exceptions as _better_exceptions
-import requests as _requests
-from yaml import load as _load_yaml
-try:
-    from yaml import CLoader as _YamlLoader
-except ImportError: # pragma: no cover
-    from yaml import Loader as _YamlLoader
+# NOTE: `requests` and `yaml` are imported when first needed (see
+# `_load_yaml` and `validate_api_key`), as they are slow to import
 try:
     # Python 3
     from enum import Enum as _Enum
@@ -81,12 +79,23 @@ DEFAULT_CONFIG_PATHS = [
     "../codepost-config.yaml",
     "../.codepost-config.yaml",
 ]
+API_KEY_RECHECK_INTERVAL = 30 # seconds between checks of the config file
+VALIDATION_TIMEOUT = 10 # seconds
+VALIDATION_CACHE_PATH = "~/.codepost-cache/api-keys.json"
+VALIDATION_CACHE_TTL = 24 * 60 * 60 # seconds
 
 # Global submodule protected attributes
 _logger = _logging.get_logger(name=_LOG_SCOPE)
 _api_key = None
 _api_key_override = None
+_api_key_source = None
+_api_key_config_path = None
+_api_key_cache = None
+_api_key_cache_lock = _threading.Lock()
 _checked_api_keys = {}
+_validation_cache = None
+_validation_lock = _threading.Lock()
+_validations_pending = set()
 
 # =============================================================================
 
@@ -162,6 +171,11 @@ def find_config_file(search_paths=None):
 
     return location
 
+def _load_yaml(stream):
+    import yaml as _yaml
+    loader = getattr(_yaml, "CLoader", _yaml.Loader)
+    return _yaml.load(stream, Loader=loader)
+
 def read_config_file(search_paths=None):
     # type: (_typing.List[str]) -> _typing.Optional[dict]
     """
@@ -180,7 +194,7 @@ def read_config_file(search_paths=None):
 
         config = None
         try:
-            config = _load_yaml(open(config_path), Loader=_YamlLoader)
+            config = _load_yaml(open(config_path))
         except:
             _logger.debug(
                 "Error reading configuration file: {}".format(config_path))
@@ -289,12 +303,15 @@ def validate_api_key(api_key, log_outcome=False, caption="", refresh=False):
     # HTTP REQUEST
     ######################################################################
 
+    import requests as _requests
+
     try:
         auth_headers = {"Authorization": "Token {}".format(api_key)}
 
         r = _requests.get(
             "{}/courses/".format(BASE_URL),
-            headers=auth_headers
+            headers=auth_headers,
+            timeout=VALIDATION_TIMEOUT,
         )
 
         # This API endpoint will return HTTP 401 if the authorization
@@ -319,12 +336,144 @@ def validate_api_key(api_key, log_outcome=False, caption="", refresh=False):
 
 # =============================================================================
 
+def _hash_api_key(api_key):
+    # type: (str) -> str
+    return _hashlib.sha256(str(api_key).encode("utf8")).hexdigest()
+
+def _get_validation_cache_path():
+    # type: () -> _typing.Optional[str]
+    if not VALIDATION_CACHE_PATH:
+        return None
+    return _os.path.abspath(_os.path.expanduser(VALIDATION_CACHE_PATH))
+
+def _read_validation_cache():
+    # type: () -> dict
+    """
+    Returns the on-disk cache of successfully validated API keys (hashes only,
+    mapped to the timestamp of their validation), reading it at most once.
+    """
+    global _validation_cache
+
+    if _validation_cache is None:
+        cache = dict()
+        path = _get_validation_cache_path()
+        if path is not None and _os.path.isfile(path):
+            try:
+                with open(path) as f:
+                    cache = dict(_json.load(f))
+            except:
+                _logger.debug(
+                    "Error reading validation cache: {}".format(path))
+        _validation_cache = cache
+
+    return _validation_cache
+
+def _write_validation_cache(api_key):
+    # type: (str) -> None
+    """
+    Records in the on-disk cache that an API key was successfully validated.
+    """
+    cache = _read_validation_cache()
+    now = _time.time()
+
+    cache[_hash_api_key(api_key)] = now
+
+    # Drop expired entries
+    for (key, timestamp) in list(cache.items()):
+        if now - timestamp > VALIDATION_CACHE_TTL:
+            del cache[key]
+
+    path = _get_validation_cache_path()
+    if path is None:
+        return
+
+    try:
+        directory = _os.path.dirname(path)
+        if not _os.path.isdir(directory):
+            _os.makedirs(directory)
+
+        # Write atomically, as several processes may share the cache
+        tmp_path = "{}.{}.tmp".format(path, _os.getpid())
+        with open(tmp_path, "w") as f:
+            _json.dump(cache, f)
+        _os.rename(tmp_path, path)
+    except:
+        _logger.debug(
+            "Error writing validation cache: {}".format(path))
+
+def _is_api_key_known_valid(api_key):
+    # type: (str) -> bool
+    if _checked_api_keys.get(api_key, None) is True:
+        return True
+
+    timestamp = _read_validation_cache().get(_hash_api_key(api_key), None)
+    if timestamp is not None and (
+            _time.time() - timestamp <= VALIDATION_CACHE_TTL):
+        _checked_api_keys[api_key] = True
+        return True
+
+    return False
+
+def _validate_api_key_task(api_key, log_outcome, caption):
+    try:
+        validate_api_key(
+            api_key=api_key,
+            log_outcome=log_outcome,
+            caption=caption)
+
+        if _checked_api_keys.get(api_key, None) is True:
+            with _validation_lock:
+                _write_validation_cache(api_key=api_key)
+    finally:
+        with _validation_lock:
+            _validations_pending.discard(api_key)
+
+def validate_api_key_in_background(api_key, log_outcome=False, caption=""):
+    # type: (str, bool, str) -> _typing.Optional[bool]
+    """
+    Checks whether a provided codePost API key is valid, without blocking:
+    keys which were successfully validated recently (less than
+    `VALIDATION_CACHE_TTL` seconds ago, by this or another process) are
+    accepted from an on-disk cache, and other keys are validated with
+    `validate_api_key` on a background thread.
+
+    :return: `True` if the key is known to be valid; `None` otherwise (the
+        outcome is then logged by the background validation).
+    """
+    if not _util.is_stringable(api_key):
+        return validate_api_key(
+            api_key=api_key, log_outcome=log_outcome, caption=caption)
+
+    with _validation_lock:
+        if _is_api_key_known_valid(api_key):
+            return True
+
+        if api_key in _validations_pending:
+            return None
+        _validations_pending.add(api_key)
+
+    thread = _threading.Thread(
+        target=_validate_api_key_task,
+        name="codepost-validate-api-key",
+        kwargs={
+            "api_key": api_key,
+            "log_outcome": log_outcome,
+            "caption": caption,
+        })
+    thread.daemon = True
+    thread.start()
+
+    return None
+
+# =============================================================================
+
 @_logging.log_call
 def configure_api_key(api_key=None, override=True, log_outcome=True):
     # type: (str, bool, bool) -> str
     """
     Configures the API key to authenticate with the codePost API, by
-    looking at the following sources:
+    looking at the following sources (the validity of the key is checked
+    in the background, see `validate_api_key_in_background`):
     - provided as a parameter, through `api_key`;
     - hard-coded within library (for testing purposes);
     - as an environment variable (typically `CP_API_KEY`);
@@ -337,7 +486,7 @@ def configure_api_key(api_key=None, override=True, log_outcome=True):
     `False`, to only use the override API key in case one cannot be
     found in the environment.
     """
-    global _api_key, _api_key_override
+    global _api_key, _api_key_override, _api_key_source, _api_key_config_path
 
     # Used for reporting
     api_key_str = "N/A"
@@ -354,7 +503,7 @@ def configure_api_key(api_key=None, override=True, log_outcome=True):
             ))
 
         # Check validity of provided override key
-        validate_api_key(
+        validate_api_key_in_background(
             api_key=api_key,
             log_outcome=True,
             caption=" provided as override")
@@ -370,7 +519,7 @@ def configure_api_key(api_key=None, override=True, log_outcome=True):
             ))
 
         # Check validity of stored override key
-        validate_api_key(
+        validate_api_key_in_background(
             api_key=_api_key_override,
             log_outcome=True,
             caption=" stored as override")
@@ -388,7 +537,7 @@ def configure_api_key(api_key=None, override=True, log_outcome=True):
             """)
 
         # Check validity of hard-coded key
-        validate_api_key(
+        validate_api_key_in_background(
             api_key=_api_key,
             log_outcome=True,
             caption=" previously detected or hard-coded in the library")
@@ -400,6 +549,7 @@ def configure_api_key(api_key=None, override=True, log_outcome=True):
     if _os.environ.get(DEFAULT_API_KEY_ENV, None) != None:
 
         _api_key = _os.environ.get(DEFAULT_API_KEY_ENV)
+        _api_key_source = "env"
 
         _logger.debug(
             ("API_KEY detected in environment " +
@@ -409,7 +559,7 @@ def configure_api_key(api_key=None, override=True, log_outcome=True):
             ))
 
         # Check validity of environment provided key
-        validate_api_key(
+        validate_api_key_in_background(
             api_key=_api_key,
             log_outcome=True,
             caption=" obtained from an environment variable")
@@ -437,6 +587,8 @@ def configure_api_key(api_key=None, override=True, log_outcome=True):
             return
 
         _api_key = config.get("api_key")
+        _api_key_source = "file"
+        _api_key_config_path = location
 
         _logger.debug(
             ("API_KEY detected in configuration file ({}): " +
@@ -446,7 +598,7 @@ def configure_api_key(api_key=None, override=True, log_outcome=True):
             ))
 
         # Check validity of environment provided key
-        validate_api_key(
+        validate_api_key_in_background(
             api_key=_api_key,
             log_outcome=True,
             caption=" obtained config file '{}'".format(location))
@@ -462,3 +614,111 @@ def configure_api_key(api_key=None, override=True, log_outcome=True):
 
 # =============================================================================
 
+class _APIKeyCacheEntry(object):
+    """
+    Memoized outcome of the API key resolution, together with the state of
+    the sources it was resolved from, so that changes can be detected cheaply.
+    """
+
+    __slots__ = (
+        "api_key", "module_api_key", "override", "env_value",
+        "config_path", "config_mtime", "checked_at")
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.module_api_key = _api_key
+        self.override = _api_key_override
+        self.env_value = _os.environ.get(DEFAULT_API_KEY_ENV, None)
+        self.config_path = _api_key_config_path
+        self.config_mtime = _get_mtime(_api_key_config_path)
+        self.checked_at = _time.time()
+
+def _get_mtime(path):
+    # type: (str) -> _typing.Optional[float]
+    if path is None:
+        return None
+    try:
+        return _os.path.getmtime(path)
+    except OSError:
+        return None
+
+def _is_api_key_cache_fresh(entry):
+    # type: (_APIKeyCacheEntry) -> bool
+    """
+    Checks whether a memoized API key is still the one `configure_api_key`
+    would resolve. Only in-memory state is inspected, except for the mtime
+    of the configuration file, which is polled at most once every
+    `API_KEY_RECHECK_INTERVAL` seconds.
+    """
+    if entry.override is not _api_key_override:
+        return False
+
+    if entry.module_api_key is not _api_key:
+        return False
+
+    if entry.env_value != _os.environ.get(DEFAULT_API_KEY_ENV, None):
+        return False
+
+    # A key from the environment (or a hard-coded key) does not depend on the
+    # filesystem, any other case does
+    if entry.api_key is not None and _api_key_source != "file":
+        return True
+
+    now = _time.time()
+    if now - entry.checked_at < API_KEY_RECHECK_INTERVAL:
+        return True
+
+    if entry.api_key is None or (
+            _get_mtime(entry.config_path) != entry.config_mtime):
+        return False
+
+    entry.checked_at = now
+    return True
+
+def get_api_key():
+    # type: () -> _typing.Optional[str]
+    """
+    Returns the API key that `configure_api_key` would resolve, memoizing the
+    outcome so that no resolution (validation, filesystem or YAML work) is
+    made on each call. The memoized key is recomputed when the override key,
+    the environment variable or the configuration file changes, or after a
+    call to `invalidate_api_key_cache`.
+    """
+    global _api_key, _api_key_source, _api_key_cache
+
+    entry = _api_key_cache
+    if entry is not None and _is_api_key_cache_fresh(entry):
+        return entry.api_key
+
+    with _api_key_cache_lock:
+        entry = _api_key_cache
+        if entry is not None:
+            if _is_api_key_cache_fresh(entry):
+                return entry.api_key
+
+            # Forget a key which was obtained from a source which changed
+            if _api_key_source in ["env", "file"]:
+                _api_key = None
+                _api_key_source = None
+
+        api_key = configure_api_key()
+
+        _api_key_cache = _APIKeyCacheEntry(api_key=api_key)
+
+        return api_key
+
+def invalidate_api_key_cache():
+    # type: () -> None
+    """
+    Forgets the API key memoized by `get_api_key`, so that the next call
+    resolves it again from all sources.
+    """
+    global _api_key, _api_key_source, _api_key_cache
+
+    with _api_key_cache_lock:
+        if _api_key_source in ["env", "file"]:
+            _api_key = None
+            _api_key_source = None
+        _api_key_cache = None
+
+# =============================================================================
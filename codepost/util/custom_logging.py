@@ -12,6 +12,7 @@ import os as _os
 import time as _time
 import sys as _sys
 import platform as _platform
+import threading as _threading
 
 # External imports
 # import better_exceptions as _better_exceptions
@@ -25,10 +26,49 @@ from eliot import start_action, current_action, Action
 
 # =============================================================================
 
+class _LazyLogFile(object):
+    """
+    File-like object which only opens the log file (in append mode) the first
+    time a message is written to it, so that importing the SDK does not touch
+    the filesystem.
+    """
+
+    def __init__(self, name, mode="ab"):
+        # type: (str, str) -> None
+        self.name = name
+        self.mode = mode
+        self._file = None
+        self._lock = _threading.Lock()
+
+    def _get_file(self):
+        if self._file is None:
+            with self._lock:
+                if self._file is None:
+                    self._file = open(self.name, self.mode)
+        return self._file
+
+    def write(self, data):
+        # Empty writes are used by `eliot` to probe the type of the file
+        if not data:
+            return 0
+        return self._get_file().write(data)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+# =============================================================================
+
 # Global submodule constants
 LOG_FILENAME = "codepost.log"
 LOG_DEFAULT_SCOPE = "{}".format(__name__)
-LOG_FILE = open(LOG_FILENAME, "ab")
+LOG_FILE = _LazyLogFile(LOG_FILENAME, "ab")
 
 # Global submodule protected attributes
 _logger = None
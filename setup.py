@@ -39,5 +39,9 @@ setup(
         "typing",
         "enum34;python_version<'3.4'"
     ],
+    extras_require={
+        # Faster JSON encoding/decoding (see `codepost.util.codec`)
+        "fast": ["orjson"],
+    },
     include_package_data=True,
 )
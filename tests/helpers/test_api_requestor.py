@@ -14,6 +14,12 @@ class TestAPIRequestor:
         "version": "3.0",
     }
 
+    def setup_method(self, method):
+        """
+        Run before every test.
+        """
+        _ar._config.invalidate_api_key_cache()
+
     def test_api_key_from_init(self, mocker):
         mocker.patch("{}._config.validate_api_key".format(TARGET_MODULE))
         obj = _ar.APIRequestor(api_key=self.FAKE_API_KEY)
@@ -61,6 +67,32 @@ class TestAPIRequestor:
         assert headers.get("Authorization") == "Token {}".format(self.FAKE_API_KEY)
         assert headers.get("Content-Type") == "application/json"
 
+    def test_static_headers_cached(self, mocker):
+        mocker.patch("{}.codepost".format(TARGET_MODULE), app_info=self.FAKE_APP_INFO)
+        platform = mocker.spy(_ar._platform, "platform")
+        for _ in range(3):
+            _ar.APIRequestor._build_headers(api_key=self.FAKE_API_KEY)
+        assert platform.call_count <= 1
+
+        user_agent = _ar.APIRequestor._build_headers(
+            api_key=self.FAKE_API_KEY)["User-Agent"]
+        assert self.FAKE_APP_INFO["name"] in user_agent
+
+        mocker.patch("{}.codepost".format(TARGET_MODULE), app_info=None)
+        user_agent = _ar.APIRequestor._build_headers(
+            api_key=self.FAKE_API_KEY)["User-Agent"]
+        assert self.FAKE_APP_INFO["name"] not in user_agent
+
+    def test_prepare_request_no_copy(self):
+        payload = ["x" * 100]
+        headers = {"X-Custom": "1"}
+        kws = _ar.APIRequestor()._prepare_request(
+            endpoint="", method="GET", data=payload, headers=headers,
+            api_key=self.FAKE_API_KEY)
+        assert kws["data"] is payload
+        assert kws["headers"]["X-Custom"] == "1"
+        assert headers == {"X-Custom": "1"}
+
     def test_request(self, mocker):
         obj = _ar.APIRequestor()
         obj._client = mocker.Mock(
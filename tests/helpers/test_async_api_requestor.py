@@ -0,0 +1,131 @@
+import asyncio
+import gc
+import weakref
+
+import pytest
+
+import codepost.api_requestor as _ar
+import codepost.async_api_requestor as _aar
+import codepost.async_http_client as _ahc
+import codepost.http_client as _hc
+
+TARGET_MODULE = _aar.__name__
+
+URL = "https://api.codepost.io/courses/"
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsyncAPIRequestor:
+
+    FAKE_API_KEY = "a"*40
+
+    def test_shares_sync_http_client(self):
+        obj = _aar.AsyncAPIRequestor()
+        assert isinstance(obj._client, _ahc.AsyncHTTPClient)
+        assert obj._client.http_client is obj.requestor._client
+
+    def test_for_requestor(self):
+        assert _aar.for_requestor(_ar.STATIC_REQUESTOR) is _aar.STATIC_ASYNC_REQUESTOR
+
+        requestor = _ar.APIRequestor()
+        obj = _aar.for_requestor(requestor)
+        assert obj.requestor is requestor
+        assert _aar.for_requestor(requestor) is obj
+
+    def test_for_requestor_collected(self):
+        requestor = _ar.APIRequestor()
+        obj = weakref.ref(_aar.for_requestor(requestor))
+        ref = weakref.ref(requestor)
+
+        del requestor
+        gc.collect()
+        assert ref() is None
+        assert obj() is None
+
+    def test_static_pooled_client(self):
+        obj = _aar.STATIC_ASYNC_REQUESTOR
+        assert obj.requestor is _ar.STATIC_REQUESTOR
+        assert obj._client.http_client is not _ar.STATIC_REQUESTOR._client
+        assert obj._client.http_client.pooled
+        assert obj.max_workers == _ahc.DEFAULT_MAX_WORKERS
+
+    def test_static_client_follows_static_settings(self, mocker):
+        static_client = _ar.STATIC_REQUESTOR._client
+        client = _aar.STATIC_ASYNC_REQUESTOR._client.http_client
+        mocker.patch.object(static_client, "_retry_policy", mocker.Mock())
+        mocker.patch.object(static_client, "_rate_limiter", mocker.Mock())
+        mocker.patch.object(static_client, "_cache", mocker.Mock())
+
+        assert client.retry_policy is static_client.retry_policy
+        assert client.rate_limiter is static_client.rate_limiter
+        assert client.cache is static_client.cache
+
+        # The replacement of the client of the static requestor is followed
+        other_client = _hc.HTTPClient(cache=True)
+        mocker.patch.object(_ar.STATIC_REQUESTOR, "_client", other_client)
+        assert client.cache is other_client.cache
+
+    def test_static_client_throttled(self, mocker, requests_mock):
+        requests_mock.get(URL, status_code=200, json={})
+        limiter = mocker.Mock()
+        mocker.patch.object(_ar.STATIC_REQUESTOR._client, "_rate_limiter", limiter)
+
+        ret = run(_aar.STATIC_ASYNC_REQUESTOR._client.request(url=URL))
+        assert ret.status_code == 200
+        limiter.acquire.assert_called_once()
+
+    def test_max_workers(self):
+        obj = _aar.AsyncAPIRequestor()
+        executor = obj._client._get_executor()
+
+        obj.max_workers = 4
+        assert obj.max_workers == 4
+        assert obj._client._get_executor() is not executor
+        assert obj._client._get_executor()._max_workers == 4
+        obj.close()
+
+    def test_request(self, mocker):
+        obj = _aar.AsyncAPIRequestor(api_key=None)
+        request = mocker.Mock(return_value=mocker.Mock(status_code=200))
+        obj._client = _ahc.AsyncHTTPClient()
+        obj._client._client = mocker.Mock(request=request)
+
+        ret = run(obj._request(
+            endpoint="/courses/", method="GET", api_key=self.FAKE_API_KEY))
+
+        assert ret.status_code == 200
+        kwargs = request.call_args[1]
+        assert kwargs["url"] == "{}/courses/".format(obj.requestor._base_url)
+        assert kwargs["headers"]["Authorization"] == "Token {}".format(self.FAKE_API_KEY)
+
+    def test_request_error(self, mocker):
+        obj = _aar.AsyncAPIRequestor(api_key=None)
+        request = mocker.Mock(return_value=mocker.Mock(status_code=404))
+        obj._client = mocker.Mock(request=mocker.AsyncMock(side_effect=request))
+        obj.requestor._handle_request_error = mocker.Mock()
+
+        run(obj._request(endpoint="", method="GET", api_key=self.FAKE_API_KEY))
+        obj.requestor._handle_request_error.assert_called()
+
+    def test_requests_in_flight(self, mocker):
+        obj = _ahc.AsyncHTTPClient(max_workers=8)
+        obj._client = mocker.Mock(
+            request=mocker.Mock(return_value=mocker.Mock(status_code=200)))
+
+        async def gather():
+            return await asyncio.gather(*[
+                obj.request(url="https://example.com/{}".format(i))
+                for i in range(20)
+            ])
+
+        ret = run(gather())
+        assert len(ret) == 20
+        assert obj._client.request.call_count == 20
+        obj.close()
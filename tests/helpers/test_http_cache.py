@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+import codepost.http_client as _hc
+import codepost.util.cache as _cache
+
+URL = "https://api.codepost.io/courses/1/"
+HEADERS = {"Authorization": "Token {}".format("a"*40)}
+
+
+class TestMemoryCache:
+
+    def test_lru_eviction(self):
+        cache = _cache.MemoryCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_size_eviction(self):
+        cache = _cache.MemoryCache(max_size=10)
+        cache.set("a", "x"*6, size=6)
+        cache.set("b", "y"*6, size=6)
+        assert len(cache) == 1
+        assert cache.size == 6
+        assert cache.get("b") == "y"*6
+
+
+class TestDiskCache:
+
+    def test_roundtrip(self, tmp_path):
+        cache = _cache.DiskCache(directory=str(tmp_path))
+        cache.set("a", {"content": "x"})
+        assert _cache.DiskCache(directory=str(tmp_path)).get("a") == {"content": "x"}
+        cache.delete("a")
+        assert cache.get("a") is None
+
+    def test_eviction(self, tmp_path):
+        cache = _cache.DiskCache(directory=str(tmp_path), max_entries=2)
+        for key in ["a", "b", "c"]:
+            cache.set(key, key)
+        assert len(os.listdir(str(tmp_path))) == 2
+        assert cache.get("a") is None
+        assert cache.get("c") == "c"
+
+
+class TestHTTPClientCache:
+
+    def test_revalidate(self, requests_mock):
+        requests_mock.get(URL, [
+            {"status_code": 200, "text": '{"id": 1}', "headers": {"ETag": '"v1"'}},
+            {"status_code": 304, "headers": {"ETag": '"v1"'}},
+        ])
+        client = _hc.HTTPClient(cache=True)
+
+        first = client.request(url=URL, headers=HEADERS)
+        second = client.request(url=URL, headers=HEADERS)
+
+        assert "If-None-Match" not in requests_mock.request_history[0].headers
+        assert requests_mock.request_history[1].headers["If-None-Match"] == '"v1"'
+        assert second.status_code == 200
+        assert second.json == first.json == {"id": 1}
+
+    def test_revalidated_body_not_parsed_again(self, mocker, requests_mock):
+        requests_mock.get(URL, [
+            {"status_code": 200, "text": '{"id": 1}', "headers": {"ETag": '"v1"'}},
+            {"status_code": 304},
+        ])
+        loads = mocker.spy(_hc._codec, "loads")
+        client = _hc.HTTPClient(cache=True)
+
+        responses = [client.request(url=URL, headers=HEADERS) for _ in range(4)]
+        assert [response.json for response in responses] == [{"id": 1}] * 4
+        assert loads.call_count == 1
+
+    def test_last_modified(self, requests_mock):
+        date = "Wed, 21 Oct 2015 07:28:00 GMT"
+        requests_mock.get(URL, status_code=200, text="{}",
+                          headers={"Last-Modified": date})
+        client = _hc.HTTPClient(cache=True)
+        client.request(url=URL, headers=HEADERS)
+        client.request(url=URL, headers=HEADERS)
+        assert requests_mock.request_history[1].headers["If-Modified-Since"] == date
+
+    def test_not_shared_between_api_keys(self, requests_mock):
+        requests_mock.get(URL, status_code=200, text="{}", headers={"ETag": '"v1"'})
+        client = _hc.HTTPClient(cache=True)
+        client.request(url=URL, headers=HEADERS)
+        client.request(url=URL, headers={"Authorization": "Token {}".format("b"*40)})
+        assert "If-None-Match" not in requests_mock.request_history[1].headers
+
+    def test_write_invalidates(self, requests_mock):
+        requests_mock.get(URL, status_code=200, text="{}", headers={"ETag": '"v1"'})
+        requests_mock.patch(URL, status_code=200, text="{}")
+        client = _hc.HTTPClient(cache=True)
+        client.request(url=URL, headers=HEADERS)
+        client.request(url=URL, method="PATCH", headers=HEADERS)
+        client.request(url=URL, headers=HEADERS)
+        assert "If-None-Match" not in requests_mock.request_history[2].headers
+
+    def test_no_validators_not_cached(self, requests_mock):
+        requests_mock.get(URL, status_code=200, text="{}")
+        client = _hc.HTTPClient(cache=True)
+        client.request(url=URL, headers=HEADERS)
+        assert len(client.cache) == 0
+
+    def test_disk_backend(self, requests_mock, tmp_path):
+        requests_mock.get(URL, [
+            {"status_code": 200, "text": '{"id": 1}', "headers": {"ETag": '"v1"'}},
+            {"status_code": 304},
+        ])
+        _hc.HTTPClient(cache=_cache.DiskCache(str(tmp_path))).request(
+            url=URL, headers=HEADERS)
+
+        # A new client (e.g., in another process) reuses the cached response
+        client = _hc.HTTPClient(cache=_cache.DiskCache(str(tmp_path)))
+        assert client.request(url=URL, headers=HEADERS).json == {"id": 1}
@@ -0,0 +1,146 @@
+import gc
+import pickle
+import threading
+
+import pytest
+
+import codepost.api_requestor
+import codepost.errors
+import codepost.http_client as _hc
+
+URL = "https://api.codepost.io/courses/"
+
+
+def sessions_by_thread(client, n=4):
+    sessions = []
+
+    def worker():
+        sessions.append(client._get_session())
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return sessions
+
+
+class TestHTTPClientSessions:
+
+    def test_session_per_thread(self):
+        client = _hc.HTTPClient()
+        sessions = sessions_by_thread(client)
+        assert len(set(map(id, sessions))) == len(sessions)
+
+    def test_pooled_session(self):
+        client = _hc.HTTPClient(pooled=True)
+        sessions = sessions_by_thread(client)
+        assert len(set(map(id, sessions))) == 1
+        assert client._get_session() is sessions[0]
+
+    def test_adapter_pool_sizes(self):
+        client = _hc.HTTPClient(pooled=True, pool_connections=3, pool_maxsize=32)
+        adapter = client._get_session().get_adapter(URL)
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 32
+        assert adapter.max_retries.total == 0
+
+    def test_no_keep_alive(self):
+        client = _hc.HTTPClient(keep_alive=False)
+        assert client._get_session().headers["Connection"] == "close"
+
+    def test_close_all_threads(self, mocker):
+        client = _hc.HTTPClient()
+        sessions = [client._get_session()] + sessions_by_thread(client)
+        closes = [mocker.spy(session, "close") for session in sessions]
+
+        client.close()
+        for close in closes:
+            close.assert_called()
+
+        # A new session is established afterwards
+        assert client._get_session() is not sessions[0]
+
+    def test_context_manager(self, mocker):
+        with _hc.HTTPClient(pooled=True) as client:
+            close = mocker.spy(client._get_session(), "close")
+        close.assert_called()
+
+    def test_cleanup_on_thread_exit(self, mocker):
+        client = _hc.HTTPClient()
+        closed = []
+        mocker.patch.object(
+            _hc._requests.Session, "close",
+            autospec=True, side_effect=lambda session: closed.append(session))
+
+        sessions = sessions_by_thread(client, n=2)
+        gc.collect()
+
+        assert all(session in closed for session in sessions)
+
+    def test_user_session_not_closed_on_thread_exit(self, mocker):
+        session = _hc._requests.Session()
+        close = mocker.spy(session, "close")
+        client = _hc.HTTPClient(session=session)
+        assert sessions_by_thread(client) == [session] * 4
+        gc.collect()
+        close.assert_not_called()
+
+    def test_pickle(self):
+        client = _hc.HTTPClient(pooled=True, pool_maxsize=7)
+        client._get_session()
+        clone = pickle.loads(pickle.dumps(client))
+        assert clone._get_session().get_adapter(URL)._pool_maxsize == 7
+
+    def test_warm_up(self, requests_mock):
+        requests_mock.head(URL, status_code=200)
+        client = _hc.HTTPClient(pooled=True, pool_maxsize=4)
+        assert client.warm_up(url=URL, connections=8) == 4
+        assert requests_mock.call_count == 4
+
+
+class TestHTTPResponse:
+
+    def test_json_parsed_once(self, mocker):
+        loads = mocker.spy(_hc._codec, "loads")
+        response = _hc.HTTPResponse(data={"content": b'{"id": 1}'})
+        assert response.json == {"id": 1}
+        assert response.json is response.json
+        assert loads.call_count == 1
+
+    def test_content_decoded(self):
+        response = _hc.HTTPResponse(data={"content": b'{"id": 1}'})
+        assert response.content == '{"id": 1}'
+        assert response.json == {"id": 1}
+
+    def test_invalid_json(self):
+        assert _hc.HTTPResponse(data={"content": b"<html>"}).json is None
+        assert _hc.HTTPResponse(data={"content": b""}).json is None
+
+    def test_headers_view(self):
+        response = _hc.HTTPResponse(data={"headers": {"ETag": '"v1"'}})
+        assert response.headers["etag"] == '"v1"'
+        assert response.headers is response.headers
+        with pytest.raises(TypeError):
+            response.headers["ETag"] = '"v2"'
+
+    def test_keep_response(self, requests_mock):
+        requests_mock.get(URL, status_code=200, json={"id": 1},
+                          headers={"Content-Type": "application/json"})
+        assert _hc.HTTPClient().request(url=URL).response is not None
+
+        response = _hc.HTTPClient(keep_response=False).request(url=URL)
+        assert response.response is None
+        assert response.json == {"id": 1}
+        assert response.headers["content-type"] == "application/json"
+
+    def test_empty_content_decoded(self):
+        assert _hc.HTTPResponse(data={"content": b""}).content == ""
+
+    def test_empty_error_response(self, requests_mock):
+        requests_mock.get(URL, status_code=404, content=b"")
+        requestor = codepost.api_requestor.APIRequestor(
+            api_key="key", client=_hc.HTTPClient())
+        with pytest.raises(codepost.errors.NotFoundAPIError):
+            requestor._request(endpoint=URL, method="get")
@@ -0,0 +1,120 @@
+import threading
+
+import pytest
+
+import codepost.http_client as _hc
+import codepost.rate_limiter as _rl
+import codepost.retry as _retry
+
+URL = "https://api.codepost.io/courses/"
+
+
+class FakeClockRateLimiter(_rl.RateLimiter):
+    """
+    Rate limiter whose clock only advances when it sleeps.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.now = 0.0
+        self.slept = []
+        super(FakeClockRateLimiter, self).__init__(*args, **kwargs)
+
+    def _clock(self):
+        return self.now
+
+    def _sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+
+    def test_burst(self):
+        limiter = FakeClockRateLimiter(rate=1, burst=5)
+        for _ in range(5):
+            limiter.acquire()
+        assert limiter.slept == []
+
+    def test_sustained_rate(self):
+        limiter = FakeClockRateLimiter(rate=4, burst=1)
+        for _ in range(9):
+            limiter.acquire()
+        assert limiter.now == pytest.approx(2.0)
+
+    def test_429_reduces_rate(self, mocker):
+        limiter = FakeClockRateLimiter(rate=8, burst=8)
+        limiter.observe(mocker.Mock(status_code=429, headers={"Retry-After": "3"}))
+        assert limiter.rate == 4
+        limiter.acquire()
+        assert limiter.now >= 3
+
+    def test_rate_recovers(self, mocker):
+        limiter = FakeClockRateLimiter(rate=10, burst=1)
+        limiter.observe(mocker.Mock(status_code=429, headers={}))
+        for _ in range(20):
+            limiter.observe(mocker.Mock(status_code=200, headers={}))
+        assert limiter.rate == 10
+
+    def test_remaining_header(self, mocker):
+        limiter = FakeClockRateLimiter(rate=100, burst=100)
+        limiter.observe(mocker.Mock(status_code=200, headers={
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": "7",
+        }))
+        limiter.acquire()
+        assert limiter.now >= 7
+
+    def test_not_adaptive(self, mocker):
+        limiter = FakeClockRateLimiter(rate=8, burst=8, adaptive=False)
+        limiter.observe(mocker.Mock(status_code=429, headers={}))
+        assert limiter.rate == 8
+
+    def test_thread_safe(self):
+        limiter = _rl.RateLimiter(rate=1, burst=50)
+        tokens = []
+
+        def worker():
+            for _ in range(10):
+                if limiter.try_acquire() == 0:
+                    tokens.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert 50 <= len(tokens) <= 52
+
+
+class TestSharedRateLimiter:
+
+    def test_shared_per_api_key(self):
+        assert (
+            _rl.get_shared_rate_limiter("a"*40) is
+            _rl.get_shared_rate_limiter("a"*40))
+        assert (
+            _rl.get_shared_rate_limiter("a"*40) is not
+            _rl.get_shared_rate_limiter("b"*40))
+
+    def test_http_client(self, requests_mock, mocker):
+        requests_mock.get(URL, status_code=200, json=[])
+        shared = _rl.SharedRateLimiter(rate=5, burst=5)
+        client_1 = _hc.HTTPClient(rate_limiter=shared)
+        client_2 = _hc.HTTPClient(rate_limiter=shared)
+
+        limiter = _rl.get_shared_rate_limiter("c"*40)
+        acquire = mocker.spy(limiter, "acquire")
+
+        headers = {"Authorization": "Token {}".format("c"*40)}
+        client_1.request(url=URL, headers=headers)
+        client_2.request(url=URL, headers=headers)
+        assert acquire.call_count == 2
+
+    def test_retries_are_throttled(self, requests_mock, mocker):
+        mocker.patch.object(_retry.RetryPolicy, "sleep")
+        requests_mock.get(URL, [{"status_code": 503}, {"status_code": 200}])
+        limiter = _rl.RateLimiter()
+        acquire = mocker.spy(limiter, "acquire")
+        _hc.HTTPClient(rate_limiter=limiter).request(url=URL)
+        assert acquire.call_count == 2
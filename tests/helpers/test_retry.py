@@ -0,0 +1,128 @@
+import email.utils
+
+import pytest
+import requests
+
+import codepost.http_client as _hc
+import codepost.retry as _retry
+
+URL = "https://api.codepost.io/courses/"
+
+
+class TestParseRetryAfter:
+
+    def test_seconds(self):
+        assert _retry.parse_retry_after("120") == 120
+
+    def test_http_date(self):
+        now = 1000000000.0
+        value = email.utils.formatdate(now + 30, usegmt=True)
+        assert _retry.parse_retry_after(value, now=now) == 30
+
+    def test_past_date(self):
+        now = 1000000000.0
+        value = email.utils.formatdate(now - 30, usegmt=True)
+        assert _retry.parse_retry_after(value, now=now) == 0
+
+    def test_invalid(self):
+        assert _retry.parse_retry_after("soon") is None
+        assert _retry.parse_retry_after(None) is None
+
+
+class TestRetryPolicy:
+
+    def test_backoff_is_capped(self):
+        policy = _retry.RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+        assert [policy.get_backoff(i) for i in range(5)] == [1, 2, 4, 5, 5]
+
+    def test_backoff_jitter(self):
+        policy = _retry.RetryPolicy(backoff_factor=1, max_backoff=100)
+        for _ in range(20):
+            assert 4 <= policy.get_backoff(3) <= 8
+
+    def test_backoff_retry_after(self, mocker):
+        policy = _retry.RetryPolicy(max_backoff=10)
+        response = mocker.Mock(headers={"retry-after": "3"})
+        assert policy.get_backoff(0, response=response) == 3
+        response = mocker.Mock(headers={"Retry-After": "3600"})
+        assert policy.get_backoff(0, response=response) == 10
+
+    def test_per_status_rules(self, mocker):
+        policy = _retry.RetryPolicy(statuses={503: 5, 429: 1})
+        response = mocker.Mock(status_code=429)
+        assert policy.should_retry_response(0, response, "GET")
+        assert not policy.should_retry_response(1, response, "GET")
+        assert not policy.should_retry_response(
+            0, mocker.Mock(status_code=404), "GET")
+
+    def test_per_exception_rules(self):
+        policy = _retry.RetryPolicy(
+            exceptions={requests.exceptions.Timeout: 1})
+        assert policy.should_retry_exception(
+            0, requests.exceptions.ReadTimeout(), "GET")
+        assert not policy.should_retry_exception(
+            1, requests.exceptions.ReadTimeout(), "GET")
+        assert not policy.should_retry_exception(0, ValueError(), "GET")
+
+    def test_post_requires_idempotency_key(self):
+        policy = _retry.RetryPolicy()
+        assert not policy.is_retryable_method("POST", headers={})
+        assert policy.is_retryable_method(
+            "POST", headers={"Idempotency-Key": "abc"})
+
+
+class TestHTTPClientRetries:
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, mocker):
+        return mocker.patch.object(_retry.RetryPolicy, "sleep")
+
+    def test_retry_status(self, requests_mock, no_sleep):
+        requests_mock.get(URL, [
+            {"status_code": 503},
+            {"status_code": 429, "headers": {"Retry-After": "2"}},
+            {"status_code": 200, "json": []},
+        ])
+        ret = _hc.HTTPClient().request(url=URL, method="GET")
+        assert ret.status_code == 200
+        assert requests_mock.call_count == 3
+        assert no_sleep.call_args_list[-1][0][0] == 2
+
+    def test_retry_gives_up(self, requests_mock):
+        requests_mock.get(URL, status_code=500)
+        client = _hc.HTTPClient(retry_policy=_retry.RetryPolicy(max_retries=2))
+        ret = client.request(url=URL, method="GET")
+        assert ret.status_code == 500
+        assert requests_mock.call_count == 3
+
+    def test_retry_exception(self, requests_mock):
+        requests_mock.get(URL, [
+            {"exc": requests.exceptions.ConnectionError},
+            {"status_code": 200, "json": []},
+        ])
+        ret = _hc.HTTPClient().request(url=URL, method="GET")
+        assert ret.status_code == 200
+
+    def test_no_retry(self, requests_mock):
+        requests_mock.get(URL, exc=requests.exceptions.ConnectionError)
+        client = _hc.HTTPClient(retry_policy=_retry.NO_RETRY)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.request(url=URL, method="GET")
+        assert requests_mock.call_count == 1
+
+    def test_post_reuses_idempotency_key(self, requests_mock):
+        requests_mock.post(URL, [
+            {"status_code": 502},
+            {"status_code": 201, "json": {}},
+        ])
+        headers = {"Idempotency-Key": "some-key"}
+        ret = _hc.HTTPClient().request(url=URL, method="POST", headers=headers)
+        assert ret.status_code == 201
+        keys = [r.headers["Idempotency-Key"] for r in requests_mock.request_history]
+        assert keys == ["some-key", "some-key"]
+
+    def test_post_without_idempotency_key(self, requests_mock):
+        requests_mock.post(URL, status_code=502)
+        ret = _hc.HTTPClient().request(url=URL, method="POST")
+        assert ret.status_code == 502
+        assert requests_mock.call_count == 1
@@ -0,0 +1,23 @@
+
+import pytest
+
+import codepost.models.files as _files
+
+
+@pytest.fixture()
+def mock_request(mocker):
+    """
+    Return a function patching the requestor of the API resources, so that
+    its successive requests return the provided `(status_code, json)`
+    responses.
+    """
+
+    def mock(*responses):
+        return mocker.patch.object(
+            _files.Files._requestor, "_request",
+            side_effect=[
+                mocker.Mock(status_code=status_code, json=json)
+                for (status_code, json) in responses
+            ])
+
+    return mock
@@ -0,0 +1,145 @@
+import codepost.models.files as _files
+
+
+class TestSave:
+
+    def make_file(self):
+        return _files.Files(
+            id=1, name="a.py", code="x" * 10000, extension="py", path=None)
+
+    def test_only_dirty_fields(self, mock_request):
+        request = mock_request((200, {"id": 1, "name": "a.py", "path": "src"}))
+        obj = self.make_file()
+        obj.path = "src"
+        obj.save()
+
+        assert request.call_args[1]["method"] == "PATCH"
+        assert request.call_args[1]["data"] == {"path": "src"}
+        assert obj.path == "src"
+        assert not obj._dirty
+
+    def test_nothing_changed(self, mock_request):
+        request = mock_request()
+        obj = self.make_file()
+        obj.name = "a.py"
+        assert obj.save() is obj
+        request.assert_not_called()
+
+    def test_kwargs(self, mock_request):
+        request = mock_request((200, {"id": 1, "name": "b.py"}))
+        self.make_file().save(name="b.py")
+        assert request.call_args[1]["data"] == {"name": "b.py"}
+
+    def test_dirty_reset_on_reload(self):
+        obj = self.make_file()
+        obj.name = "b.py"
+        obj.name = "c.py"
+        assert obj._dirty == {"name"}
+        obj._data = {"id": 1}
+        assert not obj._dirty
+
+    def test_large_values_not_copied(self, mock_request):
+        request = mock_request((200, {"id": 1}))
+        obj = self.make_file()
+        code = "y" * 10000
+        obj.code = code
+        obj.save()
+        assert request.call_args[1]["data"]["code"] is code
+
+
+class TestCreateMany:
+
+    def patch_create(self, mocker, failing=()):
+        import codepost.models.comments as _comments
+        import threading
+        threads = set()
+
+        def create(self, **kwargs):
+            threads.add(threading.current_thread())
+            if kwargs["text"] in failing:
+                raise RuntimeError("cannot create {}".format(kwargs["text"]))
+            return _comments.Comments(id=int(kwargs["text"]), **kwargs)
+
+        return (mocker.patch.object(
+            _comments.Comments, "create", autospec=True, side_effect=create),
+            threads)
+
+    def items(self, n):
+        return ({"text": str(i), "file": 1} for i in range(n))
+
+    def test_report(self, mocker):
+        import codepost
+        import codepost.errors as _errors
+        (create, threads) = self.patch_create(mocker, failing=("3", "7"))
+
+        report = codepost.comment.create_many(self.items(20), concurrency=4)
+        assert create.call_count == 20
+        assert len(threads) > 1
+        assert (report.count, report.succeeded_count, report.failed_count) == (20, 18, 2)
+        assert not report.ok
+        assert [r.id for r in report.resources] == [
+            i for i in range(20) if i not in (3, 7)]
+        assert [(r.index, r.data["text"]) for r in report.failed] == [(3, "3"), (7, "7")]
+
+        try:
+            report.raise_for_errors()
+        except _errors.BatchOperationError as e:
+            assert sorted(e.failures) == [3, 7]
+        else:
+            assert False, "BatchOperationError not raised"
+
+    def test_completion_order(self, mocker):
+        import codepost
+        self.patch_create(mocker)
+        results = list(codepost.comment.iter_create_many(
+            self.items(10), concurrency=3, ordered=False))
+        assert sorted(r.index for r in results) == list(range(10))
+        assert all(r.error is None for r in results)
+
+    def test_streams_input(self, mocker):
+        import itertools
+        import codepost
+        self.patch_create(mocker)
+        consumed = []
+
+        def items():
+            for i in itertools.count():
+                consumed.append(i)
+                yield {"text": str(i), "file": 1}
+
+        results = codepost.comment.iter_create_many(items(), concurrency=4)
+        first = list(itertools.islice(results, 5))
+        results.close()
+
+        assert [r.index for r in first] == [0, 1, 2, 3, 4]
+        assert len(consumed) <= 5 + 4
+
+    def test_succeeded_not_kept(self, mocker):
+        import codepost
+        self.patch_create(mocker)
+        report = codepost.comment.create_many(
+            self.items(10), concurrency=2, keep_succeeded=False)
+        assert report.ok and report.succeeded_count == 10
+        assert report.succeeded == []
+
+
+class TestSaveInSession:
+
+    def test_dirty_fields_kept_when_lists_saved(self, mock_request):
+        import codepost
+        import codepost.models.submissions as _submissions
+        request = mock_request(
+            (200, {"id": 1, "grader": "g", "students": ["a"]}),
+            (200, {"id": 1, "grader": "g", "students": ["a", "b"]}),
+            (200, {"id": 1, "grader": "h", "students": ["a", "b"]}))
+
+        with codepost.session():
+            obj = _submissions.Submissions().retrieve(id=1)
+            obj.grader = "h"
+            obj.students.append("b")
+            obj.save()
+
+        assert [c[1]["data"] for c in request.call_args_list[1:]] == [
+            {"students": ["a", "b"]}, {"grader": "h"}]
+        assert obj.grader == "h"
+        assert obj.students == ["a", "b"]
@@ -164,3 +164,75 @@ class TestIsTypeVariable:
     def test_py2(self, mocker):
         mocker.patch("{}._sys".format(TARGET_MODULE), version_info=(2, 7))
         assert not _arm.is_type_variable(None)
+
+
+class TestFieldAccessors:
+    """
+    Testing class for the field accessors installed by `APIResourceMetaclass`.
+    """
+
+    def test_field_kinds(self):
+        import codepost.models.files as _files
+        assert _arm.APIResourceMetaclass._get_field_kind(str) == (
+            _arm.FIELD_KIND_SCALAR, None)
+        assert _arm.APIResourceMetaclass._get_field_kind(typing.List[str]) == (
+            _arm.FIELD_KIND_STRINGS, str)
+        assert _arm.APIResourceMetaclass._get_field_kind(typing.List[_files.Files]) == (
+            _arm.FIELD_KIND_RESOURCES, _files.Files)
+
+    def test_no_introspection_on_read(self, mocker):
+        import codepost.models.submissions as _submissions
+        obj = _submissions.Submissions(id=1, grade=3, files=[1], students=["a"])
+        detect = mocker.patch("{}.detect_list_type".format(TARGET_MODULE))
+        assert obj.grade == 3
+        assert obj.students == ["a"]
+        assert obj.files[0].id == 1
+        detect.assert_not_called()
+
+    def test_linked_list_cached(self):
+        import codepost.models.submissions as _submissions
+        obj = _submissions.Submissions(id=1, files=[1, 2])
+        assert obj.files is obj.files
+
+        obj.files = [3]
+        assert [f.id for f in list.__iter__(obj.files)] == [3]
+
+        obj._data = {"id": 1, "files": [4]}
+        assert [f.id for f in list.__iter__(obj.files)] == [4]
+
+
+class TestLazyClassCreation:
+    """
+    Testing class for the work deferred by `APIResourceMetaclass` from the
+    creation of the model classes to the first use of their attributes.
+    """
+
+    def test_field_doc_wrapped_on_read(self, mocker):
+        import codepost.models.comments as _comments
+        assert isinstance(_comments.Comments.text, _arm._FieldProperty)
+        assert "\n" in _comments.Comments.text.__doc__
+
+        wrap = mocker.patch("{}._textwrap.wrap".format(TARGET_MODULE),
+                            return_value=["wrapped"])
+        prop = _arm._FieldProperty(fget=lambda self: 1, doc="some doc")
+        wrap.assert_not_called()
+
+        assert prop.__doc__ == "wrapped"
+        assert prop.__doc__ == "wrapped"
+        wrap.assert_called_once_with("some doc")
+
+    def test_signature_built_on_first_access(self, mocker):
+        import codepost.models.abstract as _abstract
+        forge = mocker.patch("{}._forge".format(TARGET_MODULE))
+        forge.sign.return_value = lambda func: func
+        build = mocker.patch.object(
+            _arm.APIResourceMetaclass, "_build_signature", return_value=[])
+
+        cls = _arm.APIResourceMetaclass(
+            "Bogus", (_abstract.APIResource, _abstract.CreatableAPIResource),
+            {"_OBJECT_NAME": "bogus", "_FIELDS": {"name": (str, "Name.")}})
+        build.assert_not_called()
+
+        assert cls.create is _abstract.CreatableAPIResource.create
+        assert cls.create is _abstract.CreatableAPIResource.create
+        build.assert_called_once_with(obj=cls, all_optional=False, with_id=False)
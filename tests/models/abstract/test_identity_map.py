@@ -0,0 +1,132 @@
+import codepost
+import codepost.models.abstract.identity_map as _identity_map
+import codepost.models.abstract.linked_lists as _ll
+import codepost.models.comments as _comments
+import codepost.models.files as _files
+
+
+class TestIdentityMapSession:
+
+    def test_no_session(self, mock_request):
+        request = mock_request((200, {"id": 1}), (200, {"id": 1}))
+        assert _files.Files().retrieve(id=1) is not _files.Files().retrieve(id=1)
+        assert request.call_count == 2
+
+    def test_retrieve_once(self, mock_request):
+        request = mock_request((200, {"id": 1, "name": "a"}))
+        with codepost.session() as identity_map:
+            first = _files.Files().retrieve(id=1)
+            assert _files.Files().retrieve(id=1) is first
+            assert first in identity_map
+        assert request.call_count == 1
+        assert _identity_map.get_session() is None
+
+    def test_refresh_bypasses_map(self, mock_request):
+        request = mock_request(
+            (200, {"id": 1, "name": "a"}), (200, {"id": 1, "name": "b"}))
+        with codepost.session():
+            obj = _files.Files().retrieve(id=1)
+            obj.refresh()
+            assert request.call_count == 2
+            assert _files.Files().retrieve(id=1).name == "b"
+
+    def test_update_keeps_canonical(self, mock_request):
+        mock_request((200, {"id": 1, "name": "a"}), (200, {"id": 1, "name": "b"}))
+        with codepost.session():
+            obj = _files.Files().retrieve(id=1)
+            assert _files.Files().update(id=1, name="b") is obj
+            assert obj.name == "b"
+
+    def test_delete_forgets(self, mock_request):
+        request = mock_request((200, {"id": 1}), (204, None), (200, {"id": 1}))
+        with codepost.session():
+            obj = _files.Files().retrieve(id=1)
+            lazy = _ll.LazyAPILinkedList([1], cls=_files.Files)[0]
+            assert lazy.id == 1
+            _files.Files().delete(id=1)
+            assert lazy.name is None
+            assert _files.Files().retrieve(id=1) is not obj
+        assert request.call_count == 3
+
+    def test_lazy_references_shared(self, mocker):
+        retrieve = mocker.patch.object(
+            _comments.Comments, "_fetch",
+            side_effect=lambda id: _comments.Comments(id=id, text=str(id)))
+        with codepost.session():
+            first = _ll.LazyAPILinkedList([1, 2], cls=_comments.Comments)
+            second = _ll.LazyAPILinkedList([2, 3], cls=_comments.Comments)
+            assert list.__getitem__(first, 1) is list.__getitem__(second, 0)
+            first.prefetch()
+            second.prefetch()
+            assert retrieve.call_count == 3
+            assert list.__getitem__(first, 1)._inner is _comments.Comments().retrieve(id=2)
+
+
+class TestSessionScope:
+
+    def test_sessions_per_thread(self):
+        import threading
+        seen = []
+        started = threading.Event()
+        done = threading.Event()
+
+        def other_thread():
+            seen.append(_identity_map.get_session())
+            with codepost.session() as other_map:
+                started.set()
+                done.wait(5)
+                seen.append(_identity_map.get_session() is other_map)
+
+        with codepost.session() as identity_map:
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            started.wait(5)
+            assert _identity_map.get_session() is identity_map
+            done.set()
+            thread.join()
+
+        assert seen == [None, True]
+        assert _identity_map.get_session() is None
+
+    def test_workers_use_submitting_session(self):
+        import codepost.util.concurrency as _concurrency
+        with codepost.session() as identity_map:
+            sessions = list(_concurrency.bounded_map(
+                lambda _: _identity_map.get_session(), range(8), max_workers=4))
+        assert sessions == [identity_map] * 8
+
+        sessions = list(_concurrency.bounded_map(
+            lambda _: _identity_map.get_session(), range(8), max_workers=4))
+        assert sessions == [None] * 8
+
+    def test_api_keys_kept_apart(self):
+        identity_map = _identity_map.IdentityMap()
+        obj = _files.Files(id=1)
+        assert identity_map.merge(obj, api_key="key-a") is obj
+        assert identity_map.get(cls=_files.Files, id=1, api_key="key-a") is obj
+        assert identity_map.get(cls=_files.Files, id=1, api_key="key-b") is None
+
+        other = _files.Files(id=1)
+        assert identity_map.merge(other, api_key="key-b") is other
+        assert obj in identity_map and other in identity_map
+
+
+class TestMergeKeepsModifications:
+
+    def test_unsaved_fields_kept(self, mock_request):
+        request = mock_request(
+            (200, {"id": 1, "name": "a", "path": "x"}),
+            (200, {"id": 1, "name": "b", "path": "y"}),
+            (200, {"id": 1, "name": "b", "path": "z"}))
+
+        with codepost.session():
+            obj = _files.Files().retrieve(id=1)
+            obj.path = "z"
+            assert _files.Files().update(id=1, name="b") is obj
+            assert (obj.name, obj.path) == ("b", "z")
+            assert obj._dirty == {"path"}
+
+            obj.save()
+
+        assert request.call_args[1]["data"] == {"path": "z"}
+        assert not obj._dirty
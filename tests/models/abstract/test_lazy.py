@@ -0,0 +1,44 @@
+import codepost.models.abstract.lazy as _lazy
+import codepost.models.abstract.linked_lists as _ll
+import codepost.models.comments as _comments
+import codepost.models.files as _files
+
+
+class TestLazyAPIResource:
+
+    def test_one_class_per_model(self):
+        first = _lazy.create_lazy_resource(cls=_comments.Comments, id=1)
+        second = _lazy.create_lazy_resource(cls=_comments.Comments, id=2)
+        other = _lazy.create_lazy_resource(cls=_files.Files, id=1)
+
+        assert type(first) is type(second)
+        assert type(first) is not type(other)
+        assert first.id == 1 and second.id == 2
+
+    def test_detected_as_lazy(self):
+        obj = _lazy.create_lazy_resource(cls=_comments.Comments, id=1)
+        assert _ll.LazyAPILinkedList._is_lazy(obj)
+        assert not _ll.LazyAPILinkedList._is_lazy_null(obj)
+        assert not _ll.LazyAPILinkedList._is_lazy(_comments.Comments(id=1))
+
+    def test_fetch_on_access(self, mocker):
+        inner = _comments.Comments(id=3, text="hello")
+        retrieve = mocker.patch.object(
+            _comments.Comments, "retrieve", return_value=inner)
+
+        obj = _lazy.create_lazy_resource(cls=_comments.Comments, id=3)
+        assert obj.id == 3
+        retrieve.assert_not_called()
+
+        assert obj.text == "hello"
+        assert obj.text == "hello"
+        retrieve.assert_called_once_with(id=3)
+
+    def test_state_per_instance(self, mocker):
+        mocker.patch.object(
+            _comments.Comments, "retrieve",
+            side_effect=lambda id: _comments.Comments(id=id, text=str(id)))
+
+        objs = [_lazy.create_lazy_resource(cls=_comments.Comments, id=i)
+                for i in [1, 2]]
+        assert [obj.text for obj in objs] == ["1", "2"]
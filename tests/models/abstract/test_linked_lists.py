@@ -0,0 +1,346 @@
+import threading
+
+import pytest
+
+import codepost.models.abstract.linked_lists as _ll
+import codepost.models.comments as _comments
+
+
+def make_list(n=10, **kwargs):
+    return _ll.LazyAPILinkedList(
+        iterable=list(range(1, n + 1)), cls=_comments.Comments, **kwargs)
+
+
+def patch_retrieve(mocker):
+    threads = set()
+
+    def retrieve(id):
+        threads.add(threading.current_thread())
+        return _comments.Comments(id=id, text=str(id))
+
+    return (mocker.patch.object(
+        _comments.Comments, "retrieve", side_effect=retrieve), threads)
+
+
+class TestLazyAPILinkedListPrefetch:
+
+    def test_prefetch(self, mocker):
+        (retrieve, threads) = patch_retrieve(mocker)
+        lst = make_list().prefetch()
+        assert retrieve.call_count == 10
+        assert len(threads) > 1
+        assert [obj.text for obj in lst] == [str(i) for i in range(1, 11)]
+        assert retrieve.call_count == 10
+
+    def test_iteration_prefetches_chunks(self, mocker):
+        (retrieve, _) = patch_retrieve(mocker)
+        lst = make_list()
+        lst.prefetch_chunk_size = 4
+
+        iterator = iter(lst)
+        obj = next(iterator)
+        retrieve.assert_not_called()
+        assert obj.text == "1"
+        assert retrieve.call_count == 4
+
+        assert [obj.text for obj in iterator] == [str(i) for i in range(2, 11)]
+        assert retrieve.call_count == 10
+
+    def test_iteration_over_ids_does_not_fetch(self, mocker):
+        (retrieve, _) = patch_retrieve(mocker)
+        lst = make_list()
+        lst.prefetch_chunk_size = 4
+        assert [obj.id for obj in lst] == list(range(1, 11))
+        assert len(set(map(type, lst))) == 1
+        retrieve.assert_not_called()
+
+    def test_no_prefetch_on_iter(self, mocker):
+        (retrieve, _) = patch_retrieve(mocker)
+        lst = make_list()
+        lst.prefetch_on_iter = False
+        assert [obj.id for obj in lst] == list(range(1, 11))
+        retrieve.assert_not_called()
+
+    def test_serialization_does_not_fetch(self, mocker):
+        (retrieve, _) = patch_retrieve(mocker)
+        assert make_list()._to_serializable_list() == list(range(1, 11))
+        retrieve.assert_not_called()
+
+    def test_errors_raised_on_access(self, mocker):
+        mocker.patch.object(
+            _comments.Comments, "retrieve", side_effect=RuntimeError("boom"))
+        lst = make_list(n=2).prefetch()
+        assert all(obj._inner is None for obj in list.__iter__(lst))
+
+
+def make_roster(emails=("a@x.y", "b@x.y")):
+    import codepost.models.sections as _sections
+    return _ll.APILinkedList(
+        iterable=list(emails), cls=None, parent_cls=_sections.Sections,
+        parent_id=5, parent_attribute="students", query_attribute=None)
+
+
+class TestAPILinkedListChanges:
+
+    def test_append_in_place(self):
+        lst = make_roster()
+        assert lst.append("c@x.y") is lst
+        lst.extend(["d@x.y"])
+        lst += ["e@x.y"]
+        lst.insert(0, "f@x.y")
+        assert list(lst) == ["f@x.y", "a@x.y", "b@x.y", "c@x.y", "d@x.y", "e@x.y"]
+        assert lst.has_changes
+
+    def test_add_returns_new_list(self):
+        lst = make_roster()
+        other = lst + ["c@x.y"]
+        assert type(other) is _ll.APILinkedList
+        assert list(lst) == ["a@x.y", "b@x.y"] and not lst.has_changes
+        assert list(other) == ["a@x.y", "b@x.y", "c@x.y"] and other.has_changes
+
+    def test_lazy_members(self):
+        lst = make_list(n=2)
+        lst.append(3)
+        assert _ll.LazyAPILinkedList._is_lazy(list.__getitem__(lst, 2))
+        assert lst._to_serializable_list() == [1, 2, 3]
+        assert type(lst + [4]) is _ll.LazyAPILinkedList
+
+    def test_changes_cancel_out(self, mocker):
+        update = mocker.patch("codepost.models.sections.Sections.update")
+        lst = make_roster()
+        lst.append("c@x.y")
+        lst.remove("c@x.y")
+        lst.remove("a@x.y")
+        lst.append("a@x.y")
+        assert not lst.has_changes
+
+        lst.save()
+        update.assert_not_called()
+
+    def test_save_updates_parent_once(self, mocker):
+        import codepost.models.sections as _sections
+        update = mocker.patch.object(
+            _sections.Sections, "update",
+            side_effect=lambda id, **kws: _sections.Sections(id=id, **kws))
+
+        lst = make_roster()
+        lst.remove("a@x.y")
+        for i in range(3):
+            lst.append("{}@z.z".format(i))
+        lst.save()
+
+        update.assert_called_once_with(
+            id=5, students=["b@x.y", "0@z.z", "1@z.z", "2@z.z"])
+        assert not lst.has_changes
+
+        lst.save()
+        assert update.call_count == 1
+
+    def test_changes_kept_if_parent_update_fails(self, mocker):
+        import codepost.models.sections as _sections
+        update = mocker.patch.object(
+            _sections.Sections, "update", side_effect=RuntimeError("down"))
+
+        lst = make_roster()
+        lst.append("c@x.y")
+        with pytest.raises(RuntimeError):
+            lst.save()
+        assert lst.has_changes
+
+        update.side_effect = lambda id, **kws: _sections.Sections(id=id, **kws)
+        lst.save()
+        update.assert_called_with(id=5, students=["a@x.y", "b@x.y", "c@x.y"])
+        assert not lst.has_changes
+
+    def test_removed_members_deleted(self, mocker):
+        import codepost.models.files as _files
+        delete = mocker.patch.object(_comments.Comments, "delete")
+        update = mocker.patch.object(_files.Files, "update")
+
+        lst = make_list(n=4, parent_cls=_files.Files, parent_id=9,
+                        parent_attribute="comments")
+        del lst[0]
+        lst.pop()
+        lst.remove(2)
+        lst.save()
+
+        assert sorted(c[1]["id"] for c in delete.call_args_list) == [1, 2, 4]
+        update.assert_not_called()
+        assert lst._to_serializable_list() == [3]
+
+    def test_parent_save_skips_unchanged_lists(self, mocker):
+        import codepost.models.sections as _sections
+        update = mocker.patch.object(_sections.Sections, "update")
+        section = _sections.Sections(id=5, name="A", students=["a@x.y"])
+        assert section.students == ["a@x.y"]
+
+        section.save()
+        update.assert_not_called()
+
+
+class TestIndexedLookups:
+
+    def test_by_name_fetches_once(self, mocker):
+        (retrieve, _) = patch_retrieve(mocker)
+        lst = make_list(n=10, query_attribute="text")
+
+        assert lst.by_name("3").id == 3
+        assert retrieve.call_count == 10
+        assert lst.by_name("7").id == 7
+        assert lst.by_name("missing") is None
+        assert lst.by_name(None) is None
+        assert retrieve.call_count == 10
+
+    def test_index_not_scanned_again(self, mocker):
+        patch_retrieve(mocker)
+        lst = make_list(n=10, query_attribute="text")
+        lst.by_name("1")
+
+        iterate = mocker.patch.object(_ll.LazyAPILinkedList, "__iter__")
+        assert lst.by("text", "5").id == 5
+        iterate.assert_not_called()
+
+    def test_non_unique(self):
+        lst = make_roster(["a@x.y", "b@x.y", "a@x.y"])
+        assert lst.by(None, "a@x.y", unique=False) == ["a@x.y", "a@x.y"]
+        assert lst.by(None, "c@x.y", unique=False) == []
+
+    def test_index_follows_changes(self, mocker):
+        (retrieve, _) = patch_retrieve(mocker)
+        lst = make_list(n=3, query_attribute="text")
+        assert lst.by_name("2").id == 2
+
+        lst.append(4)
+        lst.remove(2)
+        assert retrieve.call_count == 3
+
+        assert lst.by_name("4").id == 4
+        assert lst.by_name("2") is None
+        assert retrieve.call_count == 4
+
+        del lst[:]
+        assert lst.by_name("1") is None
+
+    def test_other_attribute(self):
+        import codepost.models.files as _files
+        lst = _ll.APILinkedList(
+            iterable=[_files.Files(id=i, path="dir{}".format(i % 2))
+                      for i in range(4)],
+            cls=_files.Files)
+        assert [f.id for f in lst.by("path", "dir1", unique=False)] == [1, 3]
+        assert lst.by("path", "dir0").id == 0
+
+
+class TestConcurrentSave:
+
+    def patch_delete(self, mocker, failing=()):
+        import codepost.errors as _errors
+        threads = set()
+
+        def delete(id):
+            threads.add(threading.current_thread())
+            if id in failing:
+                raise RuntimeError("cannot delete {}".format(id))
+            if id == 404:
+                raise _errors.NotFoundAPIError(message="Not found.")
+            return True
+
+        return (mocker.patch.object(
+            _comments.Comments, "delete", side_effect=delete), threads)
+
+    def test_concurrent_deletions(self, mocker):
+        (delete, threads) = self.patch_delete(mocker)
+        lst = make_list(n=40)
+        del lst[:30]
+        lst.save()
+
+        assert delete.call_count == 30
+        assert len(threads) > 1
+        assert not lst.has_changes
+
+    def test_failures_reported(self, mocker):
+        import codepost.errors as _errors
+        import codepost.models.files as _files
+        (delete, _) = self.patch_delete(mocker, failing=(2, 5))
+        update = mocker.patch.object(
+            _files.Files, "update",
+            side_effect=lambda id, **kws: _files.Files(id=id, **kws))
+
+        lst = make_list(n=6, parent_cls=_files.Files, parent_id=9,
+                        parent_attribute="comments")
+        del lst[:5]
+        lst.append(7)
+
+        try:
+            lst.save()
+        except _errors.BatchOperationError as e:
+            assert e.operation == "delete"
+            assert e.count == 5
+            assert sorted(e.failures) == [2, 5]
+            assert "2 out of 5" in str(e)
+        else:
+            assert False, "BatchOperationError not raised"
+
+        update.assert_called_once_with(id=9, comments=[6, 7])
+        assert lst._to_serializable_list() == [6, 7]
+
+        # Failed deletions are attempted again
+        (delete, _) = self.patch_delete(mocker)
+        lst.save()
+        assert sorted(c[1]["id"] for c in delete.call_args_list) == [2, 5]
+        assert update.call_count == 1
+
+    def test_changes_kept_if_parent_update_fails(self, mocker):
+        import codepost.models.files as _files
+        (delete, _) = self.patch_delete(mocker, failing=(2,))
+        update = mocker.patch.object(
+            _files.Files, "update", side_effect=RuntimeError("down"))
+
+        lst = make_list(n=4, parent_cls=_files.Files, parent_id=9,
+                        parent_attribute="comments")
+        del lst[:2]
+        lst.append(7)
+        with pytest.raises(RuntimeError):
+            lst.save()
+        assert delete.call_count == 2
+
+        # Only the failed deletion and the parent update are attempted again
+        update.side_effect = lambda id, **kws: _files.Files(id=id, **kws)
+        (delete, _) = self.patch_delete(mocker)
+        lst.save()
+        assert [c[1]["id"] for c in delete.call_args_list] == [2]
+        update.assert_called_with(id=9, comments=[3, 4, 7])
+        assert not lst.has_changes
+
+    def test_missing_members_count_as_deleted(self, mocker):
+        (delete, _) = self.patch_delete(mocker)
+        lst = _ll.LazyAPILinkedList(iterable=[404, 1], cls=_comments.Comments)
+        del lst[:]
+        lst.save()
+        assert delete.call_count == 2
+        assert not lst.has_changes
+
+
+class TestCleanupList:
+
+    def test_single_pass_compaction(self):
+        lst = make_list(n=6)
+        objs = list(list.__iter__(lst))
+        objs[0]._null = True
+        objs[3]._null = True
+        list.__setitem__(lst, 4, 5)
+
+        assert lst._cleanup_list() is lst
+        assert [obj.id for obj in list.__iter__(lst)] == [2, 3, 5, 6]
+        assert all(_ll.LazyAPILinkedList._is_lazy(obj)
+                   for obj in list.__iter__(lst))
+        assert not lst.has_changes
+
+    def test_lazy_detection_by_type(self):
+        class NotLazy(object):
+            _inner = None
+            _null = True
+
+        assert not _ll.LazyAPILinkedList._is_lazy(NotLazy())
+        assert not _ll.LazyAPILinkedList._is_lazy_null(NotLazy())
+        assert not _ll.LazyAPILinkedList._is_lazy(None)
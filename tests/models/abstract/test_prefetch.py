@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+import pytest
+
+import codepost.async_api_requestor as _async_api_requestor
+import codepost.models.abstract.prefetch as _prefetch
+import codepost.models.comments as _comments
+import codepost.models.files as _files
+import codepost.models.submissions as _submissions
+
+
+class FakeAPI(object):
+
+    def __init__(self, mocker):
+        self.calls = []
+        self.lock = threading.Lock()
+        mocker.patch.object(_files.Files, "retrieve", self.retrieve_file)
+        mocker.patch.object(_comments.Comments, "retrieve", self.retrieve_comment)
+
+    def retrieve_file(self, id):
+        with self.lock:
+            self.calls.append(("files", id))
+        # Both files share comment 100
+        return _files.Files(id=id, name="f{}".format(id), comments=[100, id * 10])
+
+    def retrieve_comment(self, id):
+        with self.lock:
+            self.calls.append(("comments", id))
+        return _comments.Comments(id=id, text=str(id))
+
+
+class TestPrefetch:
+
+    def test_parse_paths(self):
+        assert _prefetch.parse_paths(
+            _submissions.Submissions, ["files.comments", "tests", "files"]) == {
+                "files": {"comments": {}}, "tests": {}}
+
+    @pytest.mark.parametrize("path", ["grader", "files.name", "unknown"])
+    def test_invalid_paths(self, path):
+        with pytest.raises(ValueError):
+            _prefetch.parse_paths(_submissions.Submissions, [path])
+
+    def test_nested(self, mocker):
+        api = FakeAPI(mocker)
+        submission = _submissions.Submissions(id=1, files=[1, 2], tests=[])
+
+        _prefetch.prefetch(submission, ["files.comments"])
+
+        assert sorted(api.calls) == [
+            ("comments", 10), ("comments", 20), ("comments", 100),
+            ("files", 1), ("files", 2)]
+
+        # Nothing is fetched anymore when walking the graph
+        texts = [c.text for f in submission.files for c in f.comments]
+        assert sorted(texts) == ["10", "100", "100", "20"]
+        assert len(api.calls) == 5
+
+    def test_retrieve(self, mocker):
+        api = FakeAPI(mocker)
+        mocker.patch.object(
+            _submissions.Submissions._requestor, "_request",
+            return_value=mocker.Mock(status_code=200, json={"id": 1, "files": [1]}))
+
+        submission = _submissions.Submissions().retrieve(id=1, prefetch=["files"])
+        assert api.calls == [("files", 1)]
+        assert submission.files[0].name == "f1"
+
+    def test_retrieve_async(self, mocker):
+        api = FakeAPI(mocker)
+        mocker.patch.object(
+            _async_api_requestor.STATIC_ASYNC_REQUESTOR, "_request",
+            mocker.AsyncMock(return_value=mocker.Mock(
+                status_code=200, json={"id": 1, "files": [1]})))
+
+        loop = asyncio.new_event_loop()
+        try:
+            submission = loop.run_until_complete(
+                _submissions.Submissions().retrieve_async(id=1, prefetch=["files"]))
+        finally:
+            loop.close()
+
+        assert api.calls == [("files", 1)]
+        assert submission.files[0].name == "f1"
+
+    def test_retrieve_invalid_path(self, mocker):
+        request = mocker.patch.object(_submissions.Submissions._requestor, "_request")
+        with pytest.raises(ValueError):
+            _submissions.Submissions().retrieve(id=1, prefetch=["bogus"])
+        request.assert_not_called()
@@ -0,0 +1,93 @@
+import pickle as _pickle
+import sys as _sys
+
+import pytest
+
+import codepost.models.abstract.linked_lists as _ll
+import codepost.models.abstract.records as _records
+import codepost.models.assignments as _assignments
+import codepost.models.courses as _courses
+import codepost.models.submissions as _submissions
+
+SUBMISSION_DATA = {
+    "id": 7,
+    "assignment": 2,
+    "students": ["a@b.c", "d@e.f"],
+    "grader": "g@h.i",
+    "isFinalized": True,
+    "files": [11, 12],
+}
+
+
+class TestAPIRecord:
+
+    def test_record_class_per_model(self):
+        cls = _submissions.Submissions.Record
+        assert issubclass(cls, _records.APIRecord)
+        assert cls._resource_cls is _submissions.Submissions
+        assert cls is not _courses.Courses.Record
+        assert "id" in cls._FIELD_NAMES
+
+    def test_no_instance_dict(self):
+        record = _submissions.Submissions.Record(**SUBMISSION_DATA)
+        assert not hasattr(record, "__dict__")
+        assert (_sys.getsizeof(record) <
+                _sys.getsizeof(_submissions.Submissions(**SUBMISSION_DATA)) +
+                _sys.getsizeof(SUBMISSION_DATA))
+
+    def test_attribute_parity(self):
+        record = _submissions.Submissions.Record(**SUBMISSION_DATA)
+        resource = _submissions.Submissions(**SUBMISSION_DATA)
+
+        for field_name in ["id", "assignment", "grader", "isFinalized"]:
+            assert getattr(record, field_name) == getattr(resource, field_name)
+
+        assert record.students == resource.students
+        assert isinstance(record.students, _ll.APILinkedList)
+        assert isinstance(record.files, _ll.LazyAPILinkedList)
+        assert record.files is record.files
+        assert [f.id for f in list.__iter__(record.files)] == [11, 12]
+
+    def test_missing_fields(self):
+        record = _submissions.Submissions.Record(id=3)
+        assert record.grader is None
+        assert list(record.files) == []
+
+    @pytest.mark.parametrize("field_name", ["grader", "id", "students"])
+    def test_read_only(self, field_name):
+        record = _submissions.Submissions.Record(**SUBMISSION_DATA)
+        with pytest.raises(AttributeError):
+            setattr(record, field_name, "x")
+        with pytest.raises(AttributeError):
+            delattr(record, field_name)
+        assert getattr(record.to_resource(), field_name) == \
+            SUBMISSION_DATA[field_name]
+
+    def test_to_resource(self):
+        record = _submissions.Submissions.Record(**SUBMISSION_DATA)
+        resource = record.to_resource()
+        assert isinstance(resource, _submissions.Submissions)
+        assert resource.id == 7
+        assert resource.students == ["a@b.c", "d@e.f"]
+
+    def test_equality_and_pickle(self):
+        record = _submissions.Submissions.Record(**SUBMISSION_DATA)
+        assert record == _submissions.Submissions.Record(**SUBMISSION_DATA)
+        assert record != _submissions.Submissions.Record(id=8)
+        assert _pickle.loads(_pickle.dumps(record)) == record
+
+
+class TestCompactListing:
+
+    def test_list_submissions_compact(self, requests_mock):
+        requests_mock.get(
+            "https://api.codepost.io/assignments/2/submissions",
+            json=[SUBMISSION_DATA, dict(SUBMISSION_DATA, id=8)])
+
+        assignment = _assignments.Assignments(id=2)
+        records = assignment.list_submissions(compact=True)
+        assert [type(r) for r in records] == [_submissions.Submissions.Record] * 2
+        assert [r.id for r in records] == [7, 8]
+
+        resources = assignment.list_submissions()
+        assert all(type(r) is _submissions.Submissions for r in resources)
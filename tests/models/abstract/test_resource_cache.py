@@ -0,0 +1,80 @@
+import pytest
+
+import codepost.models.abstract.resource_cache as _resource_cache
+import codepost.models.assignments as _assignments
+import codepost.models.files as _files
+import codepost.util.cache as _cache
+
+
+@pytest.fixture
+def cache():
+    cache = _resource_cache.set_resource_cache(True, ttl=60)
+    yield cache
+    _resource_cache.set_resource_cache(None)
+
+
+class TestResourceCache:
+
+    def test_ttl(self, mocker):
+        cache = _resource_cache.ResourceCache(ttl=10, ttls={_files.Files: 0})
+        now = mocker.patch.object(_resource_cache._time, "time", return_value=100)
+
+        cache.set(_assignments.Assignments, 1, {"id": 1})
+        cache.set(_files.Files, 1, {"id": 1})
+        assert cache.get(_assignments.Assignments, 1) == {"id": 1}
+        assert cache.get(_files.Files, 1) is None
+
+        now.return_value = 111
+        assert cache.get(_assignments.Assignments, 1) is None
+        assert cache.stats == _resource_cache.CacheStats(
+            hits=1, misses=1, expirations=1, writes=1, invalidations=0)
+
+    def test_copies(self):
+        cache = _resource_cache.ResourceCache()
+        cache.set(_files.Files, 1, {"id": 1, "comments": [1, 2]})
+        cache.get(_files.Files, 1)["comments"].append(3)
+        assert cache.get(_files.Files, 1)["comments"] == [1, 2]
+
+    def test_per_api_key(self):
+        cache = _resource_cache.ResourceCache()
+        cache.set(_files.Files, 1, {"id": 1}, api_key="a")
+        assert cache.get(_files.Files, 1, api_key="b") is None
+
+    def test_disk_backend(self, tmp_path):
+        _resource_cache.ResourceCache(backend=_cache.DiskCache(str(tmp_path))).set(
+            _files.Files, 1, {"id": 1})
+        cache = _resource_cache.ResourceCache(backend=_cache.DiskCache(str(tmp_path)))
+        assert cache.get(_files.Files, 1) == {"id": 1}
+
+
+class TestResourceCacheVerbs:
+
+    def test_read_through(self, cache, mock_request):
+        request = mock_request((200, {"id": 1, "name": "a"}))
+        assert _files.Files().retrieve(id=1).name == "a"
+        assert _files.Files().retrieve(id=1).name == "a"
+        assert request.call_count == 1
+        assert cache.stats.hits == 1
+
+    def test_update_writes_through(self, cache, mock_request):
+        request = mock_request(
+            (200, {"id": 1, "name": "a"}), (200, {"id": 1, "name": "b"}))
+        _files.Files().retrieve(id=1)
+        _files.Files().update(id=1, name="b")
+        assert _files.Files().retrieve(id=1).name == "b"
+        assert request.call_count == 2
+
+    def test_delete_invalidates(self, cache, mock_request):
+        request = mock_request((200, {"id": 1}), (204, None), (200, {"id": 1}))
+        _files.Files().retrieve(id=1)
+        _files.Files().delete(id=1)
+        _files.Files().retrieve(id=1)
+        assert request.call_count == 3
+
+    def test_refresh_bypasses_cache(self, cache, mock_request):
+        request = mock_request(
+            (200, {"id": 1, "name": "a"}), (200, {"id": 1, "name": "b"}))
+        obj = _files.Files().retrieve(id=1)
+        assert obj.refresh().name == "b"
+        assert _files.Files().retrieve(id=1).name == "b"
+        assert request.call_count == 2
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import codepost
+import codepost.instantiated as _instantiated
+import codepost.models.submissions as _submissions
+
+
+def run_python(code):
+    return subprocess.check_output(
+        [sys.executable, "-c", code]).decode("utf8").strip()
+
+
+class TestLazyPackage:
+
+    def test_import_loads_nothing(self):
+        loaded = run_python(
+            "import sys, codepost; "
+            "print(sorted(m for m in sys.modules "
+            "if m.split('.')[0] in ('codepost', 'requests', 'yaml', 'eliot')))")
+        assert loaded == "['codepost', 'codepost.version']"
+
+    def test_helper_loads_its_model(self):
+        loaded = run_python(
+            "import sys, codepost; codepost.submission; "
+            "print('codepost.models.submissions' in sys.modules, "
+            "'codepost.util.config' in sys.modules)")
+        assert loaded == "True True"
+
+    def test_public_names(self):
+        assert isinstance(codepost.submission, _submissions.Submissions)
+        assert codepost.submission is _instantiated.submission
+        assert codepost.submission is codepost.submission
+        assert codepost.configure_api_key is codepost.util.config.configure_api_key
+        assert codepost.session is codepost.models.abstract.identity_map.session
+        assert callable(codepost.set_resource_cache)
+        assert codepost.errors.StaticObjectError
+
+    def test_dir_and_all(self):
+        for name in ["submission", "file_template", "session", "util", "models"]:
+            assert name in dir(codepost)
+        assert "submission" in codepost.__all__
+        assert "file_template" in dir(_instantiated)
+
+    def test_unknown_attribute(self):
+        for module in [codepost, _instantiated]:
+            try:
+                module.does_not_exist
+            except AttributeError:
+                pass
+            else:
+                assert False, "AttributeError not raised"
@@ -0,0 +1,36 @@
+import platform
+
+import pytest
+
+import codepost.util.codec as _codec
+
+PAYLOAD = {"id": 1, "name": "café", "files": [{"code": "print(1)\n"}]}
+
+
+@pytest.fixture(params=["json", "orjson"])
+def codec(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    return _codec._CODECS[request.param]()
+
+
+class TestCodec:
+
+    def test_roundtrip(self, codec):
+        encoded = codec.dumps(PAYLOAD)
+        assert isinstance(encoded, bytes)
+        assert codec.loads(encoded) == PAYLOAD
+        assert codec.loads(encoded.decode("utf8")) == PAYLOAD
+
+    def test_named_tuple(self, codec):
+        assert codec.loads(codec.dumps(platform.uname())) == list(platform.uname())
+
+    def test_set_codec(self):
+        previous = _codec.get_codec()
+        try:
+            assert _codec.set_codec("json").name == "json"
+            assert _codec.dumps([1]) == b"[1]"
+            with pytest.raises(ValueError):
+                _codec.set_codec("unknown")
+        finally:
+            _codec.set_codec(previous)
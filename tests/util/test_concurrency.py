@@ -0,0 +1,109 @@
+import contextlib
+import threading
+import time
+
+import pytest
+
+import codepost.util.concurrency as _concurrency
+
+
+class TestBoundedMap:
+
+    def test_ordered(self):
+        def func(x):
+            time.sleep(0.001 * (10 - x))
+            return x * 2
+        assert list(_concurrency.bounded_map(func, range(10), max_workers=4)) == \
+            [x * 2 for x in range(10)]
+
+    def test_unordered(self):
+        results = _concurrency.bounded_map(
+            lambda x: x, range(20), max_workers=4, ordered=False)
+        assert sorted(results) == list(range(20))
+
+    def test_bounded(self):
+        lock = threading.Lock()
+        state = {"current": 0, "max": 0}
+
+        def func(x):
+            with lock:
+                state["current"] += 1
+                state["max"] = max(state["max"], state["current"])
+            time.sleep(0.005)
+            with lock:
+                state["current"] -= 1
+
+        list(_concurrency.bounded_map(func, range(20), max_workers=3))
+        assert 1 < state["max"] <= 3
+
+    def test_above_default_pool_size(self):
+        max_workers = _concurrency.DEFAULT_MAX_WORKERS * 2
+        barrier = threading.Barrier(max_workers, timeout=5)
+
+        # All the calls must be in flight at once to pass the barrier
+        results = _concurrency.bounded_map(
+            lambda x: barrier.wait(), range(max_workers),
+            max_workers=max_workers)
+        assert sorted(results) == list(range(max_workers))
+        assert _concurrency._executor_size >= max_workers
+
+    def test_exception(self):
+        def func(x):
+            if x == 3:
+                raise ValueError(x)
+            return x
+        with pytest.raises(ValueError):
+            list(_concurrency.bounded_map(func, range(10), max_workers=4))
+
+    def test_nested_is_sequential(self):
+        def inner(x):
+            return threading.current_thread()
+
+        def outer(x):
+            return set(_concurrency.bounded_map(inner, range(4), max_workers=4))
+
+        for threads in _concurrency.bounded_map(outer, range(2), max_workers=2):
+            assert len(threads) == 1
+
+    def test_executor_without_initializer(self, mocker):
+        # `ThreadPoolExecutor` has no `initializer` before Python 3.7
+        executor_cls = _concurrency._futures.ThreadPoolExecutor
+
+        def make_executor(max_workers):
+            return executor_cls(max_workers=max_workers)
+
+        mocker.patch.object(_concurrency, "_executor", None)
+        mocker.patch.object(_concurrency, "_executor_size", 0)
+        mocker.patch.object(
+            _concurrency._futures, "ThreadPoolExecutor", side_effect=make_executor)
+
+        assert list(_concurrency.bounded_map(
+            lambda x: (x, _concurrency._in_worker()), range(4), max_workers=2)) == \
+            [(x, True) for x in range(4)]
+        assert not _concurrency._in_worker()
+
+
+class TestBindContexts:
+
+    def test_restored_in_other_thread(self, mocker):
+        local = threading.local()
+        local.value = "caller"
+
+        @contextlib.contextmanager
+        def restore(value):
+            local.value = value
+            try:
+                yield
+            finally:
+                del local.value
+
+        mocker.patch.object(_concurrency, "_contexts", [
+            (lambda: getattr(local, "value", None), restore)])
+
+        func = _concurrency.bind_contexts(lambda: local.value)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(func()))
+        thread.start()
+        thread.join()
+
+        assert results == ["caller"]
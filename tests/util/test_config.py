@@ -1,4 +1,6 @@
 
+import os
+
 import pytest
 
 import codepost.util.config as _config
@@ -90,4 +92,148 @@ class TestValidateApiKey:
         _config._checked_api_keys[api_key] = True
         p = mocker.patch("codepost.util.config._logger.debug")
         assert not _config.validate_api_key(api_key, refresh=True, log_outcome=True)
-        p.assert_called()
\ No newline at end of file
+        p.assert_called()
+
+
+class TestGetApiKey:
+
+    FAKE_KEY = "a"*40
+    FAKE_KEY_2 = "b"*40
+
+    def setup_method(self, method):
+        """
+        Run before every test.
+        """
+        _config._api_key = None
+        _config._api_key_override = None
+        _config._api_key_source = None
+        _config.invalidate_api_key_cache()
+
+    def teardown_method(self, method):
+        self.setup_method(method)
+
+    def test_memoized(self, mocker):
+        p = mocker.patch("codepost.util.config.configure_api_key",
+                         return_value=self.FAKE_KEY)
+        for _ in range(10):
+            assert _config.get_api_key() == self.FAKE_KEY
+        p.assert_called_once()
+
+    def test_invalidate(self, mocker):
+        p = mocker.patch("codepost.util.config.configure_api_key",
+                         return_value=self.FAKE_KEY)
+        _config.get_api_key()
+        _config.invalidate_api_key_cache()
+        _config.get_api_key()
+        assert p.call_count == 2
+
+    def test_env_change_detected(self, mocker, monkeypatch):
+        mocker.patch("codepost.util.config.validate_api_key_in_background")
+        mocker.patch("codepost.util.config.read_config_file", return_value=None)
+
+        monkeypatch.setenv(_config.DEFAULT_API_KEY_ENV, self.FAKE_KEY)
+        assert _config.get_api_key() == self.FAKE_KEY
+
+        monkeypatch.setenv(_config.DEFAULT_API_KEY_ENV, self.FAKE_KEY_2)
+        assert _config.get_api_key() == self.FAKE_KEY_2
+
+    def test_config_file_not_read_per_call(self, mocker, monkeypatch, tmp_path):
+        mocker.patch("codepost.util.config.validate_api_key_in_background")
+        monkeypatch.delenv(_config.DEFAULT_API_KEY_ENV, raising=False)
+
+        config_path = tmp_path / "codepost-config.yaml"
+        config_path.write_text("api_key: {}\n".format(self.FAKE_KEY))
+        monkeypatch.setattr(
+            _config, "DEFAULT_CONFIG_PATHS", [str(config_path)])
+
+        p = mocker.spy(_config, "read_config_file")
+        for _ in range(10):
+            assert _config.get_api_key() == self.FAKE_KEY
+        assert p.call_count == 1
+
+    def test_config_file_change_detected(self, mocker, monkeypatch, tmp_path):
+        mocker.patch("codepost.util.config.validate_api_key_in_background")
+        monkeypatch.delenv(_config.DEFAULT_API_KEY_ENV, raising=False)
+        monkeypatch.setattr(_config, "API_KEY_RECHECK_INTERVAL", 0)
+
+        config_path = tmp_path / "codepost-config.yaml"
+        config_path.write_text("api_key: {}\n".format(self.FAKE_KEY))
+        monkeypatch.setattr(
+            _config, "DEFAULT_CONFIG_PATHS", [str(config_path)])
+        assert _config.get_api_key() == self.FAKE_KEY
+
+        config_path.write_text("api_key: {}\n".format(self.FAKE_KEY_2))
+        mtime = _config._get_mtime(str(config_path))
+        os.utime(str(config_path), (mtime + 10, mtime + 10))
+        assert _config.get_api_key() == self.FAKE_KEY_2
+
+
+class TestValidateApiKeyInBackground:
+
+    FAKE_KEY = "a"*40
+
+    def setup_method(self, method):
+        """
+        Run before every test.
+        """
+        _config._checked_api_keys = dict()
+        _config._validation_cache = None
+
+    def teardown_method(self, method):
+        self.setup_method(method)
+
+    @pytest.fixture(autouse=True)
+    def cache_path(self, monkeypatch, tmp_path):
+        path = tmp_path / "cache" / "api-keys.json"
+        monkeypatch.setattr(_config, "VALIDATION_CACHE_PATH", str(path))
+        return path
+
+    def wait(self):
+        for thread in _config._threading.enumerate():
+            if thread.name == "codepost-validate-api-key":
+                thread.join()
+
+    def test_validated_in_background(self, requests_mock, cache_path):
+        requests_mock.get(
+            "{}/courses/".format(_config.BASE_URL), status_code=200)
+
+        assert _config.validate_api_key_in_background(self.FAKE_KEY) is None
+        self.wait()
+
+        assert requests_mock.call_count == 1
+        assert _config._checked_api_keys[self.FAKE_KEY]
+        assert cache_path.exists()
+        assert self.FAKE_KEY not in cache_path.read_text()
+
+    def test_disk_cache_hit(self, requests_mock):
+        requests_mock.get(
+            "{}/courses/".format(_config.BASE_URL), status_code=200)
+
+        _config.validate_api_key_in_background(self.FAKE_KEY)
+        self.wait()
+
+        # A new process only reads the on-disk cache
+        self.setup_method(None)
+        assert _config.validate_api_key_in_background(self.FAKE_KEY)
+        assert requests_mock.call_count == 1
+
+    def test_disk_cache_expired(self, requests_mock, monkeypatch):
+        requests_mock.get(
+            "{}/courses/".format(_config.BASE_URL), status_code=200)
+
+        _config.validate_api_key_in_background(self.FAKE_KEY)
+        self.wait()
+
+        self.setup_method(None)
+        monkeypatch.setattr(_config, "VALIDATION_CACHE_TTL", -1)
+        assert _config.validate_api_key_in_background(self.FAKE_KEY) is None
+        self.wait()
+        assert requests_mock.call_count == 2
+
+    def test_invalid_key_not_cached(self, requests_mock, cache_path):
+        requests_mock.get(
+            "{}/courses/".format(_config.BASE_URL), status_code=401)
+
+        _config.validate_api_key_in_background(self.FAKE_KEY)
+        self.wait()
+        assert not cache_path.exists()